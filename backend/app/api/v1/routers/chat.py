@@ -1,10 +1,28 @@
-from fastapi import APIRouter, Depends, status
+import uuid
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.responses import StreamingResponse
+from redis.asyncio import Redis
+from starlette.background import BackgroundTasks
+
+from app.config import get_settings
+from app.core.security import get_current_user_id, profiling_requested
+from app.dependencies import get_admission_controller, get_chat_orchestrator, get_redis_client
+from app.models.schemas import (
+    AdmissionMetricsResponse,
+    ChatRequest,
+    PromptCacheMetricsResponse,
+    RetrieveBatchRequest,
+    RetrieveBatchResponse,
+)
+from app.services.admission import AdmissionController, AdmissionRejected
+from app.services.profiling import PROFILE_ID_HEADER, ProfileStore, new_profile_id
+from app.services.prompt_layout import get_prompt_cache_metrics
 
-from app.core.security import get_current_user_id
-from app.models.schemas import ChatRequest
-from app.services.chat import ChatOrchestrator
 
+CONVERSATION_ID_HEADER = "X-Conversation-ID"
 
 router = APIRouter()
 
@@ -16,8 +34,77 @@ router = APIRouter()
 async def chat_stream(
     request: ChatRequest,
     user_id: str = Depends(get_current_user_id),
+    orchestrator=Depends(get_chat_orchestrator),
+    admission: AdmissionController = Depends(get_admission_controller),
+    profiling: bool = Depends(profiling_requested),
 ):
-    orchestrator = ChatOrchestrator()
-    generator = orchestrator.stream_chat(request, user_id)
-    return StreamingResponse(generator, media_type="text/event-stream")
+    headers = {}
+    profile_id = None
+    if profiling:
+        profile_id = new_profile_id()
+        ProfileStore(get_settings().profile_dir).write_meta(profile_id, "chat", user_id=user_id)
+        headers[PROFILE_ID_HEADER] = profile_id
+    try:
+        ticket = await admission.acquire(user_id)
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Too many concurrent chat streams ({e.reason})",
+            headers={"Retry-After": e.retry_after_header},
+        )
+    try:
+        if request.conversation_id is None and request.start_conversation:
+            request = request.model_copy(update={"conversation_id": uuid.uuid4().hex})
+        background = BackgroundTasks()
+        background.add_task(ticket.aclose)
+        if request.conversation_id:
+            headers[CONVERSATION_ID_HEADER] = request.conversation_id
+            background.add_task(orchestrator.compact_conversation, user_id, request.conversation_id)
+        generator = orchestrator.stream_chat(request, user_id, profile_id=profile_id)
+    except BaseException:
+        ticket.release()
+        raise
+    return StreamingResponse(
+        ticket.hold(generator),
+        media_type="text/event-stream",
+        headers=headers,
+        background=background,
+    )
+
+
+@router.post(
+    "/chat/retrieve",
+    status_code=status.HTTP_200_OK,
+    response_model=RetrieveBatchResponse,
+)
+async def retrieve_batch(
+    request: RetrieveBatchRequest,
+    user_id: str = Depends(get_current_user_id),
+    orchestrator=Depends(get_chat_orchestrator),
+) -> RetrieveBatchResponse:
+    contexts = await run_in_threadpool(
+        orchestrator.retrieve_context_list_batch, user_id, request.queries, request.config
+    )
+    return RetrieveBatchResponse(contexts=contexts)
+
+
+@router.get(
+    "/chat/metrics/prompt-cache",
+    status_code=status.HTTP_200_OK,
+    response_model=PromptCacheMetricsResponse,
+)
+async def get_chat_prompt_cache(
+    redis: Annotated[Redis, Depends(get_redis_client)],
+) -> PromptCacheMetricsResponse:
+    return PromptCacheMetricsResponse(**await get_prompt_cache_metrics(redis))
+
 
+@router.get(
+    "/chat/metrics/admission",
+    status_code=status.HTTP_200_OK,
+    response_model=AdmissionMetricsResponse,
+)
+async def get_chat_admission(
+    admission: Annotated[AdmissionController, Depends(get_admission_controller)],
+) -> AdmissionMetricsResponse:
+    return AdmissionMetricsResponse(**admission.metrics())
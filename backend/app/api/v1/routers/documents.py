@@ -1,5 +1,31 @@
-from fastapi import APIRouter, status
+import logging
+import time
+import uuid
+from typing import Annotated, List
 
+from celery.result import AsyncResult
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.security import get_current_user_id
+from app.db.models import Document
+from app.db.session import get_pool_metrics, get_read_db_session
+from app.models.schemas import (
+    DbPoolMetricsResponse,
+    DeleteDocumentsRequest,
+    DeleteDocumentsResponse,
+    DocumentListResponse,
+    DocumentSummary,
+    IngestionStatusResponse,
+    ReindexDocumentsRequest,
+    ReindexDocumentsResponse,
+)
+from app.services.task_status import build_status_response
+from app.workers.celery_app import celery_app
+from app.workers.dispatch import delete_documents_task, reindex_documents_task
+
+logger = logging.getLogger("enterprise_rag.deletion")
 
 router = APIRouter()
 
@@ -7,7 +33,108 @@ router = APIRouter()
 @router.get(
     "/documents",
     status_code=status.HTTP_200_OK,
+    response_model=DocumentListResponse,
+)
+async def list_documents(
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    session: Annotated[AsyncSession, Depends(get_read_db_session)],
+    limit: Annotated[int, Query(ge=1, le=500)] = 100,
+    offset: Annotated[int, Query(ge=0)] = 0,
+) -> DocumentListResponse:
+    result = await session.execute(
+        select(Document)
+        .where(Document.user_id == user_id, Document.status != "deleted")
+        .order_by(Document.created_at.desc())
+        .limit(limit)
+        .offset(offset)
+    )
+    documents = [DocumentSummary.model_validate(document, from_attributes=True) for document in result.scalars()]
+    return DocumentListResponse(documents=documents)
+
+
+@router.get(
+    "/documents/metrics/db-pool",
+    status_code=status.HTTP_200_OK,
+    response_model=DbPoolMetricsResponse,
+)
+async def get_db_pool_metrics() -> DbPoolMetricsResponse:
+    return DbPoolMetricsResponse(pools=get_pool_metrics())
+
+
+def enqueue_deletion(document_ids: List[uuid.UUID], user_id: str) -> DeleteDocumentsResponse:
+    unique_ids = list(dict.fromkeys(document_ids))
+    try:
+        task = delete_documents_task.delay([str(document_id) for document_id in unique_ids], user_id)
+    except Exception as e:
+        logger.exception("Deletion task enqueue error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Deletion could not be queued",
+        )
+
+    logger.info(
+        "Deletion queued for %d document(s) (user: %s, task_id: %s)",
+        len(unique_ids),
+        user_id,
+        task.id,
+    )
+    return DeleteDocumentsResponse(task_id=task.id, document_ids=unique_ids)
+
+
+@router.delete(
+    "/documents/{document_id}",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=DeleteDocumentsResponse,
+)
+async def delete_document(
+    document_id: uuid.UUID,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+) -> DeleteDocumentsResponse:
+    return enqueue_deletion([document_id], user_id)
+
+
+@router.post(
+    "/documents/delete",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=DeleteDocumentsResponse,
+)
+async def delete_documents(
+    request: DeleteDocumentsRequest,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+) -> DeleteDocumentsResponse:
+    return enqueue_deletion(request.document_ids, user_id)
+
+
+@router.get(
+    "/documents/delete/status/{task_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=IngestionStatusResponse,
+)
+async def get_deletion_status(task_id: str) -> IngestionStatusResponse:
+    task_result = AsyncResult(task_id, app=celery_app)
+    return build_status_response(task_result)
+
+
+@router.post(
+    "/documents/reindex",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=ReindexDocumentsResponse,
 )
-async def list_documents():
-    return {"documents": []}
+async def reindex_documents(
+    request: ReindexDocumentsRequest,
+    user_id: Annotated[str, Depends(get_current_user_id)],
+) -> ReindexDocumentsResponse:
+    unique_ids = list(dict.fromkeys(request.document_ids))
+    try:
+        task = reindex_documents_task.delay(
+            [str(document_id) for document_id in unique_ids], user_id, enqueued_at=time.time()
+        )
+    except Exception as e:
+        logger.exception("Re-index task enqueue error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Re-index could not be queued",
+        )
 
+    logger.info("Re-index queued for %d document(s) (user: %s, task_id: %s)", len(unique_ids), user_id, task.id)
+    return ReindexDocumentsResponse(task_id=task.id, document_ids=unique_ids)
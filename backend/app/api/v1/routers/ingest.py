@@ -1,15 +1,35 @@
 import logging
-from typing import Annotated
+import time
+from typing import Annotated, List
 
 from celery.result import AsyncResult
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from redis.asyncio import Redis
 
-from app.core.security import get_current_user_id
-from app.models.schemas import IngestionStatusResponse, UploadResponse
+from app.config import get_settings
+from app.core.security import get_current_user_id, profiling_requested
+from app.core.tracing import get_tracer
+from app.dependencies import get_redis_client
+from app.models.schemas import (
+    BatchProgressResponse,
+    BatchStatusRequest,
+    BatchStatusResponse,
+    BulkUploadResponse,
+    IngestionStatusResponse,
+    QueueWaitMetricsResponse,
+    UploadResponse,
+)
+from app.services.bulk_ingest import BulkIngestService, BulkUploadTooLarge
+from app.services.ingest_scheduler import get_queue_wait_metrics
+from app.services.profiling import ProfileStore, new_profile_id
+from app.services.progress import stream_progress
 from app.services.storage import StorageService
+from app.services.task_status import build_status_response, fetch_status_batch
 from app.utils.mime_validator import validate_mime_type
 from app.workers.celery_app import celery_app
-from app.workers.ingestion_tasks import ingest_document_task
+from app.workers.dispatch import ingest_document_task
 
 logger = logging.getLogger("enterprise_rag.ingestion")
 
@@ -24,6 +44,7 @@ router = APIRouter()
 async def upload_document(
     file: UploadFile,
     user_id: Annotated[str, Depends(get_current_user_id)],
+    profiling: Annotated[bool, Depends(profiling_requested)],
 ) -> UploadResponse:
     if not file.filename:
         raise HTTPException(
@@ -51,10 +72,15 @@ async def upload_document(
             detail=f"MIME validation failed: {str(e)}",
         )
 
+    profile_id = new_profile_id() if profiling else None
+    options = {"profile_id": profile_id} if profile_id else {}
     try:
-        storage_service = StorageService()
-        saved_path = storage_service.save_file(file_content, file.filename, user_id)
-        task = ingest_document_task.delay(saved_path, user_id, file.filename, mime_type)
+        with get_tracer().span("ingest.upload", user_id=user_id, filename=file.filename, mime_type=mime_type):
+            storage_service = StorageService()
+            saved_path = storage_service.save_file(file_content, file.filename, user_id)
+            task = ingest_document_task.delay(
+                saved_path, user_id, file.filename, mime_type, enqueued_at=time.time(), **options
+            )
     except Exception as e:
         logger.exception("Storage or task enqueue error: %s", e)
         raise HTTPException(
@@ -69,7 +95,78 @@ async def upload_document(
         task.id,
     )
 
-    return UploadResponse(task_id=task.id)
+    if profile_id:
+        ProfileStore(get_settings().profile_dir).write_meta(profile_id, "ingest", user_id=user_id, task_id=task.id)
+    return UploadResponse(task_id=task.id, profile_id=profile_id)
+
+
+@router.post(
+    "/ingest/bulk",
+    status_code=status.HTTP_202_ACCEPTED,
+    response_model=BulkUploadResponse,
+)
+async def upload_documents_bulk(
+    files: List[UploadFile],
+    user_id: Annotated[str, Depends(get_current_user_id)],
+    redis: Annotated[Redis, Depends(get_redis_client)],
+) -> BulkUploadResponse:
+    bulk_service = BulkIngestService()
+    uploads = [(file.filename or "", file.file) for file in files]
+    try:
+        accepted, rejected = await run_in_threadpool(bulk_service.stage_uploads, uploads, user_id)
+    except BulkUploadTooLarge as e:
+        raise HTTPException(status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e))
+
+    if not accepted:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No supported files found in upload",
+        )
+
+    try:
+        with get_tracer().span("ingest.bulk_upload", user_id=user_id, files=len(accepted)):
+            tasks = await run_in_threadpool(bulk_service.dispatch, accepted, user_id)
+        batch_id = await bulk_service.save_batch(redis, tasks)
+    except Exception as e:
+        logger.exception("Bulk task enqueue error: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Upload processing failed",
+        )
+
+    logger.info(
+        "Bulk upload: %d file(s) in %d task(s), %d rejected (user: %s, batch_id: %s)",
+        len(accepted),
+        len(tasks),
+        len(rejected),
+        user_id,
+        batch_id,
+    )
+
+    return BulkUploadResponse(
+        batch_id=batch_id,
+        task_ids=list(tasks),
+        accepted=len(accepted),
+        rejected=rejected,
+    )
+
+
+@router.get(
+    "/ingest/batch/{batch_id}",
+    status_code=status.HTTP_200_OK,
+    response_model=BatchProgressResponse,
+)
+async def get_batch_progress(
+    batch_id: str,
+    redis: Annotated[Redis, Depends(get_redis_client)],
+) -> BatchProgressResponse:
+    progress = await BulkIngestService().get_batch_progress(redis, batch_id)
+    if progress is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Batch not found",
+        )
+    return progress
 
 
 @router.get(
@@ -79,47 +176,49 @@ async def upload_document(
 )
 async def get_ingestion_status(task_id: str) -> IngestionStatusResponse:
     task_result = AsyncResult(task_id, app=celery_app)
-    
-    if task_result.state == "PENDING":
-        return IngestionStatusResponse(
-            status="pending",
-            step=None,
-            progress=0,
-            error=None,
-        )
-    
-    if task_result.state == "PROCESSING":
-        meta = task_result.info or {}
-        return IngestionStatusResponse(
-            status="processing",
-            step=meta.get("step"),
-            progress=meta.get("progress", 0),
-            error=None,
-        )
-    
-    if task_result.state == "SUCCESS":
-        return IngestionStatusResponse(
-            status="completed",
-            step="completed",
-            progress=100,
-            error=None,
-        )
-    
-    if task_result.state == "FAILURE":
-        meta = task_result.info or {}
-        error_msg = str(task_result.info) if isinstance(task_result.info, (str, dict)) else "Unknown error"
-        if isinstance(meta, dict) and "error" in meta:
-            error_msg = meta["error"]
-        return IngestionStatusResponse(
-            status="failed",
-            step=meta.get("step", "error") if isinstance(meta, dict) else "error",
-            progress=0,
-            error=error_msg,
-        )
-    
-    return IngestionStatusResponse(
-        status="unknown",
-        step=None,
-        progress=0,
-        error=f"Unknown task state: {task_result.state}",
+    return build_status_response(task_result)
+
+
+@router.post(
+    "/ingest/status/batch",
+    status_code=status.HTTP_200_OK,
+    response_model=BatchStatusResponse,
+)
+async def get_ingestion_status_batch(
+    request: BatchStatusRequest,
+    redis: Annotated[Redis, Depends(get_redis_client)],
+) -> BatchStatusResponse:
+    task_ids = list(dict.fromkeys(request.task_ids))
+    statuses = await fetch_status_batch(redis, celery_app.backend, task_ids)
+    return BatchStatusResponse(statuses=statuses)
+
+
+@router.get(
+    "/ingest/progress/{task_id}",
+    status_code=status.HTTP_200_OK,
+)
+async def stream_ingestion_progress(
+    task_id: str,
+    redis: Annotated[Redis, Depends(get_redis_client)],
+):
+    generator = stream_progress(
+        redis,
+        task_id,
+        lambda: build_status_response(AsyncResult(task_id, app=celery_app)),
     )
+    return StreamingResponse(
+        generator,
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get(
+    "/ingest/metrics/queue-wait",
+    status_code=status.HTTP_200_OK,
+    response_model=QueueWaitMetricsResponse,
+)
+async def get_ingestion_queue_wait(
+    redis: Annotated[Redis, Depends(get_redis_client)],
+) -> QueueWaitMetricsResponse:
+    return QueueWaitMetricsResponse(tenants=await get_queue_wait_metrics(redis))
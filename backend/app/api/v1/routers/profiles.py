@@ -0,0 +1,29 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+
+from app.config import get_settings
+from app.core.security import require_profiling_token
+from app.models.schemas import ProfileListResponse
+from app.services.profiling import ProfileStore
+
+router = APIRouter(dependencies=[Depends(require_profiling_token)])
+
+
+@router.get(
+    "/profiles",
+    status_code=status.HTTP_200_OK,
+    response_model=ProfileListResponse,
+)
+async def list_profiles() -> ProfileListResponse:
+    return ProfileListResponse(profiles=ProfileStore(get_settings().profile_dir).list_profiles())
+
+
+@router.get(
+    "/profiles/{profile_id}/{artifact}",
+    status_code=status.HTTP_200_OK,
+)
+async def download_profile_artifact(profile_id: str, artifact: str) -> FileResponse:
+    path = ProfileStore(get_settings().profile_dir).artifact_path(profile_id, artifact)
+    if path is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile artifact not found")
+    return FileResponse(path, media_type="application/octet-stream", filename=f"{profile_id}-{artifact}")
@@ -1,35 +1,138 @@
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Literal
 
-from pydantic import AnyHttpUrl, Field, computed_field
+from pydantic import AnyHttpUrl, Field, computed_field, field_validator
 from pydantic_settings import BaseSettings
 
 
+def parse_tenant_weights(raw: str) -> Dict[str, float]:
+    weights: Dict[str, float] = {}
+    for entry in raw.split(","):
+        if not entry.strip():
+            continue
+        tenant, _, weight = entry.partition("=")
+        try:
+            value = float(weight)
+        except ValueError:
+            value = 0.0
+        if not tenant.strip() or not value > 0:
+            raise ValueError(f"INGEST_TENANT_WEIGHTS entries must be tenant=<positive number>, got {entry.strip()!r}")
+        weights[tenant.strip()] = value
+    return weights
+
+
 class Settings(BaseSettings):
     app_name: str = "Enterprise RAG Engine"
     app_env: str = "local"
     debug: bool = True
+    readiness_timeout_seconds: float = 2.0
 
     database_url: str
+    database_replica_url: str | None = None
+    db_pool_size: int = 10
+    db_max_overflow: int = 20
+    db_pool_timeout_seconds: float = 30.0
+    db_pool_recycle_seconds: int = 1800
+    db_pool_pre_ping: bool = True
+    db_worker_pool_size: int = 2
 
     qdrant_url: str
     qdrant_api_key: str | None = None
+    qdrant_prefer_grpc: bool = False
+    qdrant_grpc_port: int = 6334
+    qdrant_timeout: int | None = None
+    qdrant_collection_name: str = "documents"
+    qdrant_multitenancy: Literal["payload", "shard_key", "collection"] = "payload"
+    qdrant_tenant_groups: int = 1
+    qdrant_tenant_routes_raw: str = Field(default="", validation_alias="QDRANT_TENANT_ROUTES")
+    qdrant_hnsw_m: int = 16
+    qdrant_hnsw_ef_construct: int = 100
+    qdrant_on_disk_vectors: bool = False
+    qdrant_vector_datatype: Literal["float32", "float16"] = "float32"
+    qdrant_upload_batch_size: int = 256
+    qdrant_scalar_quantization: bool = False
+    qdrant_quantization_always_ram: bool = True
+    qdrant_quantization_oversampling: float = 2.0
 
     redis_url: str
 
+    celery_extract_concurrency: int | None = None
+    celery_extract_prefetch_multiplier: int = 1
+    celery_embed_concurrency: int = 16
+    celery_embed_prefetch_multiplier: int = 4
+    celery_index_concurrency: int = 8
+    celery_index_prefetch_multiplier: int = 4
+
+    ingest_interactive_priority: int = 0
+    ingest_bulk_priority: int = 6
+    ingest_tenant_max_concurrency: int = 4
+    ingest_tenant_weights_raw: str = Field(default="", validation_alias="INGEST_TENANT_WEIGHTS")
+    ingest_tenant_lease_seconds: int = 3600
+    ingest_defer_seconds: float = 5.0
+    ingest_max_deferrals: int = 360
+
     openai_api_key: str | None = None
     ollama_base_url: str | None = None
     use_local_llm: bool = False
     use_local_embeddings: bool = False
+    llm_model: str = "gpt-4o-mini"
+    local_llm_model: str = "llama3.2:3b"
+    local_llm_api_key: str = "ollama"
+    local_llm_timeout_seconds: float = 60.0
+    llm_simple_query_max_words: int = 24
+
+    embedding_dimensions: int | None = None
+    embedding_batch_size: int = 256
+    embedding_rpm_limit: int = 3000
+    embedding_tpm_limit: int = 1_000_000
+    embedding_initial_concurrency: int = 4
+    embedding_max_concurrency: int = 16
+    embedding_max_retries: int = 6
+    embedding_retry_base_seconds: float = 1.0
+    embedding_retry_max_seconds: float = 60.0
+
+    conversation_store_backend: Literal["redis", "memory"] = "redis"
+    conversation_ttl_seconds: int = 24 * 3600
+    conversation_max_messages: int = 20
+    conversation_summary_max_words: int = 200
+
+    sse_coalesce_window_ms: int = 20
+    sse_coalesce_max_bytes: int = 4096
+    sse_heartbeat_seconds: float = 15.0
+    sse_retry_ms: int = 3000
+
+    chat_max_concurrent_streams: int = 64
+    chat_max_streams_per_user: int = 4
+    chat_admission_queue_size: int = 32
+    chat_admission_max_wait_seconds: float = 2.0
+    chat_retry_after_seconds: float = 2.0
+
+    replay_mode: Literal["off", "record", "replay"] = "off"
+    replay_dir: str = "./replay"
 
     langfuse_public_key: str | None = None
     langfuse_secret_key: str | None = None
     langfuse_host: AnyHttpUrl | None = None
+    tracing_sample_rate: float = 0.1
+    tracing_export_batch_size: int = 64
+    tracing_export_interval_seconds: float = 2.0
+    tracing_max_queue_size: int = 10_000
+    profiling_token: str | None = None
+    profile_dir: str = "./profiles"
+    profile_tracemalloc_frames: int = 10
 
     allowed_origins_raw: str = Field(default="", validation_alias="ALLOWED_ORIGINS")
     allowed_hosts_raw: str = Field(default="*", validation_alias="ALLOWED_HOSTS")
 
     storage_path: str = "./storage"
+    extraction_artifacts_enabled: bool = True
+    extraction_artifact_compression_level: int = 6
+
+    bulk_max_files: int = 20000
+    bulk_max_total_bytes: int = 2 * 1024 * 1024 * 1024
+    bulk_small_file_bytes: int = 512 * 1024
+    bulk_group_max_files: int = 50
+    bulk_group_max_bytes: int = 4 * 1024 * 1024
 
     @computed_field
     @property
@@ -42,6 +145,27 @@ class Settings(BaseSettings):
         parts = [h.strip() for h in self.allowed_hosts_raw.split(",") if h.strip()]
         return parts if parts else ["*"]
 
+    @computed_field
+    @property
+    def qdrant_tenant_routes(self) -> Dict[str, str]:
+        routes: Dict[str, str] = {}
+        for entry in self.qdrant_tenant_routes_raw.split(","):
+            tenant, _, target = entry.partition("=")
+            if tenant.strip() and target.strip():
+                routes[tenant.strip()] = target.strip()
+        return routes
+
+    @computed_field
+    @property
+    def ingest_tenant_weights(self) -> Dict[str, float]:
+        return parse_tenant_weights(self.ingest_tenant_weights_raw)
+
+    @field_validator("ingest_tenant_weights_raw")
+    @classmethod
+    def validate_tenant_weights(cls, value: str) -> str:
+        parse_tenant_weights(value)
+        return value
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
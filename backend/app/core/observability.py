@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 
 from langfuse import Langfuse
@@ -5,10 +6,9 @@ from langfuse import Langfuse
 from app.config import get_settings
 
 
-settings = get_settings()
-
-
-def create_langfuse_client() -> Optional[Langfuse]:
+@lru_cache
+def get_langfuse_client() -> Optional[Langfuse]:
+    settings = get_settings()
     if not settings.langfuse_public_key or not settings.langfuse_secret_key or not settings.langfuse_host:
         return None
     return Langfuse(
@@ -16,7 +16,3 @@ def create_langfuse_client() -> Optional[Langfuse]:
         secret_key=settings.langfuse_secret_key,
         host=str(settings.langfuse_host),
     )
-
-
-langfuse_client = create_langfuse_client()
-
@@ -1,6 +1,23 @@
-from fastapi import Depends, Header
+import hmac
+
+from fastapi import Depends, Header, HTTPException, status
+
+from app.config import get_settings
 
 
 async def get_current_user_id(x_user_id: str = Header(..., alias="X-User-ID")) -> str:
     return x_user_id
 
+
+def profiling_requested(x_profile_token: str | None = Header(None, alias="X-Profile-Token")) -> bool:
+    if x_profile_token is None:
+        return False
+    token = get_settings().profiling_token
+    if not token or not hmac.compare_digest(x_profile_token.encode(), token.encode()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Invalid profiling token")
+    return True
+
+
+def require_profiling_token(requested: bool = Depends(profiling_requested)) -> None:
+    if not requested:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Profiling token required")
@@ -0,0 +1,268 @@
+import logging
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from app.config import get_settings
+
+
+logger = logging.getLogger("enterprise_rag.tracing")
+
+TRACEPARENT_HEADER = "traceparent"
+
+_TRACEPARENT_PATTERN = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_context: ContextVar[Optional["SpanContext"]] = ContextVar("trace_context", default=None)
+
+
+@dataclass(frozen=True, slots=True)
+class SpanContext:
+    trace_id: str
+    span_id: str
+    sampled: bool
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: str | None) -> SpanContext | None:
+    match = _TRACEPARENT_PATTERN.match(value or "")
+    if not match:
+        return None
+    trace_id, span_id, flags = match.groups()
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1))
+
+
+def new_trace_id() -> str:
+    return f"{random.getrandbits(128):032x}"
+
+
+def new_span_id() -> str:
+    return f"{random.getrandbits(64):016x}"
+
+
+class Span:
+    __slots__ = ("name", "context", "parent_id", "kind", "start", "started", "duration", "attributes", "error")
+
+    def __init__(self, name: str, context: SpanContext, parent_id: str | None, kind: str, attributes: dict):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.kind = kind
+        self.start = time.time()
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.attributes = attributes
+        self.error: str | None = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+
+class NoopSpan:
+    __slots__ = ("context",)
+
+    def __init__(self, context: SpanContext | None = None):
+        self.context = context
+
+    def set(self, **attributes) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class BatchSpanExporter:
+    def __init__(
+        self,
+        sink: Callable[[List[Span]], None],
+        batch_size: int = 64,
+        interval_seconds: float = 2.0,
+        max_queue_size: int = 10_000,
+    ):
+        self.sink = sink
+        self.batch_size = batch_size
+        self.interval_seconds = interval_seconds
+        self.max_queue_size = max_queue_size
+        self.queue: deque = deque()
+        self.dropped = 0
+        self.lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.pid: int | None = None
+
+    def export(self, span: Span) -> None:
+        if len(self.queue) >= self.max_queue_size:
+            self.dropped += 1
+            return
+        self.queue.append(span)
+        if self.pid != os.getpid():
+            self._start()
+        if len(self.queue) >= self.batch_size:
+            self.wakeup.set()
+
+    def flush(self) -> None:
+        while self.queue:
+            batch = []
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self.queue.popleft())
+                except IndexError:
+                    break
+            if not batch:
+                return
+            try:
+                self.sink(batch)
+            except Exception:
+                logger.exception("Failed to export %d span(s)", len(batch))
+
+    def _start(self) -> None:
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            self.wakeup = threading.Event()
+            threading.Thread(target=self._run, name="trace-exporter", daemon=True).start()
+
+    def _run(self) -> None:
+        while True:
+            self.wakeup.wait(self.interval_seconds)
+            self.wakeup.clear()
+            self.flush()
+
+
+class LangfuseSpanSink:
+    def __init__(self, client):
+        self.client = client
+
+    def __call__(self, spans: List[Span]) -> None:
+        for span in spans:
+            start = datetime.fromtimestamp(span.start, tz=timezone.utc)
+            if span.parent_id is None:
+                self.client.trace(id=span.context.trace_id, name=span.name, timestamp=start, metadata=span.attributes)
+            observation: Dict[str, Any] = {
+                "id": span.context.span_id,
+                "trace_id": span.context.trace_id,
+                "parent_observation_id": span.parent_id,
+                "name": span.name,
+                "start_time": start,
+                "end_time": start + timedelta(seconds=span.duration),
+                "metadata": span.attributes,
+                "level": "ERROR" if span.error else "DEFAULT",
+                "status_message": span.error,
+            }
+            if span.kind == "generation":
+                self.client.generation(model=span.attributes.get("model"), **observation)
+            else:
+                self.client.span(**observation)
+
+
+class Tracer:
+    def __init__(self, sample_rate: float, exporter: BatchSpanExporter | None):
+        self.sample_rate = sample_rate
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        return self.exporter is not None and self.sample_rate > 0
+
+    def start_span(
+        self, name: str, parent: SpanContext | None = None, kind: str = "span", **attributes
+    ) -> Span | NoopSpan:
+        if parent is None:
+            parent = _current_context.get()
+        if parent is None:
+            if not self.enabled:
+                return NOOP_SPAN
+            trace_id, parent_id = new_trace_id(), None
+            sampled = random.random() < self.sample_rate
+        else:
+            trace_id, parent_id, sampled = parent.trace_id, parent.span_id, parent.sampled
+        if not sampled:
+            return NoopSpan(parent or SpanContext(trace_id, new_span_id(), False))
+        return Span(name, SpanContext(trace_id, new_span_id(), True), parent_id, kind, attributes)
+
+    def end_span(self, span: Span | NoopSpan, error: BaseException | None = None) -> None:
+        if not isinstance(span, Span):
+            return
+        span.duration = time.perf_counter() - span.started
+        if error is not None:
+            span.error = f"{type(error).__name__}: {error}"
+        self.exporter.export(span)
+
+    @contextmanager
+    def span(
+        self,
+        name: str,
+        parent: SpanContext | None = None,
+        activate: bool = True,
+        kind: str = "span",
+        **attributes,
+    ) -> Iterator[Span | NoopSpan]:
+        span = self.start_span(name, parent, kind, **attributes)
+        token = attach(span.context) if activate else None
+        error = None
+        try:
+            yield span
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            detach(token)
+            self.end_span(span, error)
+
+    def flush(self) -> None:
+        if self.exporter is not None:
+            self.exporter.flush()
+
+
+def attach(context: SpanContext | None) -> Token | None:
+    return _current_context.set(context) if context is not None else None
+
+
+def detach(token: Token | None) -> None:
+    if token is not None:
+        _current_context.reset(token)
+
+
+@contextmanager
+def use_context(context: SpanContext | None) -> Iterator[None]:
+    token = attach(context)
+    try:
+        yield
+    finally:
+        detach(token)
+
+
+def current_traceparent() -> str | None:
+    context = _current_context.get()
+    return context.traceparent if context is not None else None
+
+
+@lru_cache
+def get_tracer() -> Tracer:
+    settings = get_settings()
+    if settings.tracing_sample_rate <= 0:
+        return Tracer(0.0, None)
+
+    from app.core.observability import get_langfuse_client
+
+    client = get_langfuse_client()
+    if client is None:
+        return Tracer(0.0, None)
+    exporter = BatchSpanExporter(
+        LangfuseSpanSink(client),
+        batch_size=settings.tracing_export_batch_size,
+        interval_seconds=settings.tracing_export_interval_seconds,
+        max_queue_size=settings.tracing_max_queue_size,
+    )
+    return Tracer(settings.tracing_sample_rate, exporter)
@@ -1,22 +1,93 @@
+from functools import lru_cache
+from typing import Dict
+
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 
-from app.config import get_settings
+from app.config import Settings, get_settings
 from app.db.models import Base
 
 
-settings = get_settings()
+def build_engine(settings: Settings, url: str | None = None, pool_size: int | None = None) -> AsyncEngine:
+    return create_async_engine(
+        url or settings.database_url,
+        echo=settings.debug,
+        pool_size=pool_size or settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout_seconds,
+        pool_recycle=settings.db_pool_recycle_seconds,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+
+
+def build_session_factory(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+    return async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+
+@lru_cache
+def get_engine() -> AsyncEngine:
+    return build_engine(get_settings())
+
+
+@lru_cache
+def get_replica_engine() -> AsyncEngine:
+    settings = get_settings()
+    if not settings.database_replica_url:
+        return get_engine()
+    return build_engine(settings, url=settings.database_replica_url)
+
+
+@lru_cache
+def get_session_factory() -> async_sessionmaker[AsyncSession]:
+    return build_session_factory(get_engine())
 
-engine: AsyncEngine = create_async_engine(settings.database_url, echo=settings.debug)
 
-AsyncSessionLocal = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+@lru_cache
+def get_read_session_factory() -> async_sessionmaker[AsyncSession]:
+    return build_session_factory(get_replica_engine())
 
 
 async def get_db_session() -> AsyncSession:
-    async with AsyncSessionLocal() as session:
+    async with get_session_factory()() as session:
         yield session
 
 
+async def get_read_db_session() -> AsyncSession:
+    async with get_read_session_factory()() as session:
+        yield session
+
+
+def pool_status(engine: AsyncEngine) -> Dict[str, int]:
+    pool = engine.pool
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(0, pool.overflow()),
+    }
+
+
+def get_pool_metrics() -> Dict[str, Dict[str, int]]:
+    metrics = {}
+    if get_engine.cache_info().currsize:
+        metrics["primary"] = pool_status(get_engine())
+    if get_replica_engine.cache_info().currsize and get_replica_engine() is not get_engine():
+        metrics["replica"] = pool_status(get_replica_engine())
+    return metrics
+
+
 async def init_db() -> None:
-    async with engine.begin() as connection:
+    async with get_engine().begin() as connection:
         await connection.run_sync(Base.metadata.create_all)
 
+
+async def dispose_engine() -> None:
+    if get_replica_engine.cache_info().currsize:
+        replica = get_replica_engine()
+        if not get_engine.cache_info().currsize or replica is not get_engine():
+            await replica.dispose()
+        get_read_session_factory.cache_clear()
+        get_replica_engine.cache_clear()
+    if get_engine.cache_info().currsize:
+        await get_engine().dispose()
+        get_session_factory.cache_clear()
+        get_engine.cache_clear()
@@ -1,16 +1,55 @@
 from functools import lru_cache
+from typing import TYPE_CHECKING
 
-from qdrant_client import QdrantClient
+import redis
+from redis.asyncio import Redis
 
 from app.config import Settings, get_settings
+from app.services.admission import AdmissionController
+
+if TYPE_CHECKING:
+    from qdrant_client import QdrantClient
+
+    from app.services.chat import ChatOrchestrator
+
+
+@lru_cache
+def get_qdrant_client() -> "QdrantClient":
+    from app.services.vector_store import create_qdrant_client
+
+    return create_qdrant_client(get_settings())
+
+
+@lru_cache
+def get_chat_orchestrator() -> "ChatOrchestrator":
+    from app.services.chat import ChatOrchestrator
+
+    return ChatOrchestrator()
 
 
 @lru_cache
-def get_qdrant_client() -> QdrantClient:
+def get_admission_controller() -> AdmissionController:
     settings = get_settings()
-    return QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+    return AdmissionController(
+        max_concurrent=settings.chat_max_concurrent_streams,
+        max_per_user=settings.chat_max_streams_per_user,
+        max_queue=settings.chat_admission_queue_size,
+        max_wait_seconds=settings.chat_admission_max_wait_seconds,
+        retry_after_seconds=settings.chat_retry_after_seconds,
+    )
+
+
+@lru_cache
+def get_redis_client() -> Redis:
+    settings = get_settings()
+    return Redis.from_url(settings.redis_url)
+
+
+@lru_cache
+def get_sync_redis_client() -> redis.Redis:
+    settings = get_settings()
+    return redis.Redis.from_url(settings.redis_url)
 
 
 def get_app_settings() -> Settings:
     return get_settings()
-
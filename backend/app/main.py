@@ -1,16 +1,19 @@
 import logging
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
-from langfuse.decorators import observe
 
-from app.api.v1.routers import chat, documents, ingest
+from app.api.v1.routers import chat, documents, ingest, profiles
+from app.api.v1.routers.chat import CONVERSATION_ID_HEADER
 from app.config import get_settings
-from app.core.observability import langfuse_client
-from app.db.session import init_db
-from app.dependencies import get_qdrant_client
+from app.core.observability import get_langfuse_client
+from app.core.tracing import get_tracer
+from app.db.session import dispose_engine, init_db
+from app.models.schemas import ReadinessResponse
+from app.services.profiling import PROFILE_ID_HEADER
+from app.services.readiness import check_readiness, warm_up
 
 
 logger = logging.getLogger("enterprise_rag")
@@ -20,12 +23,16 @@ logger = logging.getLogger("enterprise_rag")
 async def lifespan(app: FastAPI):
     settings = get_settings()
     logger.info("Starting %s", settings.app_name)
+    app.state.warmed_up = False
     await init_db()
-    qdrant_client = get_qdrant_client()
-    logger.info("Qdrant connected to %s", qdrant_client.config.url)
+    await warm_up()
+    app.state.warmed_up = True
     yield
+    get_tracer().flush()
+    langfuse_client = get_langfuse_client()
     if langfuse_client:
         langfuse_client.flush()
+    await dispose_engine()
     logger.info("Shutdown complete")
 
 
@@ -43,6 +50,7 @@ def create_app() -> FastAPI:
         allow_credentials=True,
         allow_methods=["*"],
         allow_headers=["*"],
+        expose_headers=[CONVERSATION_ID_HEADER, PROFILE_ID_HEADER],
     )
 
     if "*" not in settings.allowed_hosts:
@@ -54,14 +62,23 @@ def create_app() -> FastAPI:
     app.include_router(ingest.router, prefix="/api/v1", tags=["ingest"])
     app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
     app.include_router(documents.router, prefix="/api/v1", tags=["documents"])
+    app.include_router(profiles.router, prefix="/api/v1", tags=["profiles"])
 
     @app.get("/health")
-    @observe()
     async def health():
         return {"status": "ok", "service": settings.app_name}
 
+    @app.get("/ready", response_model=ReadinessResponse)
+    async def ready(response: Response) -> ReadinessResponse:
+        if not getattr(app.state, "warmed_up", False):
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+            return ReadinessResponse(ready=False, checks={"warm_up": "pending"})
+        readiness = await check_readiness()
+        if not readiness.ready:
+            response.status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+        return readiness
+
     return app
 
 
 app = create_app()
-
@@ -1,11 +1,81 @@
-from typing import List, Literal
+import uuid
+from datetime import datetime
+from typing import Dict, List, Literal
 
 from pydantic import BaseModel, Field
 
 
+class ReadinessResponse(BaseModel):
+    ready: bool = Field(..., description="Whether the API can serve traffic")
+    checks: Dict[str, str] = Field(..., description="Probe result per dependency: ok or the error type")
+
+
 class UploadResponse(BaseModel):
     task_id: str = Field(..., description="Celery task ID for tracking ingestion progress")
     message: str = Field(default="File uploaded and ingestion queued", description="Status message")
+    profile_id: str | None = Field(default=None, description="Profile ID when profiling was requested")
+
+
+class RejectedFile(BaseModel):
+    filename: str = Field(..., description="Name of the rejected file or archive member")
+    reason: str = Field(..., description="Why the file was not ingested")
+
+
+class BulkUploadResponse(BaseModel):
+    batch_id: str = Field(..., description="ID for tracking aggregate progress of the batch")
+    task_ids: List[str] = Field(..., description="Celery task IDs dispatched for the batch")
+    accepted: int = Field(..., description="Number of files queued for ingestion")
+    rejected: List[RejectedFile] = Field(default_factory=list, description="Files that were skipped")
+    message: str = Field(default="Files uploaded and ingestion queued", description="Status message")
+
+
+class DeleteDocumentsRequest(BaseModel):
+    document_ids: List[uuid.UUID] = Field(..., min_length=1, description="IDs of the documents to delete")
+
+
+class ReindexDocumentsRequest(BaseModel):
+    document_ids: List[uuid.UUID] = Field(
+        ..., min_length=1, description="IDs of the documents to re-chunk and re-embed"
+    )
+
+
+class DocumentSummary(BaseModel):
+    id: uuid.UUID = Field(..., description="Document ID")
+    filename: str = Field(..., description="Original file name")
+    mime_type: str = Field(..., description="Detected MIME type")
+    status: str = Field(..., description="processing, completed or failed")
+    error_message: str | None = Field(default=None, description="Error message for failed documents")
+    created_at: datetime = Field(..., description="Upload time")
+    updated_at: datetime = Field(..., description="Last status change")
+
+
+class DocumentListResponse(BaseModel):
+    documents: List[DocumentSummary] = Field(default_factory=list, description="The user's documents, newest first")
+
+
+class DbPoolStatus(BaseModel):
+    size: int = Field(..., description="Configured pool size")
+    checked_in: int = Field(..., description="Idle connections in the pool")
+    checked_out: int = Field(..., description="Connections currently in use")
+    overflow: int = Field(..., description="Connections open beyond the pool size")
+
+
+class DbPoolMetricsResponse(BaseModel):
+    pools: Dict[str, DbPoolStatus] = Field(
+        default_factory=dict, description="Pool usage per engine (primary, and replica when configured)"
+    )
+
+
+class DeleteDocumentsResponse(BaseModel):
+    task_id: str = Field(..., description="Celery task ID for tracking deletion progress")
+    document_ids: List[uuid.UUID] = Field(..., description="IDs of the documents queued for deletion")
+    message: str = Field(default="Document deletion queued", description="Status message")
+
+
+class ReindexDocumentsResponse(BaseModel):
+    task_id: str = Field(..., description="Celery task ID for tracking re-index progress")
+    document_ids: List[uuid.UUID] = Field(..., description="IDs of the documents queued for re-indexing")
+    message: str = Field(default="Document re-index queued", description="Status message")
 
 
 class IngestionStatusResponse(BaseModel):
@@ -15,6 +85,36 @@ class IngestionStatusResponse(BaseModel):
     error: str | None = Field(None, description="Error message if status is failed")
 
 
+class BatchStatusRequest(BaseModel):
+    task_ids: List[str] = Field(..., min_length=1, max_length=1000, description="Celery task IDs to resolve")
+
+
+class BatchStatusResponse(BaseModel):
+    statuses: Dict[str, IngestionStatusResponse] = Field(..., description="Ingestion status keyed by task ID")
+
+
+class BatchProgressResponse(BaseModel):
+    batch_id: str = Field(..., description="Batch ID")
+    status: str = Field(..., description="Aggregate status: pending, processing, completed, failed")
+    progress: int = Field(0, ge=0, le=100, description="File-weighted progress percentage (0-100)")
+    total_files: int = Field(..., description="Number of files in the batch")
+    completed_files: int = Field(0, description="Number of files in completed tasks")
+    failed_files: int = Field(0, description="Number of files in failed tasks")
+    tasks: Dict[str, IngestionStatusResponse] = Field(default_factory=dict, description="Status per task ID")
+
+
+class QueueWaitStats(BaseModel):
+    count: int = Field(0, description="Number of admitted ingestion tasks")
+    avg_seconds: float = Field(0.0, description="Average time from enqueue to admission")
+    max_seconds: float = Field(0.0, description="Longest time from enqueue to admission")
+
+
+class QueueWaitMetricsResponse(BaseModel):
+    tenants: Dict[str, Dict[str, QueueWaitStats]] = Field(
+        default_factory=dict, description="Queue wait statistics keyed by tenant and lane"
+    )
+
+
 ChatMessageRole = Literal["user", "assistant", "system"]
 
 
@@ -38,15 +138,102 @@ class ChatConfig(BaseModel):
         True,
         description="Whether to use hybrid search (dense + keyword) when retrieving context",
     )
+    top_k: int = Field(
+        5,
+        ge=1,
+        le=50,
+        description="Number of context chunks passed to the language model",
+    )
+    fetch_k: int = Field(
+        20,
+        ge=1,
+        le=200,
+        description="Candidates fetched from the vector store before diversity filtering",
+    )
+    use_mmr: bool = Field(
+        False,
+        description="Re-rank candidates with maximal marginal relevance to reduce redundant context",
+    )
+    mmr_lambda: float = Field(
+        0.5,
+        ge=0.0,
+        le=1.0,
+        description="MMR trade-off between relevance (1.0) and diversity (0.0)",
+    )
+    dedup_threshold: float | None = Field(
+        None,
+        gt=0.0,
+        le=1.0,
+        description="Drop chunks whose word-shingle Jaccard similarity to a better hit reaches this value; null disables",
+    )
+    reuse_previous_chunks: bool = Field(
+        True,
+        description="In a server-side conversation, also pass the previous turn's chunks to the model",
+    )
 
 
 class ChatRequest(BaseModel):
     message: str = Field(..., description="User input message for the assistant")
+    conversation_id: str | None = Field(
+        None,
+        pattern=r"^[A-Za-z0-9_-]{1,64}$",
+        description="Server-side conversation to continue; history is then loaded from the store",
+    )
     history: List[ChatMessage] = Field(
         default_factory=list,
-        description="Full chat history including previous user and assistant messages",
+        description="Chat history for clients that do not use conversation_id; seeds a new conversation",
+    )
+    start_conversation: bool = Field(
+        False,
+        description="Without conversation_id, store this exchange under a new server-side conversation",
     )
     config: ChatConfig = Field(
         default_factory=ChatConfig,
         description="Dynamic configuration for this chat request",
     )
+
+
+class RetrieveBatchRequest(BaseModel):
+    queries: List[str] = Field(..., min_length=1, max_length=100, description="Queries to retrieve context for")
+    config: ChatConfig = Field(
+        default_factory=ChatConfig,
+        description="Retrieval configuration applied to every query",
+    )
+
+
+class RetrieveBatchResponse(BaseModel):
+    contexts: List[List[str]] = Field(..., description="Retrieved context snippets per query, in request order")
+
+
+class PromptCacheMetricsResponse(BaseModel):
+    requests: int = Field(0, description="Chat completions with reported usage")
+    prompt_tokens: int = Field(0, description="Total prompt tokens billed")
+    cached_tokens: int = Field(0, description="Prompt tokens served from the provider's prompt cache")
+    completion_tokens: int = Field(0, description="Total completion tokens")
+    cache_hit_ratio: float = Field(0.0, description="cached_tokens / prompt_tokens")
+
+
+class AdmissionMetricsResponse(BaseModel):
+    active: int = Field(..., description="Chat streams currently running in this process")
+    queued: int = Field(..., description="Chat streams waiting for a slot")
+    admitted_total: int = Field(..., description="Chat streams admitted since startup")
+    rejected_total: Dict[str, int] = Field(
+        default_factory=dict, description="Rejections by reason: user_limit, queue_full, queue_timeout"
+    )
+    avg_queue_wait_ms: float = Field(..., description="Mean time admitted streams waited for a slot")
+    max_queue_wait_ms: float = Field(..., description="Longest time an admitted stream waited for a slot")
+
+
+class ProfileSummary(BaseModel):
+    profile_id: str = Field(..., description="Profile ID")
+    kind: str = Field(..., description="chat or ingest")
+    created_at: float = Field(..., description="Unix time the profile was requested")
+    user_id: str | None = Field(default=None, description="User whose request was profiled")
+    task_id: str | None = Field(default=None, description="Ingestion task ID for ingest profiles")
+    artifacts: List[str] = Field(
+        default_factory=list, description="Files available for download; empty until the profiled work finishes"
+    )
+
+
+class ProfileListResponse(BaseModel):
+    profiles: List[ProfileSummary] = Field(default_factory=list, description="Profiles, newest first")
@@ -0,0 +1,142 @@
+import asyncio
+import logging
+import math
+import time
+from collections import Counter, deque
+from typing import AsyncIterator, Deque, Dict, Tuple
+
+
+logger = logging.getLogger("enterprise_rag.admission")
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, reason: str, retry_after_seconds: float):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_seconds = retry_after_seconds
+
+    @property
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after_seconds)))
+
+
+class AdmissionTicket:
+    def __init__(self, controller: "AdmissionController", user_id: str):
+        self.controller = controller
+        self.user_id = user_id
+        self.released = False
+
+    def release(self) -> None:
+        if self.released:
+            return
+        self.released = True
+        self.controller.release(self.user_id)
+
+    async def aclose(self) -> None:
+        self.release()
+
+    async def hold(self, stream: AsyncIterator[bytes]) -> AsyncIterator[bytes]:
+        try:
+            async for chunk in stream:
+                yield chunk
+        finally:
+            self.release()
+
+
+class AdmissionController:
+    def __init__(
+        self,
+        max_concurrent: int,
+        max_per_user: int,
+        max_queue: int,
+        max_wait_seconds: float,
+        retry_after_seconds: float,
+    ):
+        self.max_concurrent = max_concurrent
+        self.max_per_user = max_per_user
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+        self.retry_after_seconds = retry_after_seconds
+        self.active = 0
+        self.by_user: Counter = Counter()
+        self.waiters: Deque[Tuple[str, asyncio.Future]] = deque()
+        self.admitted_total = 0
+        self.rejected_total: Counter = Counter()
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def reject(self, user_id: str, reason: str) -> AdmissionRejected:
+        self.rejected_total[reason] += 1
+        logger.warning(
+            "Rejected chat stream for user %s (%s): %d active, %d queued",
+            user_id,
+            reason,
+            self.active,
+            len(self.waiters),
+        )
+        return AdmissionRejected(reason, self.retry_after_seconds)
+
+    async def acquire(self, user_id: str) -> AdmissionTicket:
+        if self.by_user[user_id] >= self.max_per_user:
+            raise self.reject(user_id, "user_limit")
+        if self.active < self.max_concurrent and not self.waiters:
+            self._admit(user_id, 0.0)
+            return AdmissionTicket(self, user_id)
+        if len(self.waiters) >= self.max_queue:
+            raise self.reject(user_id, "queue_full")
+
+        started = time.monotonic()
+        waiter = asyncio.get_running_loop().create_future()
+        entry = (user_id, waiter)
+        self.waiters.append(entry)
+        self.by_user[user_id] += 1
+        try:
+            await asyncio.wait_for(asyncio.shield(waiter), self.max_wait_seconds)
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if waiter.done() and not waiter.cancelled():
+                self.release(user_id)
+            else:
+                waiter.cancel()
+                self.waiters.remove(entry)
+                self._drop_user(user_id)
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            raise self.reject(user_id, "queue_timeout")
+        self._record_wait(time.monotonic() - started)
+        return AdmissionTicket(self, user_id)
+
+    def release(self, user_id: str) -> None:
+        self.active -= 1
+        self._drop_user(user_id)
+        while self.waiters and self.active < self.max_concurrent:
+            _, waiter = self.waiters.popleft()
+            if waiter.done():
+                continue
+            self.active += 1
+            self.admitted_total += 1
+            waiter.set_result(None)
+
+    def metrics(self) -> Dict[str, object]:
+        return {
+            "active": self.active,
+            "queued": len(self.waiters),
+            "admitted_total": self.admitted_total,
+            "rejected_total": dict(self.rejected_total),
+            "avg_queue_wait_ms": 1000 * self.wait_seconds_total / self.admitted_total if self.admitted_total else 0.0,
+            "max_queue_wait_ms": 1000 * self.wait_seconds_max,
+        }
+
+    def _admit(self, user_id: str, waited: float) -> None:
+        self.active += 1
+        self.by_user[user_id] += 1
+        self.admitted_total += 1
+        self._record_wait(waited)
+
+    def _record_wait(self, waited: float) -> None:
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+
+    def _drop_user(self, user_id: str) -> None:
+        self.by_user[user_id] -= 1
+        if self.by_user[user_id] <= 0:
+            del self.by_user[user_id]
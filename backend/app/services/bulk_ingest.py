@@ -0,0 +1,159 @@
+import logging
+import tarfile
+import time
+import uuid
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Tuple
+
+from celery import group
+from fastapi import HTTPException
+from redis.asyncio import Redis
+
+from app.config import Settings, get_settings
+from app.models.schemas import BatchProgressResponse, RejectedFile
+from app.services.ingest_scheduler import IngestionScheduler
+from app.services.storage import StorageLimitExceeded, StorageService
+from app.services.task_status import TERMINAL_STATUSES, fetch_status_batch
+from app.utils.bulk_upload import MIME_SNIFF_BYTES, UploadMember, group_small_files, is_archive, iter_archive_members
+from app.utils.mime_validator import validate_mime_type
+from app.workers.celery_app import celery_app
+from app.workers.dispatch import ingest_batch_task, ingest_document_task
+
+
+logger = logging.getLogger("enterprise_rag.ingestion")
+
+
+class BulkUploadTooLarge(Exception):
+    pass
+
+
+def batch_key(batch_id: str) -> str:
+    return f"ingest:batch:{batch_id}"
+
+
+class BulkIngestService:
+    def __init__(self, settings: Settings | None = None, storage_service: StorageService | None = None):
+        self.settings = settings or get_settings()
+        self.storage_service = storage_service or StorageService(self.settings)
+
+    def stage_uploads(
+        self, uploads: Iterable[Tuple[str, BinaryIO]], user_id: str
+    ) -> Tuple[List[dict], List[RejectedFile]]:
+        accepted: List[dict] = []
+        rejected: List[RejectedFile] = []
+        total_bytes = 0
+        too_many_bytes = f"Bulk upload exceeds {self.settings.bulk_max_total_bytes} bytes"
+
+        for filename, fileobj in uploads:
+            if not filename:
+                rejected.append(RejectedFile(filename="", reason="Filename is required"))
+                continue
+            if is_archive(filename):
+                members: Iterable[UploadMember] = iter_archive_members(fileobj, filename)
+            else:
+                members = [UploadMember(filename=filename, stream=fileobj)]
+
+            try:
+                for member in members:
+                    if len(accepted) >= self.settings.bulk_max_files:
+                        raise BulkUploadTooLarge(f"Bulk upload exceeds {self.settings.bulk_max_files} files")
+                    remaining_bytes = self.settings.bulk_max_total_bytes - total_bytes
+                    if member.size is not None and member.size > remaining_bytes:
+                        raise BulkUploadTooLarge(too_many_bytes)
+                    head = member.stream.read(MIME_SNIFF_BYTES)
+                    try:
+                        mime_type = validate_mime_type(head, member.filename)
+                    except HTTPException as e:
+                        rejected.append(RejectedFile(filename=member.filename, reason=str(e.detail)))
+                        continue
+
+                    try:
+                        saved_path = self.storage_service.save_stream(
+                            member.stream, member.filename, user_id, head=head, max_bytes=remaining_bytes
+                        )
+                    except StorageLimitExceeded:
+                        raise BulkUploadTooLarge(too_many_bytes)
+                    size = Path(saved_path).stat().st_size
+                    total_bytes += size
+                    accepted.append(
+                        {
+                            "file_path": saved_path,
+                            "filename": member.filename,
+                            "mime_type": mime_type,
+                            "size": size,
+                        }
+                    )
+            except (zipfile.BadZipFile, tarfile.TarError) as e:
+                logger.warning("Unreadable archive %s: %s", filename, e)
+                rejected.append(RejectedFile(filename=filename, reason="Unreadable archive"))
+            except BulkUploadTooLarge:
+                for file in accepted:
+                    self.storage_service.delete_file(file["file_path"])
+                raise
+
+        return accepted, rejected
+
+    def dispatch(self, files: List[dict], user_id: str) -> Dict[str, int]:
+        groups = group_small_files(
+            files,
+            small_file_bytes=self.settings.bulk_small_file_bytes,
+            max_files=self.settings.bulk_group_max_files,
+            max_bytes=self.settings.bulk_group_max_bytes,
+        )
+        priority = IngestionScheduler(self.settings).lane_priority("bulk")
+        enqueued_at = time.time()
+        signatures = []
+        for file_group in groups:
+            if len(file_group) == 1:
+                file = file_group[0]
+                signature = ingest_document_task.s(
+                    file["file_path"], user_id, file["filename"], file["mime_type"], lane="bulk", enqueued_at=enqueued_at
+                )
+            else:
+                signature = ingest_batch_task.s(file_group, user_id, lane="bulk", enqueued_at=enqueued_at)
+            signatures.append(signature.set(priority=priority))
+
+        result = group(signatures).apply_async()
+        return {task.id: len(file_group) for task, file_group in zip(result.results, groups)}
+
+    async def save_batch(self, redis: Redis, tasks: Dict[str, int]) -> str:
+        batch_id = str(uuid.uuid4())
+        key = batch_key(batch_id)
+        pipeline = redis.pipeline(transaction=False)
+        pipeline.hset(key, mapping=tasks)
+        pipeline.expire(key, int(celery_app.conf.result_expires.total_seconds()))
+        await pipeline.execute()
+        return batch_id
+
+    async def get_batch_progress(self, redis: Redis, batch_id: str) -> BatchProgressResponse | None:
+        raw_tasks = await redis.hgetall(batch_key(batch_id))
+        if not raw_tasks:
+            return None
+        tasks = {
+            (task_id.decode() if isinstance(task_id, bytes) else task_id): int(count)
+            for task_id, count in raw_tasks.items()
+        }
+        statuses = await fetch_status_batch(redis, celery_app.backend, list(tasks))
+
+        total_files = sum(tasks.values())
+        completed_files = sum(tasks[t] for t, s in statuses.items() if s.status == "completed")
+        failed_files = sum(tasks[t] for t, s in statuses.items() if s.status == "failed")
+        progress = sum(tasks[t] * (100 if s.status in TERMINAL_STATUSES else s.progress) for t, s in statuses.items())
+
+        if completed_files + failed_files == total_files:
+            batch_status = "failed" if failed_files == total_files else "completed"
+        elif all(s.status == "pending" for s in statuses.values()):
+            batch_status = "pending"
+        else:
+            batch_status = "processing"
+
+        return BatchProgressResponse(
+            batch_id=batch_id,
+            status=batch_status,
+            progress=progress // total_files if total_files else 0,
+            total_files=total_files,
+            completed_files=completed_files,
+            failed_files=failed_files,
+            tasks=statuses,
+        )
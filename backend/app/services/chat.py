@@ -1,14 +1,30 @@
-import json
-from typing import Iterator
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Callable, Iterator, List, TypeVar
 
-from openai import OpenAI
+from fastapi.concurrency import iterate_in_threadpool
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
 
 from app.config import Settings, get_settings
+from app.core.tracing import get_tracer, use_context
 from app.dependencies import get_qdrant_client
-from app.models.schemas import ChatConfig, ChatRequest
+from app.models.schemas import ChatConfig, ChatMessage, ChatRequest
+from app.services.conversation_store import Conversation, ConversationStore
 from app.services.embeddings import EmbeddingService
+from app.services.llm import LOCAL_FALLBACK_EXCEPTIONS, LLMBackend, ModelRouter
+from app.services.profiling import ProfileStore, profile_iterator
+from app.services.prompt_layout import build_chat_messages, record_prompt_usage, usage_counts
+from app.services.replay import ReplayStore
+from app.services.sse import coalesce_sse
+from app.services.vector_store import TenantRoute, TenantRouter, tenant_filter
+from app.utils.diversity import filter_near_duplicates, mmr_select
+from app.utils.vectors import as_float32, normalize_rows
+
+
+logger = logging.getLogger("enterprise_rag.chat")
+
+T = TypeVar("T")
 
 
 class ChatOrchestrator:
@@ -20,8 +36,11 @@ class ChatOrchestrator:
         self.settings = settings or get_settings()
         self.qdrant_client = qdrant_client or get_qdrant_client()
         self.embedding_service = EmbeddingService(self.settings)
-        self.client = OpenAI(api_key=self.settings.openai_api_key)
-        self.model_name = "gpt-4o-mini"
+        self.tenant_router = TenantRouter(self.settings)
+        self.llm = ModelRouter(self.settings)
+        self.replay = ReplayStore(self.settings.replay_mode, self.settings.replay_dir)
+        self.conversations = ConversationStore(self.settings)
+        self.tracer = get_tracer()
 
     def build_system_prompt(self, config: ChatConfig) -> str:
         if config.persona == "sarcastic":
@@ -37,33 +56,58 @@ class ChatOrchestrator:
         )
 
     def retrieve_context(self, user_id: str, query: str, config: ChatConfig) -> str:
+        return self.retrieve_context_batch(user_id, [query], config)[0]
+
+    def retrieve_context_batch(self, user_id: str, queries: List[str], config: ChatConfig) -> List[str]:
+        return [self.format_context(hits) for hits in self.retrieve_hits_batch(user_id, queries, config)]
+
+    def retrieve_hits_batch(
+        self, user_id: str, queries: List[str], config: ChatConfig
+    ) -> List[List[qmodels.ScoredPoint]]:
+        if not queries:
+            return []
         if not self.qdrant_client or not self.settings.use_local_embeddings:
-            return ""
+            return [[] for _ in queries]
 
-        vectors = self.embedding_service.embed_chunks([query])
-        if not vectors:
-            return ""
+        with self.tracer.span("embed", queries=len(queries)):
+            vectors = self.embedding_service.embed_chunks(queries)
+        if len(vectors) != len(queries):
+            return [[] for _ in queries]
 
-        vector = vectors[0]
+        route = self.tenant_router.route(user_id)
+        requests = [self.build_search_request(user_id, route, vector, config) for vector in vectors]
+        with self.tracer.span("search", collection=route.collection_name, queries=len(queries)):
+            results = self.qdrant_client.search_batch(collection_name=route.collection_name, requests=requests)
 
-        query_filter = qmodels.Filter(
-            must=[
-                qmodels.FieldCondition(
-                    key="user_id",
-                    match=qmodels.MatchValue(value=user_id),
-                ),
-            ]
-        )
+        return [self.diversify_hits(vector, hits, config) for vector, hits in zip(vectors, results)]
 
-        search_kwargs = {
-            "collection_name": "documents",
-            "query_vector": vector,
-            "limit": 5,
-            "query_filter": query_filter,
-        }
+    def build_search_request(
+        self, user_id: str, route: TenantRoute, vector, config: ChatConfig
+    ) -> qmodels.SearchRequest:
+        limit = config.top_k
+        if config.use_mmr or config.dedup_threshold is not None:
+            limit = max(config.fetch_k, config.top_k)
 
-        hits = self.qdrant_client.search(**search_kwargs)
+        params = None
+        if self.settings.qdrant_scalar_quantization:
+            params = qmodels.SearchParams(
+                quantization=qmodels.QuantizationSearchParams(
+                    rescore=True,
+                    oversampling=self.settings.qdrant_quantization_oversampling,
+                )
+            )
 
+        return qmodels.SearchRequest(
+            vector=as_float32(vector).tolist(),
+            filter=tenant_filter(user_id),
+            limit=limit,
+            with_payload=True,
+            with_vector=config.use_mmr,
+            params=params,
+            shard_key=route.shard_key,
+        )
+
+    def format_context(self, hits: List[qmodels.ScoredPoint]) -> str:
         snippets: list[str] = []
         for hit in hits:
             payload = hit.payload or {}
@@ -79,13 +123,30 @@ class ChatOrchestrator:
 
         return "\n".join(snippets)
 
+    def diversify_hits(
+        self, query_vector, hits: List[qmodels.ScoredPoint], config: ChatConfig
+    ) -> List[qmodels.ScoredPoint]:
+        if config.dedup_threshold is not None:
+            texts = [(hit.payload or {}).get("text", "") for hit in hits]
+            hits = [hits[i] for i in filter_near_duplicates(texts, config.dedup_threshold)]
+        if config.use_mmr and hits and all(hit.vector is not None for hit in hits):
+            candidates = normalize_rows(as_float32([hit.vector for hit in hits]))
+            order = mmr_select(as_float32(query_vector), candidates, config.top_k, config.mmr_lambda)
+            hits = [hits[i] for i in order]
+        return hits[: config.top_k]
+
     def retrieve_context_list(
         self, user_id: str, query: str, config: ChatConfig
     ) -> list[str]:
-        raw = self.retrieve_context(user_id, query, config)
-        if not raw:
-            return []
-        return [s.strip() for s in raw.split("\n") if s.strip()]
+        return self.retrieve_context_list_batch(user_id, [query], config)[0]
+
+    def retrieve_context_list_batch(
+        self, user_id: str, queries: list[str], config: ChatConfig
+    ) -> list[list[str]]:
+        return [
+            [s.strip() for s in raw.split("\n") if s.strip()] if raw else []
+            for raw in self.retrieve_context_batch(user_id, queries, config)
+        ]
 
     def get_answer_for_eval(
         self,
@@ -100,64 +161,186 @@ class ChatOrchestrator:
             if contexts_override is not None
             else self.retrieve_context_list(user_id, question, config)
         )
-        system_prompt = self.build_system_prompt(config)
-        messages: list[dict[str, str]] = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": question},
-        ]
-        if contexts:
-            context_block = "\n".join(contexts)
-            messages.insert(
-                1,
-                {
-                    "role": "system",
-                    "content": f"Use the following context from the user's documents when answering:\n{context_block}",
-                },
+        return self.answer_with_contexts(question, contexts, config), contexts
+
+    def get_answers_for_eval(
+        self,
+        user_id: str,
+        questions: list[str],
+        config: ChatConfig | None = None,
+        contexts_overrides: list[list[str] | None] | None = None,
+        max_concurrency: int = 8,
+    ) -> list[tuple[str, list[str]]]:
+        config = config or ChatConfig(temperature=0.0)
+        contexts: list[list[str] | None] = list(contexts_overrides or [None] * len(questions))
+        missing = [index for index, override in enumerate(contexts) if override is None]
+        retrieved = self.retrieve_context_list_batch(user_id, [questions[i] for i in missing], config)
+        for index, retrieved_contexts in zip(missing, retrieved):
+            contexts[index] = retrieved_contexts
+
+        with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+            answers = list(
+                executor.map(
+                    lambda item: self.answer_with_contexts(item[0], item[1], config),
+                    zip(questions, contexts),
+                )
             )
-        response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-            temperature=config.temperature,
-            stream=False,
+        return list(zip(answers, contexts))
+
+    def answer_with_contexts(self, question: str, contexts: list[str], config: ChatConfig) -> str:
+        context = "\n".join(contexts) if contexts else None
+        messages = build_chat_messages(self.build_system_prompt(config), [], question, context)
+        backend = self.llm.route(question)
+
+        def complete() -> str:
+            return self.complete(backend, messages, config.temperature)
+
+        request = {"model": backend.model, "messages": messages, "temperature": config.temperature}
+        return self.replay.fetch("chat_completion", request, complete)
+
+    def stream_chat(self, request: ChatRequest, user_id: str, profile_id: str | None = None) -> AsyncIterator[bytes]:
+        deltas = self.stream_deltas(request, user_id)
+        if profile_id:
+            deltas = profile_iterator(deltas, ProfileStore(self.settings.profile_dir), profile_id, "chat")
+        return coalesce_sse(
+            iterate_in_threadpool(deltas),
+            window_seconds=self.settings.sse_coalesce_window_ms / 1000,
+            max_bytes=self.settings.sse_coalesce_max_bytes,
+            heartbeat_seconds=self.settings.sse_heartbeat_seconds,
+            retry_ms=self.settings.sse_retry_ms,
         )
-        answer = (
-            response.choices[0].message.content or ""
-        ).strip()
-        return answer, contexts
-
-    def stream_chat(self, request: ChatRequest, user_id: str) -> Iterator[str]:
-        system_prompt = self.build_system_prompt(request.config)
-        context = self.retrieve_context(user_id, request.message, request.config)
-
-        messages: list[dict[str, str]] = []
-        messages.append({"role": "system", "content": system_prompt})
-
-        if context:
-            messages.append(
-                {
-                    "role": "system",
-                    "content": f"Use the following context from the user's documents when answering:\n{context}",
-                }
-            )
 
-        for message in request.history:
-            messages.append({"role": message.role, "content": message.content})
+    def stream_deltas(self, request: ChatRequest, user_id: str) -> Iterator[str]:
+        with self.tracer.span("chat", activate=False, user_id=user_id) as root:
+            with use_context(root.context):
+                conversation, chunk_ids, messages = self.prepare_turn(request, user_id)
+
+            reply: list[str] = []
+            backend = self.llm.route(request.message)
+            with self.tracer.span("llm", parent=root.context, activate=False, kind="generation", model=backend.model):
+                for delta in self.stream_completion(messages, request.config.temperature, backend):
+                    reply.append(delta)
+                    yield delta
+
+            if conversation:
+                with use_context(root.context):
+                    self.conversations.append_turn(
+                        user_id,
+                        conversation,
+                        request.message,
+                        "".join(reply),
+                        chunk_ids,
+                    )
+
+    def compact_conversation(self, user_id: str, conversation_id: str) -> None:
+        self.conversations.compact(user_id, conversation_id, summarize=self.summarize_conversation)
+
+    def prepare_turn(
+        self, request: ChatRequest, user_id: str
+    ) -> tuple[Conversation | None, List[str], list[dict[str, str]]]:
+        conversation = None
+        history = request.history
+        if request.conversation_id:
+            conversation = self.conversations.load(user_id, request.conversation_id)
+            if conversation.messages or conversation.summary:
+                history = conversation.messages
+            else:
+                conversation.messages = list(request.history)
+
+        hits = self.retrieve_hits_batch(user_id, [request.message], request.config)[0]
+        chunk_ids = [str(hit.id) for hit in hits]
+        if conversation and conversation.last_chunk_ids and request.config.reuse_previous_chunks:
+            hits = self.carry_over_chunks(user_id, hits, conversation.last_chunk_ids)
+        messages = build_chat_messages(
+            self.build_system_prompt(request.config),
+            history,
+            request.message,
+            self.format_context(hits),
+            summary=conversation.summary if conversation else None,
+        )
+        return conversation, chunk_ids, messages
+
+    def carry_over_chunks(self, user_id: str, hits: list, chunk_ids: List[str]) -> list:
+        seen = {str(hit.id) for hit in hits}
+        missing = [chunk_id for chunk_id in chunk_ids if chunk_id not in seen]
+        if not missing or not self.qdrant_client:
+            return hits
+        route = self.tenant_router.route(user_id)
+        records = self.qdrant_client.retrieve(
+            collection_name=route.collection_name,
+            ids=missing,
+            with_payload=True,
+            shard_key_selector=route.shard_key,
+        )
+        return hits + [record for record in records if (record.payload or {}).get("user_id") == user_id]
+
+    def summarize_conversation(self, summary: str, messages: List[ChatMessage]) -> str:
+        transcript = "\n".join(f"{message.role}: {message.content}" for message in messages)
+        prompt = [
+            {
+                "role": "system",
+                "content": (
+                    "You maintain a running summary of a conversation between a user and an assistant. "
+                    "Merge the new messages into the existing summary. Keep facts, decisions, names, "
+                    "document references and open questions. "
+                    f"Use at most {self.settings.conversation_summary_max_words} words."
+                ),
+            },
+            {"role": "user", "content": f"Existing summary:\n{summary or '(none)'}\n\nNew messages:\n{transcript}"},
+        ]
 
-        messages.append({"role": "user", "content": request.message})
+        backend = self.llm.default
 
-        response = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-            temperature=request.config.temperature,
-            stream=True,
+        def complete() -> str:
+            return self.complete(backend, prompt, 0.0)
+
+        request = {"model": backend.model, "messages": prompt, "temperature": 0.0}
+        return self.replay.fetch("chat_summary", request, complete)
+
+    def complete(self, backend: LLMBackend, messages: list[dict[str, str]], temperature: float) -> str:
+        with self.tracer.span("llm", kind="generation", model=backend.model) as span:
+            backend, response = self.call_with_fallback(backend, lambda b: b.complete(messages, temperature))
+            span.set(model=backend.model)
+        self.record_usage(response, backend)
+        return (response.choices[0].message.content or "").strip()
+
+    def stream_completion(
+        self, messages: list[dict[str, str]], temperature: float, backend: LLMBackend | None = None
+    ) -> Iterator[str]:
+        backend = backend or self.llm.default
+        if not self.replay.enabled:
+            yield from self._stream_deltas(backend, messages, temperature)
+            return
+        request = {"model": backend.model, "messages": messages, "temperature": temperature, "stream": True}
+        yield from self.replay.fetch(
+            "chat_stream", request, lambda: list(self._stream_deltas(backend, messages, temperature))
         )
 
+    def _stream_deltas(
+        self, backend: LLMBackend, messages: list[dict[str, str]], temperature: float
+    ) -> Iterator[str]:
+        backend, response = self.call_with_fallback(backend, lambda b: b.stream(messages, temperature))
+
         for chunk in response:
+            if not chunk.choices:
+                self.record_usage(chunk, backend)
+                continue
             choice = chunk.choices[0]
             if not choice.delta or not choice.delta.content:
                 continue
-            data = {"content": choice.delta.content}
-            yield f"data: {json.dumps(data)}\n\n"
+            yield choice.delta.content
 
-        yield "event: end\ndata: {}\n\n"
+    def call_with_fallback(self, backend: LLMBackend, call: Callable[[LLMBackend], T]) -> tuple[LLMBackend, T]:
+        try:
+            return backend, call(backend)
+        except LOCAL_FALLBACK_EXCEPTIONS as e:
+            fallback = self.llm.fallback(backend)
+            if fallback is None:
+                raise
+            logger.warning("Local model %s unavailable (%s), using %s", backend.model, type(e).__name__, fallback.model)
+            return fallback, call(fallback)
 
+    def record_usage(self, response, backend: LLMBackend) -> None:
+        counts = usage_counts(getattr(response, "usage", None))
+        if counts:
+            record_prompt_usage(backend.model, counts)
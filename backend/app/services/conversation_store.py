@@ -0,0 +1,135 @@
+import json
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, Dict, List, Tuple
+
+import redis
+
+from app.config import Settings, get_settings
+from app.dependencies import get_sync_redis_client
+from app.models.schemas import ChatMessage
+
+
+logger = logging.getLogger("enterprise_rag.conversations")
+
+Summarizer = Callable[[str, List[ChatMessage]], str]
+
+
+def conversation_key(user_id: str, conversation_id: str) -> str:
+    return f"chat:conversation:{user_id}:{conversation_id}"
+
+
+@dataclass
+class Conversation:
+    conversation_id: str
+    summary: str = ""
+    messages: List[ChatMessage] = field(default_factory=list)
+    last_chunk_ids: List[str] = field(default_factory=list)
+
+    def to_json(self) -> str:
+        data = asdict(self)
+        data["messages"] = [message.model_dump() for message in self.messages]
+        return json.dumps(data)
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> "Conversation":
+        data = json.loads(raw)
+        data["messages"] = [ChatMessage(**message) for message in data.get("messages", [])]
+        return cls(**data)
+
+
+class LocalConversationBackend:
+    def __init__(self) -> None:
+        self._items: Dict[str, Tuple[float, str]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+            return value
+
+    def set(self, key: str, value: str, ex: int) -> None:
+        with self._lock:
+            self._items[key] = (time.monotonic() + ex, value)
+
+
+_local_backend = LocalConversationBackend()
+
+
+class ConversationStore:
+    def __init__(self, settings: Settings | None = None, client=None):
+        self.settings = settings or get_settings()
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            if self.settings.conversation_store_backend == "memory":
+                self._client = _local_backend
+            else:
+                self._client = get_sync_redis_client()
+        return self._client
+
+    def load(self, user_id: str, conversation_id: str) -> Conversation:
+        try:
+            raw = self.client.get(conversation_key(user_id, conversation_id))
+        except redis.RedisError:
+            logger.warning("Failed to load conversation %s", conversation_id, exc_info=True)
+            raw = None
+        if not raw:
+            return Conversation(conversation_id=conversation_id)
+        return Conversation.from_json(raw)
+
+    def save(self, user_id: str, conversation: Conversation) -> None:
+        try:
+            self.client.set(
+                conversation_key(user_id, conversation.conversation_id),
+                conversation.to_json(),
+                ex=self.settings.conversation_ttl_seconds,
+            )
+        except redis.RedisError:
+            logger.warning("Failed to save conversation %s", conversation.conversation_id, exc_info=True)
+
+    def append_turn(
+        self,
+        user_id: str,
+        conversation: Conversation,
+        user_message: str,
+        assistant_message: str,
+        chunk_ids: List[str],
+    ) -> Conversation:
+        conversation.messages.append(ChatMessage(role="user", content=user_message))
+        conversation.messages.append(ChatMessage(role="assistant", content=assistant_message))
+        conversation.last_chunk_ids = chunk_ids
+        self.save(user_id, conversation)
+        return conversation
+
+    def compact(self, user_id: str, conversation_id: str, summarize: Summarizer | None = None) -> None:
+        conversation = self.load(user_id, conversation_id)
+        limit = self.settings.conversation_max_messages
+        if len(conversation.messages) <= limit:
+            return
+        keep = max(2, limit // 4 * 2)
+        evicted = conversation.messages[:-keep]
+        summary = conversation.summary
+        if summarize is not None:
+            try:
+                summary = summarize(conversation.summary, evicted)
+            except Exception:
+                logger.exception("Failed to summarize conversation %s", conversation_id)
+
+        # A new turn may have been stored while the summary was written; keep it and only drop what was folded.
+        latest = self.load(user_id, conversation_id)
+        if latest.messages[: len(evicted)] != evicted:
+            return
+        latest.messages = latest.messages[len(evicted) :]
+        latest.summary = summary
+        self.save(user_id, latest)
@@ -1,23 +1,126 @@
+import logging
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Iterable, List
 
-from openai import OpenAI
+import numpy as np
+import openai
+from openai import NOT_GIVEN, OpenAI
 
 from app.config import Settings, get_settings
+from app.services.rate_limiter import AdaptiveConcurrencyLimiter, RedisTokenBucket, estimate_tokens
+from app.services.replay import ReplayStore
+from app.utils.vectors import decode_embeddings, decode_vectors, encode_vectors, truncate_embeddings
+
+
+logger = logging.getLogger("enterprise_rag.embeddings")
+
+EMBEDDING_RETRY_EXCEPTIONS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.RateLimitError,
+    openai.InternalServerError,
+)
+
+
+@lru_cache
+def get_concurrency_limiter(initial: int, maximum: int) -> AdaptiveConcurrencyLimiter:
+    return AdaptiveConcurrencyLimiter(initial, maximum)
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+    try:
+        return float(response.headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
 
 
 class EmbeddingService:
     def __init__(self, settings: Settings | None = None):
         self.settings = settings or get_settings()
-        self.client = OpenAI(api_key=self.settings.openai_api_key)
+        self.client = OpenAI(api_key=self.settings.openai_api_key, max_retries=0)
         self.model_name = "text-embedding-3-small"
+        self.dimensions = self.settings.embedding_dimensions
+        self.rate_limiter = RedisTokenBucket(
+            f"embeddings:{self.model_name}",
+            requests_per_minute=self.settings.embedding_rpm_limit,
+            tokens_per_minute=self.settings.embedding_tpm_limit,
+        )
+        self.concurrency = get_concurrency_limiter(
+            self.settings.embedding_initial_concurrency,
+            self.settings.embedding_max_concurrency,
+        )
+        self.replay = ReplayStore(self.settings.replay_mode, self.settings.replay_dir)
 
-    def embed_chunks(self, chunks: Iterable[str]) -> List[List[float]]:
+    def embed_chunks(self, chunks: Iterable[str]) -> np.ndarray:
         inputs = list(chunks)
         if not inputs:
-            return []
-        response = self.client.embeddings.create(model=self.model_name, input=inputs)
-        vectors: List[List[float]] = []
-        for item in response.data:
-            vectors.append(item.embedding)
+            return np.empty((0, self.dimensions or 0), dtype=np.float32)
+        size = self.settings.embedding_batch_size
+        batches = [inputs[start : start + size] for start in range(0, len(inputs), size)]
+        if len(batches) == 1:
+            vectors = self._embed_batch(batches[0])
+        else:
+            with ThreadPoolExecutor(max_workers=self.settings.embedding_max_concurrency) as executor:
+                vectors = np.concatenate(list(executor.map(self._embed_batch, batches)))
+        if self.dimensions:
+            vectors = truncate_embeddings(vectors, self.dimensions)
         return vectors
 
+    def _embed_batch(self, inputs: List[str]) -> np.ndarray:
+        if not self.replay.enabled:
+            return self._request_batch(inputs)
+
+        def record() -> dict:
+            vectors = self._request_batch(inputs)
+            return {"dimensions": int(vectors.shape[1]), "vectors": encode_vectors(vectors)}
+
+        request = {"model": self.model_name, "dimensions": self.dimensions, "input": inputs}
+        recorded = self.replay.fetch("embeddings", request, record)
+        return decode_vectors(recorded["vectors"], recorded["dimensions"])
+
+    def _request_batch(self, inputs: List[str]) -> np.ndarray:
+        tokens = sum(estimate_tokens(text) for text in inputs)
+        attempt = 0
+        while True:
+            self.rate_limiter.acquire(tokens)
+            self.concurrency.acquire()
+            try:
+                response = self.client.embeddings.create(
+                    model=self.model_name,
+                    input=inputs,
+                    dimensions=self.dimensions or NOT_GIVEN,
+                    encoding_format="base64",
+                )
+            except EMBEDDING_RETRY_EXCEPTIONS as e:
+                self.concurrency.release(throttled=isinstance(e, openai.RateLimitError))
+                attempt += 1
+                if attempt > self.settings.embedding_max_retries:
+                    raise
+                delay = self._backoff_seconds(attempt, e)
+                logger.warning(
+                    "Embedding batch of %d input(s) failed (%s), retry %d in %.2fs",
+                    len(inputs),
+                    type(e).__name__,
+                    attempt,
+                    delay,
+                )
+                time.sleep(delay)
+                continue
+            except Exception:
+                self.concurrency.release()
+                raise
+            self.concurrency.release()
+            return decode_embeddings([item.embedding for item in response.data])
+
+    def _backoff_seconds(self, attempt: int, error: Exception) -> float:
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            return retry_after + random.uniform(0, self.settings.embedding_retry_base_seconds)
+        cap = min(self.settings.embedding_retry_max_seconds, self.settings.embedding_retry_base_seconds * 2**attempt)
+        return random.uniform(0, cap)
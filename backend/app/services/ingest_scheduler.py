@@ -0,0 +1,134 @@
+import logging
+import random
+import time
+from typing import Dict, Literal
+
+import redis
+from redis.asyncio import Redis
+
+from app.config import Settings, get_settings
+from app.dependencies import get_sync_redis_client
+
+
+logger = logging.getLogger("enterprise_rag.ingestion")
+
+IngestionLane = Literal["interactive", "bulk"]
+
+QUEUE_WAIT_TENANTS_KEY = "ingest:metrics:queue_wait:tenants"
+
+ACQUIRE_SLOT_SCRIPT = """
+redis.call('ZREMRANGEBYSCORE', KEYS[1], '-inf', ARGV[1] - ARGV[2])
+if redis.call('ZSCORE', KEYS[1], ARGV[3]) then
+    return 1
+end
+if redis.call('ZCARD', KEYS[1]) >= tonumber(ARGV[4]) then
+    return 0
+end
+redis.call('ZADD', KEYS[1], ARGV[1], ARGV[3])
+redis.call('EXPIRE', KEYS[1], ARGV[2])
+return 1
+"""
+
+RECORD_WAIT_SCRIPT = """
+redis.call('HINCRBY', KEYS[1], 'count', 1)
+redis.call('HINCRBYFLOAT', KEYS[1], 'sum', ARGV[1])
+local current = tonumber(redis.call('HGET', KEYS[1], 'max') or '0')
+if tonumber(ARGV[1]) > current then
+    redis.call('HSET', KEYS[1], 'max', ARGV[1])
+end
+return 1
+"""
+
+
+def tenant_slots_key(user_id: str) -> str:
+    return f"ingest:tenant:{user_id}:active"
+
+
+def queue_wait_key(user_id: str, lane: str) -> str:
+    return f"ingest:metrics:queue_wait:{lane}:{user_id}"
+
+
+class IngestionScheduler:
+    def __init__(self, settings: Settings | None = None, client: redis.Redis | None = None):
+        self.settings = settings or get_settings()
+        self._client = client
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = get_sync_redis_client()
+        return self._client
+
+    def lane_priority(self, lane: str) -> int:
+        if lane == "bulk":
+            return self.settings.ingest_bulk_priority
+        return self.settings.ingest_interactive_priority
+
+    def tenant_capacity(self, user_id: str) -> int:
+        weight = self.settings.ingest_tenant_weights.get(user_id, 1.0)
+        return max(1, round(self.settings.ingest_tenant_max_concurrency * weight))
+
+    def try_acquire(self, user_id: str, tracking_id: str) -> bool:
+        try:
+            acquired = self.client.eval(
+                ACQUIRE_SLOT_SCRIPT,
+                1,
+                tenant_slots_key(user_id),
+                time.time(),
+                self.settings.ingest_tenant_lease_seconds,
+                tracking_id,
+                self.tenant_capacity(user_id),
+            )
+        except redis.RedisError:
+            logger.warning("Tenant scheduler unavailable, admitting task %s", tracking_id, exc_info=True)
+            return True
+        return bool(acquired)
+
+    def release(self, user_id: str, tracking_id: str) -> None:
+        try:
+            self.client.zrem(tenant_slots_key(user_id), tracking_id)
+        except redis.RedisError:
+            logger.warning("Failed to release tenant slot for task %s", tracking_id, exc_info=True)
+
+    def defer_seconds(self) -> float:
+        base = self.settings.ingest_defer_seconds
+        return base + random.uniform(0, base)
+
+    def record_queue_wait(self, user_id: str, lane: str, enqueued_at: float | None) -> None:
+        if enqueued_at is None:
+            return
+        wait_seconds = max(0.0, time.time() - enqueued_at)
+        logger.info("Ingestion task for user %s waited %.2fs in %s lane", user_id, wait_seconds, lane)
+        try:
+            pipeline = self.client.pipeline(transaction=False)
+            pipeline.eval(RECORD_WAIT_SCRIPT, 1, queue_wait_key(user_id, lane), wait_seconds)
+            pipeline.sadd(QUEUE_WAIT_TENANTS_KEY, f"{lane}:{user_id}")
+            pipeline.execute()
+        except redis.RedisError:
+            logger.warning("Failed to record queue wait for user %s", user_id, exc_info=True)
+
+
+async def get_queue_wait_metrics(client: Redis) -> Dict[str, Dict[str, dict]]:
+    members = sorted(
+        member.decode() if isinstance(member, bytes) else member
+        for member in await client.smembers(QUEUE_WAIT_TENANTS_KEY)
+    )
+    pipeline = client.pipeline(transaction=False)
+    for member in members:
+        lane, _, user_id = member.partition(":")
+        pipeline.hgetall(queue_wait_key(user_id, lane))
+    raw_stats = await pipeline.execute()
+
+    metrics: Dict[str, Dict[str, dict]] = {}
+    for member, stats in zip(members, raw_stats):
+        if not stats:
+            continue
+        lane, _, user_id = member.partition(":")
+        stats = {(k.decode() if isinstance(k, bytes) else k): float(v) for k, v in stats.items()}
+        count = int(stats.get("count", 0))
+        metrics.setdefault(user_id, {})[lane] = {
+            "count": count,
+            "avg_seconds": stats.get("sum", 0.0) / count if count else 0.0,
+            "max_seconds": stats.get("max", 0.0),
+        }
+    return metrics
@@ -0,0 +1,103 @@
+import logging
+import re
+from dataclasses import dataclass
+from typing import List
+
+import openai
+from openai import OpenAI
+
+from app.config import Settings
+
+
+logger = logging.getLogger("enterprise_rag.llm")
+
+LOCAL_FALLBACK_EXCEPTIONS = (
+    openai.APIConnectionError,
+    openai.APITimeoutError,
+    openai.InternalServerError,
+    openai.NotFoundError,
+)
+
+COMPLEX_QUERY_PATTERN = re.compile(
+    r"\b(compare|comparison|contrast|difference|differences|versus|vs|trade-?offs?|pros and cons|why|"
+    r"analy[sz]e|evaluate|design|architecture|step[- ]by[- ]step|implications?|derive|prove|troubleshoot)\b",
+    re.IGNORECASE,
+)
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def is_simple_query(question: str, max_words: int) -> bool:
+    text = question.strip()
+    if "```" in text or "\n" in text or text.count("?") > 1:
+        return False
+    if len(_WORD_PATTERN.findall(text)) > max_words:
+        return False
+    return COMPLEX_QUERY_PATTERN.search(text) is None
+
+
+def openai_compatible_base_url(url: str) -> str:
+    url = url.rstrip("/")
+    return url if url.endswith("/v1") else f"{url}/v1"
+
+
+@dataclass
+class LLMBackend:
+    name: str
+    model: str
+    client: OpenAI
+
+    def complete(self, messages: List[dict], temperature: float):
+        return self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=False,
+        )
+
+    def stream(self, messages: List[dict], temperature: float):
+        return self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            temperature=temperature,
+            stream=True,
+            stream_options={"include_usage": True},
+        )
+
+
+def build_remote_backend(settings: Settings) -> LLMBackend:
+    return LLMBackend("remote", settings.llm_model, OpenAI(api_key=settings.openai_api_key))
+
+
+def build_local_backend(settings: Settings) -> LLMBackend:
+    client = OpenAI(
+        base_url=openai_compatible_base_url(settings.ollama_base_url),
+        api_key=settings.local_llm_api_key,
+        timeout=settings.local_llm_timeout_seconds,
+        max_retries=0,
+    )
+    return LLMBackend("local", settings.local_llm_model, client)
+
+
+class ModelRouter:
+    def __init__(self, settings: Settings):
+        self.settings = settings
+        use_local = settings.use_local_llm and bool(settings.ollama_base_url)
+        self.local = build_local_backend(settings) if use_local else None
+        self.remote = build_remote_backend(settings) if settings.openai_api_key or not use_local else None
+
+    @property
+    def default(self) -> LLMBackend:
+        return self.remote or self.local
+
+    def route(self, question: str) -> LLMBackend:
+        if self.local is None:
+            return self.remote
+        if self.remote is None or is_simple_query(question, self.settings.llm_simple_query_max_words):
+            return self.local
+        return self.remote
+
+    def fallback(self, backend: LLMBackend) -> LLMBackend | None:
+        if backend is self.local and self.remote is not None:
+            return self.remote
+        return None
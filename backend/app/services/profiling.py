@@ -0,0 +1,132 @@
+import cProfile
+import io
+import json
+import logging
+import pstats
+import re
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterable, Iterator, List, TypeVar
+
+
+logger = logging.getLogger("enterprise_rag.profiling")
+
+PROFILE_TOKEN_HEADER = "X-Profile-Token"
+PROFILE_ID_HEADER = "X-Profile-ID"
+
+PROFILE_TOP_N = 50
+
+_PROFILE_ID_PATTERN = re.compile(r"^[0-9a-f]{32}$")
+_ARTIFACT_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+T = TypeVar("T")
+
+
+def new_profile_id() -> str:
+    return uuid.uuid4().hex
+
+
+class ProfileStore:
+    def __init__(self, directory: str | Path):
+        self.directory = Path(directory)
+
+    def path(self, profile_id: str) -> Path:
+        if not _PROFILE_ID_PATTERN.match(profile_id):
+            raise ValueError(f"Invalid profile id: {profile_id}")
+        return self.directory / profile_id
+
+    def artifact_path(self, profile_id: str, artifact: str) -> Path | None:
+        if not _PROFILE_ID_PATTERN.match(profile_id) or not _ARTIFACT_PATTERN.match(artifact):
+            return None
+        path = self.directory / profile_id / artifact
+        return path if path.is_file() else None
+
+    def write_meta(self, profile_id: str, kind: str, **meta) -> None:
+        path = self.path(profile_id)
+        path.mkdir(parents=True, exist_ok=True)
+        record = {"profile_id": profile_id, "kind": kind, "created_at": time.time(), **meta}
+        (path / "meta.json").write_text(json.dumps(record), encoding="utf-8")
+
+    def list_profiles(self) -> List[dict]:
+        if not self.directory.is_dir():
+            return []
+        profiles = []
+        for path in self.directory.iterdir():
+            meta_path = path / "meta.json"
+            if not meta_path.is_file():
+                continue
+            try:
+                meta = json.loads(meta_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            meta["artifacts"] = sorted(child.name for child in path.iterdir() if child.name != "meta.json")
+            profiles.append(meta)
+        return sorted(profiles, key=lambda meta: meta.get("created_at", 0), reverse=True)
+
+    def save_cprofile(self, profile_id: str, name: str, profiler: cProfile.Profile) -> None:
+        path = self.path(profile_id)
+        path.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(path / f"{name}.prof")
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        (path / f"{name}.txt").write_text(summary.getvalue(), encoding="utf-8")
+
+    def save_tracemalloc(self, profile_id: str, name: str, snapshot: tracemalloc.Snapshot, peak_bytes: int) -> None:
+        path = self.path(profile_id)
+        path.mkdir(parents=True, exist_ok=True)
+        snapshot.dump(str(path / f"{name}.tracemalloc"))
+        lines = [f"Peak traced memory: {peak_bytes / 1024 / 1024:.1f} MiB", ""]
+        lines.extend(str(stat) for stat in snapshot.statistics("lineno")[:PROFILE_TOP_N])
+        (path / f"{name}-memory.txt").write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def profile_iterator(items: Iterable[T], store: ProfileStore, profile_id: str, name: str) -> Iterator[T]:
+    profiler = cProfile.Profile()
+    iterator = iter(items)
+    try:
+        while True:
+            profiler.enable()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                profiler.disable()
+            yield item
+    finally:
+        try:
+            store.save_cprofile(profile_id, name, profiler)
+        except OSError:
+            logger.exception("Failed to save profile %s/%s", profile_id, name)
+
+
+@contextmanager
+def profile_block(
+    store: ProfileStore, profile_id: str, name: str, trace_memory: bool = True, frames: int = 10
+) -> Iterator[None]:
+    started_tracing = trace_memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start(frames)
+    if trace_memory:
+        tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot, peak = None, 0
+        if trace_memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+        if started_tracing:
+            tracemalloc.stop()
+        try:
+            store.save_cprofile(profile_id, name, profiler)
+            if snapshot is not None:
+                store.save_tracemalloc(profile_id, name, snapshot, peak)
+        except OSError:
+            logger.exception("Failed to save profile %s/%s", profile_id, name)
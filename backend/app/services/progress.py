@@ -0,0 +1,61 @@
+import json
+import logging
+from typing import AsyncIterator, Callable
+
+import redis
+from fastapi.concurrency import run_in_threadpool
+from redis.asyncio import Redis
+
+from app.dependencies import get_sync_redis_client
+from app.models.schemas import IngestionStatusResponse
+from app.services.task_status import TERMINAL_STATUSES
+
+
+logger = logging.getLogger("enterprise_rag.progress")
+
+PROGRESS_HEARTBEAT_SECONDS = 15.0
+
+
+def progress_channel(task_id: str) -> str:
+    return f"ingest:progress:{task_id}"
+
+
+def publish_progress(task_id: str, status: IngestionStatusResponse) -> None:
+    try:
+        get_sync_redis_client().publish(progress_channel(task_id), status.model_dump_json())
+    except redis.RedisError:
+        logger.warning("Failed to publish progress for task %s", task_id, exc_info=True)
+
+
+def format_sse(data: str) -> str:
+    return f"data: {data}\n\n"
+
+
+async def stream_progress(
+    client: Redis,
+    task_id: str,
+    current_status: Callable[[], IngestionStatusResponse],
+    heartbeat_seconds: float = PROGRESS_HEARTBEAT_SECONDS,
+) -> AsyncIterator[str]:
+    pubsub = client.pubsub()
+    await pubsub.subscribe(progress_channel(task_id))
+    try:
+        initial = await run_in_threadpool(current_status)
+        yield format_sse(initial.model_dump_json())
+        if initial.status in TERMINAL_STATUSES:
+            return
+
+        while True:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=heartbeat_seconds)
+            if message is None:
+                yield ": keep-alive\n\n"
+                continue
+            data = message["data"]
+            if isinstance(data, bytes):
+                data = data.decode("utf-8")
+            yield format_sse(data)
+            if json.loads(data).get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        await pubsub.unsubscribe(progress_channel(task_id))
+        await pubsub.aclose()
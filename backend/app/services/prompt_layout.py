@@ -0,0 +1,71 @@
+import logging
+from typing import Dict, List, Sequence
+
+import redis
+from redis.asyncio import Redis
+
+from app.dependencies import get_sync_redis_client
+from app.models.schemas import ChatMessage
+
+
+logger = logging.getLogger("enterprise_rag.prompt_layout")
+
+CONTEXT_PREAMBLE = "Use the following context from the user's documents when answering:\n"
+SUMMARY_PREAMBLE = "Summary of the earlier part of this conversation:\n"
+PROMPT_CACHE_METRICS_KEY = "chat:metrics:prompt_cache"
+USAGE_FIELDS = ("requests", "prompt_tokens", "cached_tokens", "completion_tokens")
+
+
+def build_chat_messages(
+    system_prompt: str,
+    history: Sequence[ChatMessage],
+    question: str,
+    context: str | None = None,
+    summary: str | None = None,
+) -> List[dict]:
+    messages = [{"role": "system", "content": system_prompt}]
+    if summary:
+        messages.append({"role": "system", "content": f"{SUMMARY_PREAMBLE}{summary}"})
+    messages.extend({"role": message.role, "content": message.content} for message in history)
+    if context:
+        messages.append({"role": "system", "content": f"{CONTEXT_PREAMBLE}{context}"})
+    messages.append({"role": "user", "content": question})
+    return messages
+
+
+def usage_counts(usage) -> Dict[str, int] | None:
+    if usage is None:
+        return None
+    details = getattr(usage, "prompt_tokens_details", None)
+    return {
+        "prompt_tokens": usage.prompt_tokens or 0,
+        "cached_tokens": (getattr(details, "cached_tokens", None) or 0) if details else 0,
+        "completion_tokens": usage.completion_tokens or 0,
+    }
+
+
+def record_prompt_usage(model: str, counts: Dict[str, int], client: redis.Redis | None = None) -> None:
+    logger.info(
+        "Chat completion on %s: %d prompt tokens (%d cached), %d completion tokens",
+        model,
+        counts["prompt_tokens"],
+        counts["cached_tokens"],
+        counts["completion_tokens"],
+    )
+    try:
+        pipeline = (client or get_sync_redis_client()).pipeline(transaction=False)
+        pipeline.hincrby(PROMPT_CACHE_METRICS_KEY, "requests", 1)
+        for field, value in counts.items():
+            pipeline.hincrby(PROMPT_CACHE_METRICS_KEY, field, value)
+        pipeline.execute()
+    except redis.RedisError:
+        logger.warning("Failed to record prompt cache usage", exc_info=True)
+
+
+async def get_prompt_cache_metrics(client: Redis) -> Dict[str, float]:
+    raw = await client.hgetall(PROMPT_CACHE_METRICS_KEY)
+    stats = {(k.decode() if isinstance(k, bytes) else k): int(v) for k, v in raw.items()}
+    metrics: Dict[str, float] = {field: stats.get(field, 0) for field in USAGE_FIELDS}
+    prompt_tokens = metrics["prompt_tokens"]
+    metrics["cache_hit_ratio"] = metrics["cached_tokens"] / prompt_tokens if prompt_tokens else 0.0
+    return metrics
@@ -0,0 +1,112 @@
+import logging
+import math
+import threading
+import time
+
+import redis
+
+from app.dependencies import get_sync_redis_client
+
+
+logger = logging.getLogger("enterprise_rag.rate_limiter")
+
+BUCKET_TTL_SECONDS = 120
+
+TOKEN_BUCKET_SCRIPT = """
+local now = tonumber(ARGV[1])
+local wait = 0
+local levels = {}
+for i = 1, 2 do
+    local limit = tonumber(ARGV[i + 1])
+    local cost = math.min(tonumber(ARGV[i + 3]), limit)
+    local rate = limit / 60.0
+    local state = redis.call('HMGET', KEYS[i], 'level', 'ts')
+    local level = tonumber(state[1]) or limit
+    local ts = tonumber(state[2]) or now
+    level = math.min(limit, level + math.max(0, now - ts) * rate)
+    levels[i] = {level, cost}
+    if level < cost then
+        wait = math.max(wait, (cost - level) / rate)
+    end
+end
+for i = 1, 2 do
+    local level = levels[i][1]
+    if wait == 0 then
+        level = level - levels[i][2]
+    end
+    redis.call('HSET', KEYS[i], 'level', level, 'ts', now)
+    redis.call('EXPIRE', KEYS[i], ARGV[6])
+end
+return math.ceil(wait * 1000)
+"""
+
+
+def estimate_tokens(text: str) -> int:
+    return max(1, math.ceil(len(text) / 4))
+
+
+class RedisTokenBucket:
+    def __init__(
+        self,
+        name: str,
+        requests_per_minute: int,
+        tokens_per_minute: int,
+        client: redis.Redis | None = None,
+    ):
+        self.name = name
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._client = client
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = get_sync_redis_client()
+        return self._client
+
+    def reserve(self, tokens: int) -> float:
+        try:
+            wait_ms = self.client.eval(
+                TOKEN_BUCKET_SCRIPT,
+                2,
+                f"ratelimit:{self.name}:requests",
+                f"ratelimit:{self.name}:tokens",
+                time.time(),
+                self.requests_per_minute,
+                self.tokens_per_minute,
+                1,
+                tokens,
+                BUCKET_TTL_SECONDS,
+            )
+        except redis.RedisError:
+            logger.warning("Rate limiter %s unavailable, admitting request", self.name, exc_info=True)
+            return 0.0
+        return int(wait_ms) / 1000
+
+    def acquire(self, tokens: int) -> None:
+        while (wait := self.reserve(tokens)) > 0:
+            time.sleep(wait)
+
+
+class AdaptiveConcurrencyLimiter:
+    def __init__(self, initial: int, maximum: int):
+        self.maximum = maximum
+        self.limit = float(min(initial, maximum))
+        self.in_flight = 0
+        self._condition = threading.Condition()
+
+    def acquire(self) -> None:
+        with self._condition:
+            while self.in_flight >= int(self.limit):
+                self._condition.wait()
+            self.in_flight += 1
+
+    def release(self, throttled: bool = False) -> None:
+        with self._condition:
+            self.in_flight -= 1
+            if throttled:
+                self.limit = max(1.0, self.limit / 2)
+                logger.info("Throttled, concurrency limit lowered to %d", int(self.limit))
+            else:
+                self.limit = min(float(self.maximum), self.limit + 1 / self.limit)
+            self._condition.notify_all()
@@ -0,0 +1,59 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict
+
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import text
+
+from app.config import get_settings
+from app.db.session import get_engine
+from app.dependencies import get_chat_orchestrator, get_qdrant_client, get_redis_client
+from app.models.schemas import ReadinessResponse
+
+
+logger = logging.getLogger("enterprise_rag.readiness")
+
+
+async def probe_postgres() -> None:
+    async with get_engine().connect() as connection:
+        await connection.execute(text("SELECT 1"))
+
+
+async def probe_redis() -> None:
+    await get_redis_client().ping()
+
+
+async def probe_qdrant() -> None:
+    await run_in_threadpool(get_qdrant_client().get_collections)
+
+
+READINESS_PROBES: Dict[str, Callable[[], Awaitable[None]]] = {
+    "postgres": probe_postgres,
+    "redis": probe_redis,
+    "qdrant": probe_qdrant,
+}
+
+
+async def run_probe(name: str, probe: Callable[[], Awaitable[None]], timeout: float) -> str:
+    try:
+        await asyncio.wait_for(probe(), timeout)
+    except Exception as e:
+        logger.warning("Readiness probe %s failed: %s", name, e)
+        return f"error: {type(e).__name__}"
+    return "ok"
+
+
+async def check_readiness(timeout: float | None = None) -> ReadinessResponse:
+    timeout = timeout or get_settings().readiness_timeout_seconds
+    names = list(READINESS_PROBES)
+    results = await asyncio.gather(*(run_probe(name, READINESS_PROBES[name], timeout) for name in names))
+    return ReadinessResponse(ready=all(result == "ok" for result in results), checks=dict(zip(names, results)))
+
+
+async def warm_up() -> ReadinessResponse:
+    started = time.perf_counter()
+    await run_in_threadpool(get_chat_orchestrator)
+    readiness = await check_readiness()
+    logger.info("Warm-up finished in %.2fs: %s", time.perf_counter() - started, readiness.checks)
+    return readiness
@@ -0,0 +1,57 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Literal
+
+
+logger = logging.getLogger("enterprise_rag.replay")
+
+ReplayMode = Literal["off", "record", "replay"]
+
+
+class ReplayMissError(LookupError):
+    pass
+
+
+def request_key(kind: str, request: dict) -> str:
+    canonical = json.dumps({"kind": kind, "request": request}, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ReplayStore:
+    def __init__(self, mode: ReplayMode = "off", directory: str | Path = "./replay"):
+        self.mode = mode
+        self.directory = Path(directory)
+
+    @property
+    def enabled(self) -> bool:
+        return self.mode != "off"
+
+    def path_for(self, kind: str, key: str) -> Path:
+        return self.directory / kind / key[:2] / f"{key}.json"
+
+    def fetch(self, kind: str, request: dict, produce: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return produce()
+
+        key = request_key(kind, request)
+        path = self.path_for(kind, key)
+        if path.exists():
+            return json.loads(path.read_text(encoding="utf-8"))["response"]
+        if self.mode == "replay":
+            raise ReplayMissError(f"No recorded {kind} response for request {key} in {self.directory}")
+
+        response = produce()
+        self._write(path, {"kind": kind, "request": request, "response": response})
+        logger.debug("Recorded %s response %s", kind, key)
+        return response
+
+    def _write(self, path: Path, record: dict) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
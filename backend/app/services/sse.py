@@ -0,0 +1,117 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import orjson
+
+
+SSE_KEEP_ALIVE = b": keep-alive\n\n"
+SSE_END = b"event: end\ndata: {}\n\n"
+
+
+def sse_frame(data: dict) -> bytes:
+    return b"data: " + orjson.dumps(data) + b"\n\n"
+
+
+def sse_retry(milliseconds: int) -> bytes:
+    return f"retry: {milliseconds}\n\n".encode("ascii")
+
+
+class DeltaCoalescer:
+    def __init__(self, window_seconds: float, max_bytes: int, heartbeat_seconds: float):
+        self.window_seconds = window_seconds
+        self.max_bytes = max_bytes
+        self.heartbeat_seconds = heartbeat_seconds
+        self.buffer: List[str] = []
+        self.buffered_bytes = 0
+        self.done = False
+        self.error: Exception | None = None
+        self.heartbeat_due = False
+        self.wakeup = asyncio.Event()
+        self._loop = asyncio.get_running_loop()
+        self._last_write = self._loop.time()
+        self._next_flush = float("-inf")
+        self._flush_timer: asyncio.TimerHandle | None = None
+        self._heartbeat_timer = self._loop.call_later(heartbeat_seconds, self._check_heartbeat)
+
+    def _check_heartbeat(self) -> None:
+        idle = self._loop.time() - self._last_write
+        if idle >= self.heartbeat_seconds:
+            self.heartbeat_due = True
+            self.wakeup.set()
+            idle = 0.0
+        self._heartbeat_timer = self._loop.call_later(self.heartbeat_seconds - idle, self._check_heartbeat)
+
+    def add(self, delta: str) -> None:
+        if not self.buffer:
+            delay = self._next_flush - self._loop.time()
+            if delay > 0:
+                self._flush_timer = self._loop.call_later(delay, self.wakeup.set)
+            else:
+                self.wakeup.set()
+        self.buffer.append(delta)
+        self.buffered_bytes += len(delta)
+        if self.buffered_bytes >= self.max_bytes:
+            self.wakeup.set()
+
+    def finish(self, error: Exception | None = None) -> None:
+        self.done = True
+        self.error = error
+        self.wakeup.set()
+
+    def take_frame(self) -> bytes | None:
+        if self._flush_timer:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        if self.buffer:
+            frame = sse_frame({"content": "".join(self.buffer)})
+            self.buffer.clear()
+            self.buffered_bytes = 0
+            self._next_flush = self._loop.time() + self.window_seconds
+        elif self.heartbeat_due:
+            frame = SSE_KEEP_ALIVE
+        else:
+            return None
+        self.heartbeat_due = False
+        self._last_write = self._loop.time()
+        return frame
+
+    async def consume(self, deltas: AsyncIterator[str]) -> None:
+        try:
+            async for delta in deltas:
+                self.add(delta)
+        except Exception as e:
+            self.finish(e)
+        else:
+            self.finish()
+
+    def close(self) -> None:
+        self._heartbeat_timer.cancel()
+        if self._flush_timer:
+            self._flush_timer.cancel()
+
+
+async def coalesce_sse(
+    deltas: AsyncIterator[str],
+    window_seconds: float,
+    max_bytes: int,
+    heartbeat_seconds: float,
+    retry_ms: int,
+) -> AsyncIterator[bytes]:
+    coalescer = DeltaCoalescer(window_seconds, max_bytes, heartbeat_seconds)
+    producer = asyncio.create_task(coalescer.consume(deltas))
+    yield sse_retry(retry_ms)
+    try:
+        while True:
+            await coalescer.wakeup.wait()
+            coalescer.wakeup.clear()
+            frame = coalescer.take_frame()
+            if frame:
+                yield frame
+            if coalescer.done:
+                break
+        if coalescer.error:
+            raise coalescer.error
+        yield SSE_END
+    finally:
+        producer.cancel()
+        coalescer.close()
@@ -4,6 +4,14 @@ from pathlib import Path
 from typing import BinaryIO
 
 from app.config import Settings, get_settings
+from app.utils.extraction_artifacts import delete_extraction_artifacts
+
+
+COPY_CHUNK_BYTES = 1024 * 1024
+
+
+class StorageLimitExceeded(Exception):
+    pass
 
 
 class StorageService:
@@ -22,6 +30,30 @@ class StorageService:
         
         return str(file_path)
 
+    def save_stream(
+        self, stream: BinaryIO, filename: str, user_id: str, head: bytes = b"", max_bytes: int | None = None
+    ) -> str:
+        file_id = str(uuid.uuid4())
+        user_dir = self.storage_path / user_id
+        user_dir.mkdir(parents=True, exist_ok=True)
+
+        file_path = user_dir / f"{file_id}_{filename}"
+        written = 0
+        try:
+            with file_path.open("wb") as target:
+                chunk = head or stream.read(COPY_CHUNK_BYTES)
+                while chunk:
+                    written += len(chunk)
+                    if max_bytes is not None and written > max_bytes:
+                        raise StorageLimitExceeded(f"{filename} exceeds {max_bytes} bytes")
+                    target.write(chunk)
+                    chunk = stream.read(COPY_CHUNK_BYTES)
+        except BaseException:
+            file_path.unlink(missing_ok=True)
+            raise
+
+        return str(file_path)
+
     def get_file_path(self, file_id: str, user_id: str) -> Path | None:
         user_dir = self.storage_path / user_id
         for file_path in user_dir.glob(f"{file_id}_*"):
@@ -30,3 +62,11 @@ class StorageService:
 
     def read_file(self, file_path: str) -> bytes:
         return Path(file_path).read_bytes()
+
+    def delete_file(self, file_path: str) -> bool:
+        path = Path(file_path)
+        delete_extraction_artifacts(path)
+        if not path.exists():
+            return False
+        path.unlink()
+        return True
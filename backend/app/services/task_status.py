@@ -0,0 +1,91 @@
+from typing import Any, Dict, List
+
+from celery.result import AsyncResult
+from redis.asyncio import Redis
+
+from app.models.schemas import IngestionStatusResponse
+
+
+TERMINAL_STATUSES = {"completed", "failed"}
+
+
+def build_status_response(task_result: AsyncResult) -> IngestionStatusResponse:
+    return status_from_state(task_result.state, task_result.info)
+
+
+def status_from_state(state: str, info: Any) -> IngestionStatusResponse:
+    if state == "PENDING":
+        return IngestionStatusResponse(
+            status="pending",
+            step=None,
+            progress=0,
+            error=None,
+        )
+
+    if state == "STARTED":
+        return IngestionStatusResponse(
+            status="processing",
+            step="started",
+            progress=0,
+            error=None,
+        )
+
+    if state == "RETRY":
+        return IngestionStatusResponse(
+            status="pending",
+            step="retrying",
+            progress=0,
+            error=None,
+        )
+
+    if state == "PROCESSING":
+        meta = info or {}
+        return IngestionStatusResponse(
+            status="processing",
+            step=meta.get("step"),
+            progress=meta.get("progress", 0),
+            error=None,
+        )
+
+    if state == "SUCCESS":
+        return IngestionStatusResponse(
+            status="completed",
+            step="completed",
+            progress=100,
+            error=None,
+        )
+
+    if state == "FAILURE":
+        meta = info or {}
+        error_msg = str(info) if isinstance(info, (str, dict)) else "Unknown error"
+        if isinstance(meta, dict) and "error" in meta:
+            error_msg = meta["error"]
+        return IngestionStatusResponse(
+            status="failed",
+            step=meta.get("step", "error") if isinstance(meta, dict) else "error",
+            progress=0,
+            error=error_msg,
+        )
+
+    return IngestionStatusResponse(
+        status="unknown",
+        step=None,
+        progress=0,
+        error=f"Unknown task state: {state}",
+    )
+
+
+async def fetch_status_batch(redis: Redis, backend: Any, task_ids: List[str]) -> Dict[str, IngestionStatusResponse]:
+    pipeline = redis.pipeline(transaction=False)
+    for task_id in task_ids:
+        pipeline.get(backend.get_key_for_task(task_id))
+    raw_results = await pipeline.execute()
+
+    statuses: Dict[str, IngestionStatusResponse] = {}
+    for task_id, raw in zip(task_ids, raw_results):
+        if raw is None:
+            statuses[task_id] = status_from_state("PENDING", None)
+            continue
+        meta = backend.decode_result(raw)
+        statuses[task_id] = status_from_state(meta.get("status", "PENDING"), meta.get("result"))
+    return statuses
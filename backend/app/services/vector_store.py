@@ -0,0 +1,222 @@
+import logging
+import zlib
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+
+from app.config import Settings, get_settings
+
+
+logger = logging.getLogger("enterprise_rag.vector_store")
+
+PAYLOAD_INDEX_FIELDS = ("user_id", "doc_id", "access_level")
+DEFAULT_SHARD_KEY = "default"
+
+_known_shard_keys: set[tuple[str, str]] = set()
+
+
+@dataclass(frozen=True)
+class TenantRoute:
+    collection_name: str
+    shard_key: str | None = None
+
+
+class TenantRouter:
+    def __init__(self, settings: Settings | None = None) -> None:
+        self.settings = settings or get_settings()
+        self.strategy = self.settings.qdrant_multitenancy
+        self.base_collection = self.settings.qdrant_collection_name
+        self.routes = self.settings.qdrant_tenant_routes
+
+    def route(self, user_id: str) -> TenantRoute:
+        if self.strategy == "shard_key":
+            return TenantRoute(
+                collection_name=f"{self.base_collection}_sharded",
+                shard_key=self.routes.get(user_id, DEFAULT_SHARD_KEY),
+            )
+        if self.strategy == "collection":
+            group = self.routes.get(user_id)
+            if group is None:
+                groups = max(self.settings.qdrant_tenant_groups, 1)
+                group = f"g{zlib.crc32(user_id.encode('utf-8')) % groups}"
+            return TenantRoute(collection_name=f"{self.base_collection}_{group}")
+        return TenantRoute(collection_name=self.base_collection)
+
+
+def create_qdrant_client(settings: Settings | None = None) -> QdrantClient:
+    settings = settings or get_settings()
+    return QdrantClient(
+        url=settings.qdrant_url,
+        api_key=settings.qdrant_api_key,
+        prefer_grpc=settings.qdrant_prefer_grpc,
+        grpc_port=settings.qdrant_grpc_port,
+        timeout=settings.qdrant_timeout,
+    )
+
+
+def tenant_filter(user_id: str, *conditions: qmodels.FieldCondition) -> qmodels.Filter:
+    return qmodels.Filter(
+        must=[
+            qmodels.FieldCondition(key="user_id", match=qmodels.MatchValue(value=user_id)),
+            *conditions,
+        ]
+    )
+
+
+def build_hnsw_config(settings: Settings) -> qmodels.HnswConfigDiff:
+    return qmodels.HnswConfigDiff(m=settings.qdrant_hnsw_m, ef_construct=settings.qdrant_hnsw_ef_construct)
+
+
+def build_quantization_config(settings: Settings) -> qmodels.ScalarQuantization | None:
+    if not settings.qdrant_scalar_quantization:
+        return None
+    return qmodels.ScalarQuantization(
+        scalar=qmodels.ScalarQuantizationConfig(
+            type=qmodels.ScalarType.INT8,
+            always_ram=settings.qdrant_quantization_always_ram,
+        )
+    )
+
+
+def quantization_matches(current, desired: qmodels.ScalarQuantization) -> bool:
+    if not isinstance(current, qmodels.ScalarQuantization):
+        return False
+    # The server echoes back defaults we never set, so only compare the fields we configure.
+    return (
+        current.scalar.type == desired.scalar.type
+        and desired.scalar.quantile in (None, current.scalar.quantile)
+        and bool(current.scalar.always_ram) == bool(desired.scalar.always_ram)
+    )
+
+
+def migrate_qdrant_collection(
+    client: QdrantClient, collection_name: str, info: qmodels.CollectionInfo, settings: Settings
+) -> None:
+    update_kwargs: dict = {}
+
+    hnsw = info.config.hnsw_config
+    if hnsw.m != settings.qdrant_hnsw_m or hnsw.ef_construct != settings.qdrant_hnsw_ef_construct:
+        update_kwargs["hnsw_config"] = build_hnsw_config(settings)
+
+    quantization = build_quantization_config(settings)
+    current_quantization = info.config.quantization_config
+    if quantization is not None and not quantization_matches(current_quantization, quantization):
+        update_kwargs["quantization_config"] = quantization
+    elif quantization is None and current_quantization is not None:
+        update_kwargs["quantization_config"] = qmodels.Disabled.DISABLED
+
+    vectors = info.config.params.vectors
+    if isinstance(vectors, qmodels.VectorParams) and bool(vectors.on_disk) != settings.qdrant_on_disk_vectors:
+        update_kwargs["vectors_config"] = {"": qmodels.VectorParamsDiff(on_disk=settings.qdrant_on_disk_vectors)}
+
+    if update_kwargs:
+        logger.info("Migrating Qdrant collection %s: %s", collection_name, sorted(update_kwargs))
+        client.update_collection(collection_name=collection_name, **update_kwargs)
+
+
+def ensure_shard_key(client: QdrantClient, collection_name: str, shard_key: str) -> None:
+    if (collection_name, shard_key) in _known_shard_keys:
+        return
+    try:
+        client.create_shard_key(collection_name=collection_name, shard_key=shard_key)
+    except Exception as e:
+        if "already exists" not in str(e).lower():
+            raise
+    _known_shard_keys.add((collection_name, shard_key))
+
+
+def ensure_qdrant_collection(
+    client: QdrantClient,
+    vector_size: int,
+    settings: Settings | None = None,
+    route: TenantRoute | None = None,
+) -> None:
+    settings = settings or get_settings()
+    collection_name = route.collection_name if route else settings.qdrant_collection_name
+    try:
+        info = client.get_collection(collection_name=collection_name)
+    except Exception:
+        info = None
+
+    if info is None:
+        client.create_collection(
+            collection_name=collection_name,
+            vectors_config=qmodels.VectorParams(
+                size=vector_size,
+                distance=qmodels.Distance.COSINE,
+                on_disk=settings.qdrant_on_disk_vectors,
+                datatype=qmodels.Datatype(settings.qdrant_vector_datatype),
+            ),
+            sharding_method=qmodels.ShardingMethod.CUSTOM if route and route.shard_key else None,
+            hnsw_config=build_hnsw_config(settings),
+            quantization_config=build_quantization_config(settings),
+        )
+        existing_indexes: set[str] = set()
+    else:
+        vectors = info.config.params.vectors
+        if isinstance(vectors, qmodels.VectorParams) and vectors.size != vector_size:
+            raise ValueError(
+                f"Collection {collection_name} stores {vectors.size}-dim vectors, got {vector_size}; "
+                "re-index into a new collection to change embedding dimensions"
+            )
+        migrate_qdrant_collection(client, collection_name, info, settings)
+        existing_indexes = set(info.payload_schema or {})
+
+    for field_name in PAYLOAD_INDEX_FIELDS:
+        if field_name in existing_indexes:
+            continue
+        client.create_payload_index(
+            collection_name=collection_name,
+            field_name=field_name,
+            field_schema=qmodels.PayloadSchemaType.KEYWORD,
+            wait=True,
+        )
+
+    if route and route.shard_key:
+        ensure_shard_key(client, collection_name, route.shard_key)
+
+
+def upsert_points(client: QdrantClient, route: TenantRoute, points: List[qmodels.PointStruct]) -> None:
+    client.upsert(
+        collection_name=route.collection_name,
+        points=points,
+        shard_key_selector=route.shard_key,
+    )
+
+
+def upload_vectors(
+    client: QdrantClient,
+    route: TenantRoute,
+    ids: List[str],
+    vectors: np.ndarray,
+    payloads: List[dict],
+    batch_size: int = 256,
+) -> None:
+    client.upload_collection(
+        collection_name=route.collection_name,
+        vectors=vectors,
+        payload=payloads,
+        ids=ids,
+        batch_size=batch_size,
+        wait=True,
+        shard_key_selector=route.shard_key,
+    )
+
+
+def delete_document_vectors(client: QdrantClient, route: TenantRoute, user_id: str, doc_ids: List[str]) -> None:
+    if not doc_ids or not client.collection_exists(collection_name=route.collection_name):
+        return
+    client.delete(
+        collection_name=route.collection_name,
+        points_selector=qmodels.FilterSelector(
+            filter=tenant_filter(
+                user_id,
+                qmodels.FieldCondition(key="doc_id", match=qmodels.MatchAny(any=doc_ids)),
+            )
+        ),
+        wait=True,
+        shard_key_selector=route.shard_key,
+    )
@@ -0,0 +1,59 @@
+import argparse
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+from app.config import get_settings
+from app.services.embeddings import EmbeddingService
+from app.utils.vectors import recall_at_k, truncate_embeddings
+
+
+def load_passages(path: Path) -> List[str]:
+    return [line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()]
+
+
+def evaluate_dimensions(vectors: np.ndarray, dimensions: List[int], k: int, queries: np.ndarray) -> List[dict]:
+    results = []
+    for size in sorted(set(dimensions)):
+        truncated = truncate_embeddings(vectors, size)
+        results.append(
+            {
+                "dimensions": truncated.shape[1],
+                "recall": recall_at_k(vectors, truncated, queries, k),
+                "float32_bytes": truncated.shape[1] * 4,
+                "float16_bytes": truncated.shape[1] * 2,
+            }
+        )
+    return results
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Measure recall@k of truncated embeddings against full-dimension embeddings."
+    )
+    parser.add_argument("input", type=Path, help="Text file with one passage per line")
+    parser.add_argument("--dims", type=int, nargs="+", default=[256, 512, 768, 1024])
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=100, help="Number of passages used as queries")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    passages = load_passages(args.input)
+    if len(passages) <= args.k:
+        parser.error(f"Need more than {args.k} passages, got {len(passages)}")
+
+    settings = get_settings().model_copy(update={"embedding_dimensions": None})
+    vectors = EmbeddingService(settings).embed_chunks(passages)
+
+    rng = np.random.default_rng(args.seed)
+    queries = rng.choice(len(passages), size=min(args.queries, len(passages)), replace=False)
+
+    print(f"{len(passages)} passages, {len(queries)} queries, full dimension {vectors.shape[1]}")
+    print(f"{'dims':>6} {'recall@' + str(args.k):>10} {'f32 bytes':>10} {'f16 bytes':>10}")
+    for row in evaluate_dimensions(vectors, args.dims, args.k, queries):
+        print(f"{row['dimensions']:>6} {row['recall']:>10.4f} {row['float32_bytes']:>10} {row['float16_bytes']:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+import argparse
+import time
+import uuid
+from typing import List, Tuple
+
+import numpy as np
+from qdrant_client import grpc
+from qdrant_client.conversions.conversion import RestToGrpc, payload_to_grpc
+from qdrant_client.http import models as qmodels
+
+from app.config import Settings, get_settings
+from app.services.vector_store import TenantRoute, create_qdrant_client, ensure_qdrant_collection, upload_vectors
+from app.utils.vectors import normalize_rows
+
+
+def make_workload(points: int, dimensions: int, seed: int = 0) -> Tuple[List[str], np.ndarray, List[dict]]:
+    rng = np.random.default_rng(seed)
+    ids = [str(uuid.UUID(int=index + 1)) for index in range(points)]
+    vectors = normalize_rows(rng.normal(size=(points, dimensions)))
+    payloads = [
+        {"user_id": "benchmark", "doc_id": str(index // 20), "page_number": 1, "chunk_index": index % 20}
+        for index in range(points)
+    ]
+    return ids, vectors, payloads
+
+
+def encode_rest(ids: List[str], vectors: np.ndarray, payloads: List[dict]) -> bytes:
+    batch = qmodels.PointsBatch(batch=qmodels.Batch(ids=ids, vectors=vectors.tolist(), payloads=payloads))
+    return batch.model_dump_json(exclude_unset=True).encode("utf-8")
+
+
+def encode_grpc(ids: List[str], vectors: np.ndarray, payloads: List[dict]) -> bytes:
+    points = [
+        grpc.PointStruct(
+            id=RestToGrpc.convert_extended_point_id(point_id),
+            vectors=RestToGrpc.convert_vector_struct(vector),
+            payload=payload_to_grpc(payload),
+        )
+        for point_id, vector, payload in zip(ids, vectors.tolist(), payloads)
+    ]
+    return grpc.UpsertPoints(collection_name="benchmark", points=points).SerializeToString()
+
+
+def measure_encoding(ids: List[str], vectors: np.ndarray, payloads: List[dict]) -> dict:
+    results = {}
+    for transport, encode in (("rest", encode_rest), ("grpc", encode_grpc)):
+        started = time.perf_counter()
+        body = encode(ids, vectors, payloads)
+        elapsed = time.perf_counter() - started
+        results[transport] = {
+            "bytes": len(body),
+            "bytes_per_vector": len(body) / len(ids),
+            "seconds": elapsed,
+        }
+    return results
+
+
+def measure_live(
+    settings: Settings,
+    prefer_grpc: bool,
+    ids: List[str],
+    vectors: np.ndarray,
+    payloads: List[dict],
+    queries: int,
+) -> dict:
+    transport_settings = settings.model_copy(update={"qdrant_prefer_grpc": prefer_grpc})
+    client = create_qdrant_client(transport_settings)
+    route = TenantRoute(collection_name=f"transport_benchmark_{uuid.uuid4().hex[:8]}")
+    ensure_qdrant_collection(client, vectors.shape[1], transport_settings, route)
+    try:
+        started = time.perf_counter()
+        upload_vectors(client, route, ids, vectors, payloads, settings.qdrant_upload_batch_size)
+        upsert_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for vector in vectors[:queries]:
+            client.search(collection_name=route.collection_name, query_vector=vector, limit=5)
+        search_seconds = time.perf_counter() - started
+    finally:
+        client.delete_collection(collection_name=route.collection_name)
+        client.close()
+
+    return {
+        "upsert_vectors_per_second": len(ids) / upsert_seconds,
+        "searches_per_second": min(queries, len(ids)) / search_seconds,
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare Qdrant REST and gRPC transports for upsert and search.")
+    parser.add_argument("--points", type=int, default=5000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--encode-only", action="store_true", help="Only compare request encoding, no server needed")
+    args = parser.parse_args(argv)
+
+    ids, vectors, payloads = make_workload(args.points, args.dimensions)
+
+    print(f"Encoding {args.points} x {args.dimensions} vectors")
+    for transport, row in measure_encoding(ids, vectors, payloads).items():
+        print(
+            f"  {transport:>4}: {row['bytes'] / 1024 / 1024:8.2f} MiB "
+            f"({row['bytes_per_vector']:8.0f} B/vector), {row['seconds']:.3f}s"
+        )
+    if args.encode_only:
+        return
+
+    settings = get_settings()
+    print(f"Live benchmark against {settings.qdrant_url} (gRPC port {settings.qdrant_grpc_port})")
+    for transport, prefer_grpc in (("rest", False), ("grpc", True)):
+        row = measure_live(settings, prefer_grpc, ids, vectors, payloads, args.queries)
+        print(
+            f"  {transport:>4}: upsert {row['upsert_vectors_per_second']:10.0f} vectors/s, "
+            f"search {row['searches_per_second']:8.1f} queries/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+import argparse
+import json
+import re
+import time
+import uuid
+import zlib
+from pathlib import Path
+from typing import Iterable, List
+
+import numpy as np
+from qdrant_client import QdrantClient
+
+from app.config import Settings, get_settings
+from app.models.schemas import ChatConfig
+from app.services.chat import ChatOrchestrator
+from app.services.vector_store import ensure_qdrant_collection, upload_vectors
+from app.utils.retrieval_metrics import ndcg_at_k, recall_at_k, reciprocal_rank
+from app.utils.vectors import normalize_rows
+
+
+EVAL_USER_ID = "eval-test-user"
+FIXTURES_PATH = Path(__file__).resolve().parents[2] / "tests" / "evals" / "fixtures"
+HASHED_EMBEDDING_DIMENSIONS = 512
+HASHED_TERM_PREFIX = 5
+
+_TERM_PATTERN = re.compile(r"[a-z0-9]{4,}")
+
+EVAL_CONFIGS = {
+    "baseline": ChatConfig(),
+    "dedup": ChatConfig(dedup_threshold=0.9),
+    "mmr": ChatConfig(use_mmr=True),
+}
+
+
+class HashedEmbeddingService:
+    def __init__(self, dimensions: int = HASHED_EMBEDDING_DIMENSIONS):
+        self.dimensions = dimensions
+
+    def embed_chunks(self, chunks: Iterable[str]) -> np.ndarray:
+        texts = list(chunks)
+        vectors = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for term in _TERM_PATTERN.findall(text.lower()):
+                vectors[row, zlib.crc32(term[:HASHED_TERM_PREFIX].encode("utf-8")) % self.dimensions] += 1.0
+        return normalize_rows(vectors)
+
+
+def load_json(path: Path) -> list:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_eval_index(orchestrator: ChatOrchestrator, corpus: List[dict], user_id: str = EVAL_USER_ID) -> None:
+    vectors = orchestrator.embedding_service.embed_chunks([entry["text"] for entry in corpus])
+    route = orchestrator.tenant_router.route(user_id)
+    ensure_qdrant_collection(orchestrator.qdrant_client, int(vectors.shape[1]), orchestrator.settings, route)
+    ids = [str(uuid.uuid5(uuid.NAMESPACE_URL, f"{entry['filename']}:{index}")) for index, entry in enumerate(corpus)]
+    payloads = [
+        {
+            "user_id": user_id,
+            "doc_id": entry["filename"],
+            "filename": entry["filename"],
+            "page_number": entry.get("page_number", 1),
+            "chunk_index": index,
+            "access_level": "admin",
+            "text": entry["text"],
+        }
+        for index, entry in enumerate(corpus)
+    ]
+    upload_vectors(orchestrator.qdrant_client, route, ids, vectors, payloads)
+
+
+def evaluate_retrieval(
+    orchestrator: ChatOrchestrator,
+    samples: List[dict],
+    config: ChatConfig,
+    k: int,
+    user_id: str = EVAL_USER_ID,
+) -> dict:
+    questions = [sample["question"] for sample in samples]
+    started = time.perf_counter()
+    results = orchestrator.retrieve_hits_batch(user_id, questions, config)
+    elapsed = time.perf_counter() - started
+
+    recalls, reciprocal_ranks, ndcgs = [], [], []
+    for sample, hits in zip(samples, results):
+        retrieved = [(hit.payload or {}).get("filename", "") for hit in hits]
+        relevant = set(sample["relevant_sources"])
+        recalls.append(recall_at_k(retrieved, relevant, k))
+        reciprocal_ranks.append(reciprocal_rank(retrieved, relevant))
+        ndcgs.append(ndcg_at_k(retrieved, relevant, k))
+
+    count = len(samples) or 1
+    return {
+        "recall_at_k": sum(recalls) / count,
+        "mrr": sum(reciprocal_ranks) / count,
+        "ndcg_at_k": sum(ndcgs) / count,
+        "latency_ms_per_query": 1000 * elapsed / count,
+    }
+
+
+def build_orchestrator(mode: str, replay_dir: Path, settings: Settings | None = None) -> ChatOrchestrator:
+    settings = settings or get_settings()
+    settings = settings.model_copy(
+        update={
+            "replay_mode": "off" if mode == "hashed" else mode,
+            "replay_dir": str(replay_dir),
+            "openai_api_key": settings.openai_api_key or "replay-only",
+            "use_local_embeddings": True,
+            "qdrant_multitenancy": "payload",
+        }
+    )
+    orchestrator = ChatOrchestrator(settings=settings, qdrant_client=QdrantClient(":memory:"))
+    if mode == "hashed":
+        orchestrator.embedding_service = HashedEmbeddingService()
+    return orchestrator
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Offline retrieval metrics against the ground-truth fixtures.")
+    parser.add_argument("--corpus", type=Path, default=FIXTURES_PATH / "retrieval_corpus.json")
+    parser.add_argument("--ground-truth", type=Path, default=FIXTURES_PATH / "ground_truth_rag.json")
+    parser.add_argument("--replay-dir", type=Path, default=FIXTURES_PATH / "replay")
+    parser.add_argument("--mode", choices=["replay", "record", "hashed"], default="replay")
+    parser.add_argument("--k", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    orchestrator = build_orchestrator(args.mode, args.replay_dir)
+    build_eval_index(orchestrator, load_json(args.corpus))
+    samples = [sample for sample in load_json(args.ground_truth) if sample.get("relevant_sources")]
+
+    print(f"{len(samples)} questions, k={args.k}, mode={args.mode}")
+    print(f"{'config':>10} {'recall@k':>9} {'MRR':>7} {'nDCG@k':>7} {'ms/query':>9}")
+    for name, config in EVAL_CONFIGS.items():
+        row = evaluate_retrieval(orchestrator, samples, config.model_copy(update={"top_k": args.k}), args.k)
+        print(
+            f"{name:>10} {row['recall_at_k']:>9.3f} {row['mrr']:>7.3f} "
+            f"{row['ndcg_at_k']:>7.3f} {row['latency_ms_per_query']:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
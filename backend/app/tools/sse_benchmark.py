@@ -0,0 +1,73 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import AsyncIterator, List
+
+from app.services.sse import coalesce_sse
+
+
+async def token_stream(tokens: int, interval_seconds: float) -> AsyncIterator[str]:
+    for index in range(tokens):
+        await asyncio.sleep(interval_seconds)
+        yield f" token{index}"
+
+
+async def per_delta_frames(deltas: AsyncIterator[str]) -> AsyncIterator[bytes]:
+    async for delta in deltas:
+        yield f"data: {json.dumps({'content': delta})}\n\n".encode("utf-8")
+    yield b"event: end\ndata: {}\n\n"
+
+
+async def drain(frames: AsyncIterator[bytes], writes: List[int], fd: int) -> None:
+    async for frame in frames:
+        os.write(fd, frame)
+        writes.append(len(frame))
+
+
+async def run_streams(mode: str, streams: int, tokens: int, interval_seconds: float, window_ms: int) -> dict:
+    writes: List[int] = []
+
+    def writer(deltas: AsyncIterator[str]) -> AsyncIterator[bytes]:
+        if mode == "per_delta":
+            return per_delta_frames(deltas)
+        return coalesce_sse(
+            deltas, window_seconds=window_ms / 1000, max_bytes=4096, heartbeat_seconds=15.0, retry_ms=3000
+        )
+
+    fd = os.open(os.devnull, os.O_WRONLY)
+    cpu_started, wall_started = time.process_time(), time.perf_counter()
+    try:
+        await asyncio.gather(
+            *(drain(writer(token_stream(tokens, interval_seconds)), writes, fd) for _ in range(streams))
+        )
+    finally:
+        os.close(fd)
+    return {
+        "cpu_ms_per_stream": 1000 * (time.process_time() - cpu_started) / streams,
+        "wall_seconds": time.perf_counter() - wall_started,
+        "writes_per_stream": len(writes) / streams,
+        "bytes_per_stream": sum(writes) / streams,
+    }
+
+
+def main(argv: List[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Compare per-delta and coalesced SSE framing for chat streams.")
+    parser.add_argument("--streams", type=int, default=500)
+    parser.add_argument("--tokens", type=int, default=300)
+    parser.add_argument("--interval-ms", type=float, default=2.0, help="Delay between model deltas")
+    parser.add_argument("--window-ms", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    print(f"{args.streams} streams x {args.tokens} deltas, one every {args.interval_ms} ms")
+    for mode in ("per_delta", "coalesced"):
+        row = asyncio.run(run_streams(mode, args.streams, args.tokens, args.interval_ms / 1000, args.window_ms))
+        print(
+            f"  {mode:>9}: {row['writes_per_stream']:7.1f} writes/stream, {row['bytes_per_stream']:8.0f} B/stream, "
+            f"{row['cpu_ms_per_stream']:6.2f} ms CPU/stream, {row['wall_seconds']:.2f}s wall"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+import tarfile
+import zipfile
+from dataclasses import dataclass
+from pathlib import PurePosixPath
+from typing import BinaryIO, Iterator, List
+
+
+ARCHIVE_SUFFIXES = (".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tar.xz")
+MIME_SNIFF_BYTES = 8192
+
+
+@dataclass
+class UploadMember:
+    filename: str
+    stream: BinaryIO
+    size: int | None = None
+
+
+def is_archive(filename: str) -> bool:
+    return filename.lower().endswith(ARCHIVE_SUFFIXES)
+
+
+def _member_name(path: str) -> str | None:
+    parts = PurePosixPath(path).parts
+    if not parts or "__MACOSX" in parts:
+        return None
+    name = parts[-1]
+    if not name or name.startswith("."):
+        return None
+    return name
+
+
+def iter_archive_members(fileobj: BinaryIO, filename: str) -> Iterator[UploadMember]:
+    if filename.lower().endswith(".zip"):
+        with zipfile.ZipFile(fileobj) as archive:
+            for info in archive.infolist():
+                name = _member_name(info.filename)
+                if info.is_dir() or name is None:
+                    continue
+                with archive.open(info) as stream:
+                    yield UploadMember(filename=name, stream=stream, size=info.file_size)
+        return
+
+    with tarfile.open(fileobj=fileobj, mode="r|*") as archive:
+        for info in archive:
+            name = _member_name(info.name)
+            if not info.isfile() or name is None:
+                continue
+            stream = archive.extractfile(info)
+            if stream is not None:
+                yield UploadMember(filename=name, stream=stream, size=info.size)
+
+
+def group_small_files(files: List[dict], small_file_bytes: int, max_files: int, max_bytes: int) -> List[List[dict]]:
+    groups: List[List[dict]] = []
+    current: List[dict] = []
+    current_bytes = 0
+    for file in files:
+        if file["size"] > small_file_bytes:
+            groups.append([file])
+            continue
+        if current and (len(current) >= max_files or current_bytes + file["size"] > max_bytes):
+            groups.append(current)
+            current, current_bytes = [], 0
+        current.append(file)
+        current_bytes += file["size"]
+    if current:
+        groups.append(current)
+    return groups
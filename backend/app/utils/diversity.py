@@ -0,0 +1,55 @@
+import re
+import zlib
+from typing import List, Sequence
+
+import numpy as np
+
+
+SHINGLE_SIZE = 5
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+def shingle_hashes(text: str, size: int = SHINGLE_SIZE) -> set[int]:
+    words = _WORD_PATTERN.findall(text.lower())
+    if not words:
+        return set()
+    if len(words) <= size:
+        return {zlib.crc32(" ".join(words).encode("utf-8"))}
+    return {zlib.crc32(" ".join(words[i : i + size]).encode("utf-8")) for i in range(len(words) - size + 1)}
+
+
+def jaccard(left: set[int], right: set[int]) -> float:
+    if not left or not right:
+        return 0.0
+    return len(left & right) / len(left | right)
+
+
+def filter_near_duplicates(texts: Sequence[str], threshold: float) -> List[int]:
+    kept: List[int] = []
+    kept_shingles: List[set[int]] = []
+    for index, text in enumerate(texts):
+        shingles = shingle_hashes(text)
+        if any(jaccard(shingles, other) >= threshold for other in kept_shingles):
+            continue
+        kept.append(index)
+        kept_shingles.append(shingles)
+    return kept
+
+
+def mmr_select(query: np.ndarray, candidates: np.ndarray, k: int, lambda_mult: float) -> List[int]:
+    if len(candidates) == 0:
+        return []
+    query = query / (np.linalg.norm(query) or 1.0)
+    relevance = candidates @ query
+    similarity = candidates @ candidates.T
+
+    selected: List[int] = []
+    max_similarity = np.zeros(len(candidates), dtype=relevance.dtype)
+    for _ in range(min(k, len(candidates))):
+        scores = lambda_mult * relevance - (1 - lambda_mult) * max_similarity if selected else relevance.copy()
+        scores[selected] = -np.inf
+        best = int(np.argmax(scores))
+        selected.append(best)
+        max_similarity = np.maximum(max_similarity, similarity[best])
+    return selected
@@ -0,0 +1,97 @@
+import glob
+import mmap
+import os
+import struct
+import tempfile
+import zlib
+from pathlib import Path
+from typing import Iterator, List, Sequence, Tuple
+
+
+ARTIFACT_MAGIC = b"RAGX"
+ARTIFACT_FORMAT_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHI")
+_INDEX_ENTRY = struct.Struct("<IQI")
+
+
+def artifact_path(file_path: Path, extractor_version: int) -> Path:
+    return file_path.with_name(f"{file_path.name}.pages-v{extractor_version}.bin")
+
+
+def delete_extraction_artifacts(file_path: Path, keep: Path | None = None) -> int:
+    deleted = 0
+    for path in file_path.parent.glob(f"{glob.escape(file_path.name)}.pages-v*.bin"):
+        if path != keep:
+            path.unlink(missing_ok=True)
+            deleted += 1
+    return deleted
+
+
+def write_artifact(
+    path: Path, pages: Sequence[Tuple[int, str]], extractor_version: int, compression_level: int = 6
+) -> None:
+    blocks = [zlib.compress(text.encode("utf-8"), compression_level) for _, text in pages]
+    offset = _HEADER.size + _INDEX_ENTRY.size * len(blocks)
+    index = bytearray()
+    for (page_number, _), block in zip(pages, blocks):
+        index += _INDEX_ENTRY.pack(page_number, offset, len(block))
+        offset += len(block)
+
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(ARTIFACT_MAGIC, ARTIFACT_FORMAT_VERSION, extractor_version, len(blocks)))
+            f.write(index)
+            for block in blocks:
+                f.write(block)
+        os.replace(tmp_path, path)
+    except BaseException:
+        Path(tmp_path).unlink(missing_ok=True)
+        raise
+
+
+class ExtractionArtifact:
+    def __init__(self, path: Path):
+        self.path = path
+        with open(path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, format_version, self.extractor_version, count = _HEADER.unpack_from(self._map, 0)
+            self.index: List[Tuple[int, int, int]] = [
+                _INDEX_ENTRY.unpack_from(self._map, _HEADER.size + position * _INDEX_ENTRY.size)
+                for position in range(count)
+            ]
+        except struct.error as e:
+            self._map.close()
+            raise ValueError(f"Truncated extraction artifact: {path}") from e
+        if magic != ARTIFACT_MAGIC or format_version != ARTIFACT_FORMAT_VERSION:
+            self._map.close()
+            raise ValueError(f"Not an extraction artifact: {path}")
+        data_start = _HEADER.size + _INDEX_ENTRY.size * count
+        if any(offset < data_start or offset + length > len(self._map) for _, offset, length in self.index):
+            self._map.close()
+            raise ValueError(f"Truncated extraction artifact: {path}")
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def __iter__(self) -> Iterator[Tuple[int, str]]:
+        for position in range(len(self.index)):
+            yield self.page(position)
+
+    def __enter__(self) -> "ExtractionArtifact":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def page(self, position: int) -> Tuple[int, str]:
+        page_number, offset, length = self.index[position]
+        try:
+            return page_number, zlib.decompress(self._map[offset : offset + length]).decode("utf-8")
+        except zlib.error as e:
+            raise ValueError(f"Corrupt page block {position} in extraction artifact: {self.path}") from e
+
+    def close(self) -> None:
+        self._map.close()
@@ -0,0 +1,31 @@
+import math
+from typing import List, Sequence
+
+
+def _unique(retrieved: Sequence[str]) -> List[str]:
+    return list(dict.fromkeys(retrieved))
+
+
+def recall_at_k(retrieved: Sequence[str], relevant: set[str], k: int) -> float:
+    if not relevant:
+        return 0.0
+    return len(set(_unique(retrieved)[:k]) & relevant) / len(relevant)
+
+
+def reciprocal_rank(retrieved: Sequence[str], relevant: set[str]) -> float:
+    for rank, source in enumerate(_unique(retrieved), start=1):
+        if source in relevant:
+            return 1.0 / rank
+    return 0.0
+
+
+def ndcg_at_k(retrieved: Sequence[str], relevant: set[str], k: int) -> float:
+    if not relevant:
+        return 0.0
+    dcg = sum(
+        1.0 / math.log2(rank + 1)
+        for rank, source in enumerate(_unique(retrieved)[:k], start=1)
+        if source in relevant
+    )
+    ideal = sum(1.0 / math.log2(rank + 1) for rank in range(1, min(len(relevant), k) + 1))
+    return dcg / ideal
@@ -1,11 +1,13 @@
 from pathlib import Path
 from typing import List, Tuple
 
-import fitz
-from docx import Document as DocxDocument
+
+EXTRACTOR_VERSION = 1
 
 
 def extract_pdf_text(file_path: Path) -> List[Tuple[int, str]]:
+    import fitz
+
     document = fitz.open(file_path)
     pages: List[Tuple[int, str]] = []
     for index in range(len(document)):
@@ -18,6 +20,8 @@ def extract_pdf_text(file_path: Path) -> List[Tuple[int, str]]:
 
 
 def extract_docx_text(file_path: Path) -> List[Tuple[int, str]]:
+    from docx import Document as DocxDocument
+
     document = DocxDocument(str(file_path))
     paragraphs = [paragraph.text for paragraph in document.paragraphs if paragraph.text.strip()]
     if not paragraphs:
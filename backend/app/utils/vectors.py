@@ -0,0 +1,49 @@
+import base64
+from typing import Sequence
+
+import numpy as np
+
+
+VECTOR_DTYPE = np.dtype("<f4")
+
+
+def as_float32(vectors) -> np.ndarray:
+    return np.ascontiguousarray(vectors, dtype=VECTOR_DTYPE)
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return as_float32(vectors / norms)
+
+
+def truncate_embeddings(vectors: np.ndarray, dimensions: int) -> np.ndarray:
+    if vectors.shape[1] <= dimensions:
+        return as_float32(vectors)
+    return normalize_rows(vectors[:, :dimensions])
+
+
+def encode_vectors(vectors: np.ndarray) -> str:
+    return base64.b64encode(as_float32(vectors).tobytes()).decode("ascii")
+
+
+def decode_vectors(data: str, dimensions: int) -> np.ndarray:
+    return np.frombuffer(base64.b64decode(data), dtype=VECTOR_DTYPE).reshape(-1, dimensions)
+
+
+def decode_embeddings(embeddings: Sequence) -> np.ndarray:
+    if not embeddings or not isinstance(embeddings[0], str):
+        return as_float32(embeddings)
+    first = np.frombuffer(base64.b64decode(embeddings[0]), dtype=VECTOR_DTYPE)
+    matrix = np.empty((len(embeddings), first.shape[0]), dtype=VECTOR_DTYPE)
+    matrix[0] = first
+    for row, data in enumerate(embeddings[1:], start=1):
+        matrix[row] = np.frombuffer(base64.b64decode(data), dtype=VECTOR_DTYPE)
+    return matrix
+
+
+def recall_at_k(reference: np.ndarray, candidate: np.ndarray, queries: np.ndarray, k: int) -> float:
+    expected = np.argsort(-(reference @ reference[queries].T), axis=0)[:k]
+    actual = np.argsort(-(candidate @ candidate[queries].T), axis=0)[:k]
+    hits = sum(len(np.intersect1d(expected[:, i], actual[:, i])) for i in range(len(queries)))
+    return hits / (k * len(queries))
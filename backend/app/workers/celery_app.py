@@ -1,6 +1,11 @@
+import click
 from celery import Celery
+from celery.signals import before_task_publish, task_postrun, task_prerun, worker_init, worker_process_shutdown
+from click.core import ParameterSource
+from kombu import Queue
 
 from app.config import get_settings
+from app.core.tracing import TRACEPARENT_HEADER, attach, current_traceparent, detach, get_tracer, parse_traceparent
 
 
 settings = get_settings()
@@ -9,8 +14,28 @@ celery_app = Celery(
     "enterprise_rag_ingestion",
     broker=settings.redis_url,
     backend=settings.redis_url,
+    include=[
+        "app.workers.ingestion_tasks",
+        "app.workers.deletion_tasks",
+        "app.workers.migration_tasks",
+    ],
 )
 
+STAGE_QUEUES = {
+    "cpu_extract": {
+        "concurrency": settings.celery_extract_concurrency,
+        "prefetch_multiplier": settings.celery_extract_prefetch_multiplier,
+    },
+    "embed": {
+        "concurrency": settings.celery_embed_concurrency,
+        "prefetch_multiplier": settings.celery_embed_prefetch_multiplier,
+    },
+    "index": {
+        "concurrency": settings.celery_index_concurrency,
+        "prefetch_multiplier": settings.celery_index_prefetch_multiplier,
+    },
+}
+
 celery_app.conf.update(
     task_serializer="json",
     accept_content=["json"],
@@ -18,4 +43,73 @@ celery_app.conf.update(
     timezone="UTC",
     enable_utc=True,
     task_track_started=True,
+    task_default_queue="celery",
+    task_queues=[Queue("celery"), *(Queue(name) for name in STAGE_QUEUES)],
+    task_routes={
+        "ingest_document_task": {"queue": "cpu_extract"},
+        "ingest_batch_task": {"queue": "cpu_extract"},
+        "reindex_documents_task": {"queue": "cpu_extract"},
+        "extract_document_task": {"queue": "cpu_extract"},
+        "embed_document_task": {"queue": "embed"},
+        "index_document_task": {"queue": "index"},
+        "delete_documents_task": {"queue": "index"},
+        "migrate_tenant_vectors_task": {"queue": "index"},
+    },
+    worker_prefetch_multiplier=1,
+    broker_transport_options={
+        "priority_steps": list(range(10)),
+        "sep": ":",
+        "queue_order_strategy": "priority",
+    },
 )
+
+
+def set_on_command_line(option: str) -> bool:
+    context = click.get_current_context(silent=True)
+    if context is None:
+        return False
+    return context.get_parameter_source(option) not in (None, ParameterSource.DEFAULT, ParameterSource.DEFAULT_MAP)
+
+
+@worker_init.connect
+def configure_stage_worker(sender=None, **kwargs) -> None:
+    consumed = list(sender.app.amqp.queues.consume_from or {})
+    if len(consumed) != 1 or consumed[0] not in STAGE_QUEUES:
+        return
+    stage = STAGE_QUEUES[consumed[0]]
+    if stage["concurrency"] and not set_on_command_line("concurrency"):
+        sender.concurrency = stage["concurrency"]
+    if not set_on_command_line("prefetch_multiplier"):
+        sender.prefetch_multiplier = stage["prefetch_multiplier"]
+
+
+_task_spans: dict = {}
+
+
+@before_task_publish.connect
+def inject_trace_context(headers=None, **kwargs) -> None:
+    traceparent = current_traceparent()
+    if traceparent and headers is not None:
+        headers[TRACEPARENT_HEADER] = traceparent
+
+
+@task_prerun.connect
+def start_task_span(task_id=None, task=None, **kwargs) -> None:
+    parent = parse_traceparent(task.request.get(TRACEPARENT_HEADER))
+    span = get_tracer().start_span(task.name, parent=parent, task_id=task_id)
+    _task_spans[task_id] = (span, attach(span.context))
+
+
+@task_postrun.connect
+def end_task_span(task_id=None, state=None, retval=None, **kwargs) -> None:
+    span, token = _task_spans.pop(task_id, (None, None))
+    if span is None:
+        return
+    detach(token)
+    span.set(state=state)
+    get_tracer().end_span(span, retval if state == "FAILURE" and isinstance(retval, BaseException) else None)
+
+
+@worker_process_shutdown.connect
+def flush_traces(**kwargs) -> None:
+    get_tracer().flush()
@@ -0,0 +1,64 @@
+import logging
+import uuid
+from typing import Iterable, List
+
+from app.services.storage import StorageService
+from app.services.vector_store import TenantRouter, delete_document_vectors
+from app.workers.celery_app import celery_app
+from app.workers.ingestion_tasks import build_qdrant_client, get_user_documents, update_documents_status
+from app.workers.runtime import run_async
+
+
+logger = logging.getLogger("enterprise_rag.deletion")
+
+DELETE_BATCH_SIZE = 100
+
+
+async def mark_documents_deleted(document_ids: List[uuid.UUID]) -> None:
+    await update_documents_status(document_ids, "deleted")
+
+
+def iter_batches(items: List, batch_size: int) -> Iterable[List]:
+    for start in range(0, len(items), batch_size):
+        yield items[start : start + batch_size]
+
+
+@celery_app.task(bind=True, name="delete_documents_task")
+def delete_documents_task(self, document_ids: List[str], user_id: str) -> dict:
+    try:
+        self.update_state(state="PROCESSING", meta={"step": "loading_documents", "progress": 5})
+        requested_ids = [uuid.UUID(document_id) for document_id in document_ids]
+        documents = run_async(get_user_documents(user_id, requested_ids))
+        logger.info("Deleting %d document(s) for user %s", len(documents), user_id)
+
+        client = build_qdrant_client()
+        route = TenantRouter().route(user_id)
+        storage_service = StorageService()
+        deleted_ids: List[str] = []
+        batches = list(iter_batches(documents, DELETE_BATCH_SIZE))
+
+        for index, batch in enumerate(batches, start=1):
+            batch_ids = [str(document.id) for document in batch]
+            # Mark first: an ingestion that finishes after this sees the status and removes its own vectors.
+            run_async(mark_documents_deleted([document.id for document in batch]))
+            delete_document_vectors(client, route, user_id, batch_ids)
+            for document in batch:
+                try:
+                    storage_service.delete_file(document.storage_path)
+                except OSError:
+                    logger.exception("Failed to delete stored file: %s", document.storage_path)
+            deleted_ids.extend(batch_ids)
+
+            progress = 5 + int(90 * index / len(batches))
+            self.update_state(state="PROCESSING", meta={"step": "deleting", "progress": progress})
+
+        return {
+            "status": "completed",
+            "step": "completed",
+            "progress": 100,
+            "document_ids": deleted_ids,
+        }
+    except Exception as e:
+        logger.exception("Deletion failed for documents: %s", document_ids)
+        self.update_state(state="FAILURE", meta={"step": "error", "progress": 0, "error": str(e)})
+        raise
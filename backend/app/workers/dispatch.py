@@ -0,0 +1,24 @@
+from celery.canvas import Signature
+
+from app.config import get_settings
+from app.workers.celery_app import celery_app
+
+
+class TaskRef:
+    def __init__(self, name: str, **options):
+        self.name = name
+        self.options = options
+
+    def s(self, *args, **kwargs) -> Signature:
+        return celery_app.signature(self.name, args=args, kwargs=kwargs, **self.options)
+
+    def delay(self, *args, **kwargs):
+        return self.s(*args, **kwargs).apply_async()
+
+
+settings = get_settings()
+
+ingest_document_task = TaskRef("ingest_document_task", priority=settings.ingest_interactive_priority)
+ingest_batch_task = TaskRef("ingest_batch_task", priority=settings.ingest_bulk_priority)
+delete_documents_task = TaskRef("delete_documents_task")
+reindex_documents_task = TaskRef("reindex_documents_task", priority=settings.ingest_bulk_priority)
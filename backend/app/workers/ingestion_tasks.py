@@ -1,26 +1,55 @@
-import asyncio
+import functools
 import logging
+import uuid
 from pathlib import Path
 from typing import List, Tuple
 
+from celery import Task, chain
+from celery.canvas import Signature
 from qdrant_client import QdrantClient
 from qdrant_client.http import models as qmodels
+from qdrant_client.http.exceptions import ResponseHandlingException
+from sqlalchemy import Update, any_, bindparam, select, update
+from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.config import get_settings
+from app.core.tracing import get_tracer
 from app.db.models import Document
-from app.db.session import AsyncSessionLocal
+from app.models.schemas import IngestionStatusResponse
 from app.services.embeddings import EmbeddingService
+from app.services.ingest_scheduler import IngestionScheduler
+from app.services.profiling import ProfileStore, profile_block
+from app.services.progress import publish_progress
+from app.services.vector_store import (
+    TenantRoute,
+    TenantRouter,
+    create_qdrant_client,
+    delete_document_vectors,
+    ensure_qdrant_collection,
+    tenant_filter,
+    upload_vectors,
+)
 from app.utils.chunking import chunk_pages
-from app.utils.text_extraction import extract_docx_text, extract_pdf_text, extract_txt_text
+from app.utils.extraction_artifacts import (
+    ExtractionArtifact,
+    artifact_path,
+    delete_extraction_artifacts,
+    write_artifact,
+)
+from app.utils.text_extraction import EXTRACTOR_VERSION, extract_docx_text, extract_pdf_text, extract_txt_text
+from app.utils.vectors import decode_vectors, encode_vectors
 from app.workers.celery_app import celery_app
+from app.workers.runtime import run_async, worker_session
 
 
 logger = logging.getLogger("enterprise_rag.ingestion")
 
+INDEX_RETRY_EXCEPTIONS = (ResponseHandlingException, ConnectionError, TimeoutError)
+
 
 async def create_document_record(user_id: str, filename: str, mime_type: str, storage_path: str) -> Document:
-    async with AsyncSessionLocal() as session:  # type: AsyncSession
+    async with worker_session() as session:  # type: AsyncSession
         document = Document(
             user_id=user_id,
             filename=filename,
@@ -33,31 +62,83 @@ async def create_document_record(user_id: str, filename: str, mime_type: str, st
         return document
 
 
-async def update_document_status(document_id, status: str, error_message: str | None = None) -> None:
-    async with AsyncSessionLocal() as session:  # type: AsyncSession
-        document = await session.get(Document, document_id)
-        if document is None:
-            return
-        document.status = status
-        document.error_message = error_message
+async def create_document_records(user_id: str, files: List[dict]) -> List[Document]:
+    async with worker_session() as session:  # type: AsyncSession
+        documents = [
+            Document(
+                user_id=user_id,
+                filename=file["filename"],
+                mime_type=file["mime_type"],
+                storage_path=file["file_path"],
+            )
+            for file in files
+        ]
+        session.add_all(documents)
+        await session.commit()
+        return documents
+
+
+def document_ids_param(document_ids: List[uuid.UUID]):
+    return any_(bindparam("document_ids", value=list(document_ids), type_=ARRAY(UUID(as_uuid=True))))
+
+
+async def get_user_documents(user_id: str, document_ids: List[uuid.UUID]) -> List[Document]:
+    async with worker_session() as session:  # type: AsyncSession
+        result = await session.execute(
+            select(Document).where(
+                Document.user_id == user_id,
+                Document.id == document_ids_param(document_ids),
+                Document.status != "deleted",
+            )
+        )
+        return list(result.scalars().all())
+
+
+def document_status_update(document_ids: List[uuid.UUID], status: str, error_message: str | None = None) -> Update:
+    return (
+        update(Document)
+        .where(Document.id == document_ids_param(document_ids), Document.status != "deleted")
+        .values(status=status, error_message=error_message)
+        .returning(Document.id)
+        .execution_options(synchronize_session=False)
+    )
+
+
+async def update_documents_status(
+    document_ids: List[uuid.UUID], status: str, error_message: str | None = None
+) -> List[uuid.UUID]:
+    if not document_ids:
+        return []
+    async with worker_session() as session:  # type: AsyncSession
+        result = await session.execute(document_status_update(document_ids, status, error_message))
+        updated = list(result.scalars().all())
         await session.commit()
+        return updated
+
+
+async def update_document_status(document_id: uuid.UUID, status: str, error_message: str | None = None) -> None:
+    await update_documents_status([document_id], status, error_message)
 
 
 def build_qdrant_client() -> QdrantClient:
-    settings = get_settings()
-    return QdrantClient(url=settings.qdrant_url, api_key=settings.qdrant_api_key)
+    return create_qdrant_client(get_settings())
 
 
-def ensure_qdrant_collection(client: QdrantClient, vector_size: int) -> None:
-    collection_name = "documents"
-    try:
-        client.get_collection(collection_name=collection_name)
-        return
-    except Exception:
-        pass
-    client.recreate_collection(
-        collection_name=collection_name,
-        vectors_config=qmodels.VectorParams(size=vector_size, distance=qmodels.Distance.COSINE),
+def delete_stale_vectors(
+    client: QdrantClient, route: TenantRoute, user_id: str, doc_ids: List[str], keep_ids: List[str]
+) -> None:
+    client.delete(
+        collection_name=route.collection_name,
+        points_selector=qmodels.FilterSelector(
+            filter=qmodels.Filter(
+                must=tenant_filter(
+                    user_id, qmodels.FieldCondition(key="doc_id", match=qmodels.MatchAny(any=doc_ids))
+                ).must,
+                must_not=[qmodels.HasIdCondition(has_id=keep_ids)],
+            )
+        ),
+        wait=True,
+        shard_key_selector=route.shard_key,
     )
 
 
@@ -71,79 +152,335 @@ def extract_pages_by_mime(file_path: Path, mime_type: str) -> List[Tuple[int, st
     raise ValueError(f"Unsupported MIME type for extraction: {mime_type}")
 
 
-@celery_app.task(bind=True, name="ingest_document_task")
-def ingest_document_task(self, file_path: str, user_id: str, filename: str, mime_type: str) -> dict:
+def load_or_extract_pages(file_path: Path, mime_type: str) -> List[Tuple[int, str]]:
     settings = get_settings()
-    storage_path = file_path
-    try:
-        self.update_state(state="PROCESSING", meta={"step": "extracting_text", "progress": 10})
-        logger.info("Starting ingestion for file: %s (user: %s)", file_path, user_id)
+    if not settings.extraction_artifacts_enabled:
+        return extract_pages_by_mime(file_path, mime_type)
+
+    path = artifact_path(file_path, EXTRACTOR_VERSION)
+    if path.exists():
+        try:
+            with ExtractionArtifact(path) as artifact:
+                return list(artifact)
+        except (OSError, ValueError) as e:
+            logger.warning("Ignoring unreadable extraction artifact %s: %s", path, e)
+
+    pages = extract_pages_by_mime(file_path, mime_type)
+    if pages:
+        try:
+            write_artifact(path, pages, EXTRACTOR_VERSION, settings.extraction_artifact_compression_level)
+            delete_extraction_artifacts(file_path, keep=path)
+        except OSError:
+            logger.exception("Failed to persist extraction artifact for file: %s", file_path)
+    return pages
+
+
+def build_ingestion_job(
+    tracking_id: str,
+    user_id: str,
+    documents: List[Document],
+    lane: str = "interactive",
+    profile_id: str | None = None,
+    reindex: bool = False,
+) -> dict:
+    return {
+        "tracking_id": tracking_id,
+        "user_id": user_id,
+        "lane": lane,
+        "profile_id": profile_id,
+        "reindex": reindex,
+        "priority": IngestionScheduler().lane_priority(lane),
+        "documents": [
+            {
+                "document_id": str(document.id),
+                "file_path": document.storage_path,
+                "filename": document.filename,
+                "mime_type": document.mime_type,
+            }
+            for document in documents
+        ],
+    }
+
+
+def job_document_ids(job: dict) -> List[uuid.UUID]:
+    return [uuid.UUID(document["document_id"]) for document in job["documents"]]
+
+
+def profiled_stage(stage: str):
+    def decorate(run):
+        @functools.wraps(run)
+        def wrapper(self, job: dict, *args, **kwargs):
+            profile_id = job.get("profile_id")
+            if not profile_id:
+                return run(self, job, *args, **kwargs)
+            name = stage if not self.request.retries else f"{stage}-retry{self.request.retries}"
+            settings = get_settings()
+            with profile_block(
+                ProfileStore(settings.profile_dir), profile_id, name, frames=settings.profile_tracemalloc_frames
+            ):
+                return run(self, job, *args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+
+class IngestionStageTask(Task):
+    acks_late = True
+    reject_on_worker_lost = True
+
+    def report_progress(self, job: dict, step: str, progress: int) -> None:
+        self.update_state(
+            task_id=job["tracking_id"],
+            state="PROCESSING",
+            meta={"step": step, "progress": progress},
+        )
+        publish_progress(
+            job["tracking_id"],
+            IngestionStatusResponse(status="processing", step=step, progress=progress),
+        )
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo) -> None:
+        job = args[0] if args and isinstance(args[0], dict) else kwargs.get("job")
+        if not job:
+            return
+        IngestionScheduler().release(job["user_id"], job["tracking_id"])
+        for document in job["documents"]:
+            logger.error("Ingestion stage %s failed for file: %s", self.name, document["file_path"])
+        try:
+            run_async(update_documents_status(job_document_ids(job), "failed", str(exc)))
+        except Exception:
+            logger.exception("Failed to update document status after error")
+        self.update_state(
+            task_id=job["tracking_id"],
+            state="FAILURE",
+            meta={"step": "error", "progress": 0, "error": str(exc)},
+        )
+        publish_progress(
+            job["tracking_id"],
+            IngestionStatusResponse(status="failed", step="error", progress=0, error=str(exc)),
+        )
+
 
-        path = Path(file_path)
-        pages = extract_pages_by_mime(path, mime_type)
+@celery_app.task(bind=True, base=IngestionStageTask, name="extract_document_task")
+@profiled_stage("extract")
+def extract_document_task(self, job: dict) -> dict:
+    self.report_progress(job, "extracting_text", 10)
 
-        if not pages:
-            raise ValueError("No extractable content found in document")
+    extracted = []
+    last_error: Exception | None = None
+    for document in job["documents"]:
+        logger.info("Starting ingestion for file: %s (user: %s)", document["file_path"], job["user_id"])
+        try:
+            with get_tracer().span("extract", filename=document["filename"], mime_type=document["mime_type"]) as span:
+                pages = load_or_extract_pages(Path(document["file_path"]), document["mime_type"])
+                span.set(pages=len(pages))
+            if not pages:
+                raise ValueError("No extractable content found in document")
+        except Exception as e:
+            if len(job["documents"]) == 1:
+                raise
+            logger.exception("Extraction failed for file: %s", document["file_path"])
+            run_async(update_document_status(uuid.UUID(document["document_id"]), "failed", str(e)))
+            last_error = e
+            continue
+        document["chunks"] = chunk_pages(pages, chunk_size=1500, chunk_overlap=200)
+        extracted.append(document)
 
-        self.update_state(state="PROCESSING", meta={"step": "chunking", "progress": 30})
-        page_chunks = chunk_pages(pages, chunk_size=1500, chunk_overlap=200)
+    if not extracted:
+        raise last_error or ValueError("No extractable content found in document")
 
-        texts = [chunk for _, _, chunk in page_chunks]
+    self.report_progress(job, "chunking", 30)
+    job["documents"] = extracted
+    return job
 
-        self.update_state(state="PROCESSING", meta={"step": "generating_embeddings", "progress": 60})
-        embedding_service = EmbeddingService(settings)
+
+@celery_app.task(bind=True, base=IngestionStageTask, name="embed_document_task")
+@profiled_stage("embed")
+def embed_document_task(self, job: dict) -> dict:
+    self.report_progress(job, "generating_embeddings", 60)
+    texts = [chunk for document in job["documents"] for _, _, chunk in document["chunks"]]
+    embedding_service = EmbeddingService(get_settings())
+    with get_tracer().span("embed", chunks=len(texts)):
         vectors = embedding_service.embed_chunks(texts)
+    if len(vectors) != len(texts):
+        raise ValueError("Failed to generate embeddings")
 
-        if not vectors:
-            raise ValueError("Failed to generate embeddings")
+    job["dimensions"] = int(vectors.shape[1])
+    job["vectors"] = encode_vectors(vectors)
+    return job
 
-        vector_size = len(vectors[0])
 
-        client = build_qdrant_client()
-        ensure_qdrant_collection(client, vector_size)
+@celery_app.task(
+    bind=True,
+    base=IngestionStageTask,
+    name="index_document_task",
+    autoretry_for=INDEX_RETRY_EXCEPTIONS,
+    retry_backoff=True,
+    retry_backoff_max=60,
+    retry_jitter=True,
+    max_retries=5,
+)
+@profiled_stage("index")
+def index_document_task(self, job: dict) -> dict:
+    settings = get_settings()
+    user_id = job["user_id"]
+    documents = job["documents"]
 
-        self.update_state(state="PROCESSING", meta={"step": "storing_vectors", "progress": 85})
+    client = build_qdrant_client()
+    route = TenantRouter(settings).route(user_id)
+    ensure_qdrant_collection(client, job["dimensions"], settings, route)
 
-        document = asyncio.run(create_document_record(user_id, filename, mime_type, storage_path))
+    self.report_progress(job, "storing_vectors", 85)
 
-        points = []
-        for (page_number, chunk_index, _), vector in zip(page_chunks, vectors):
-            payload = {
-                "user_id": user_id,
-                "doc_id": str(document.id),
-                "page_number": page_number,
-                "access_level": "admin",
-                "chunk_index": chunk_index,
-                "filename": filename,
-            }
-            points.append(
-                qmodels.PointStruct(
-                    id=None,
-                    vector=vector,
-                    payload=payload,
-                )
+    ids: List[str] = []
+    payloads: List[dict] = []
+    for document in documents:
+        document_id = uuid.UUID(document["document_id"])
+        for page_number, chunk_index, text in document["chunks"]:
+            ids.append(str(uuid.uuid5(document_id, f"{page_number}:{chunk_index}")))
+            payloads.append(
+                {
+                    "user_id": user_id,
+                    "doc_id": document["document_id"],
+                    "page_number": page_number,
+                    "access_level": "admin",
+                    "chunk_index": chunk_index,
+                    "filename": document["filename"],
+                    "text": text,
+                }
             )
 
-        client.upsert(collection_name="documents", points=points)
+    vectors = decode_vectors(job["vectors"], job["dimensions"])
+    with get_tracer().span("upsert", collection=route.collection_name, points=len(ids)):
+        upload_vectors(client, route, ids, vectors, payloads, settings.qdrant_upload_batch_size)
+    if job.get("reindex"):
+        delete_stale_vectors(client, route, user_id, [document["document_id"] for document in documents], ids)
+
+    completed = run_async(update_documents_status(job_document_ids(job), "completed"))
+    completed_ids = {str(document_id) for document_id in completed}
+    deleted = [document["document_id"] for document in documents if document["document_id"] not in completed_ids]
+    if deleted:
+        logger.info("Removing vectors of %d document(s) deleted during ingestion (user: %s)", len(deleted), user_id)
+        delete_document_vectors(client, route, user_id, deleted)
+
+    self.report_progress(job, "finalizing", 95)
+
+    IngestionScheduler().release(user_id, job["tracking_id"])
+    logger.info("Ingestion completed for %d file(s) (user: %s)", len(documents), user_id)
+    publish_progress(
+        job["tracking_id"],
+        IngestionStatusResponse(status="completed", step="completed", progress=100),
+    )
+    return {
+        "status": "completed",
+        "step": "completed",
+        "progress": 100,
+        "document_ids": [document["document_id"] for document in documents if document["document_id"] in completed_ids],
+    }
+
+
+def build_ingestion_pipeline(job: dict) -> Signature:
+    priority = job.get("priority")
+    return chain(
+        extract_document_task.s(job).set(priority=priority),
+        embed_document_task.s().set(priority=priority),
+        index_document_task.s().set(priority=priority),
+    )
+
+
+def admit_or_defer(task: Task, user_id: str, lane: str, enqueued_at: float | None) -> None:
+    scheduler = IngestionScheduler()
+    if not scheduler.try_acquire(user_id, task.request.id):
+        deferrals = task.request.retries
+        if deferrals >= scheduler.settings.ingest_max_deferrals:
+            error = RuntimeError(f"No ingestion capacity for tenant {user_id} after {deferrals} deferrals")
+            logger.warning("Giving up on task %s: %s", task.request.id, error)
+            fail_dispatch(task, user_id, error)
+            raise error
+        logger.info("Tenant %s is at ingestion capacity, deferring task %s", user_id, task.request.id)
+        publish_progress(
+            task.request.id,
+            IngestionStatusResponse(status="pending", step="waiting_for_capacity", progress=0),
+        )
+        raise task.retry(countdown=scheduler.defer_seconds(), max_retries=None)
+    scheduler.record_queue_wait(user_id, lane, enqueued_at)
+
+
+def fail_dispatch(task: Task, user_id: str, error: Exception) -> None:
+    IngestionScheduler().release(user_id, task.request.id)
+    task.update_state(state="FAILURE", meta={"step": "error", "progress": 0, "error": str(error)})
+    publish_progress(
+        task.request.id,
+        IngestionStatusResponse(status="failed", step="error", progress=0, error=str(error)),
+    )
+
 
-        asyncio.run(update_document_status(document.id, "completed"))
+def start_pipeline(task: Task, job: dict):
+    task.update_state(state="PROCESSING", meta={"step": "queued", "progress": 5})
+    publish_progress(task.request.id, IngestionStatusResponse(status="processing", step="queued", progress=5))
+    return task.replace(build_ingestion_pipeline(job))
 
-        self.update_state(state="PROCESSING", meta={"step": "finalizing", "progress": 95})
 
-        logger.info("Ingestion completed for file: %s", file_path)
-        return {
-            "status": "completed",
-            "step": "completed",
-            "progress": 100,
-            "file_path": file_path,
-            "document_id": str(document.id),
-        }
+@celery_app.task(bind=True, name="ingest_document_task", priority=get_settings().ingest_interactive_priority)
+def ingest_document_task(
+    self,
+    file_path: str,
+    user_id: str,
+    filename: str,
+    mime_type: str,
+    lane: str = "interactive",
+    enqueued_at: float | None = None,
+    profile_id: str | None = None,
+) -> dict:
+    admit_or_defer(self, user_id, lane, enqueued_at)
+    try:
+        document = run_async(create_document_record(user_id, filename, mime_type, file_path))
     except Exception as e:
         logger.exception("Ingestion failed for file: %s", file_path)
-        try:
-            if "document" in locals():
-                asyncio.run(update_document_status(document.id, "failed", str(e)))
-        except Exception:
-            logger.exception("Failed to update document status after error")
-        self.update_state(state="FAILURE", meta={"step": "error", "progress": 0, "error": str(e)})
-        raise
\ No newline at end of file
+        fail_dispatch(self, user_id, e)
+        raise
+
+    raise start_pipeline(self, build_ingestion_job(self.request.id, user_id, [document], lane, profile_id))
+
+
+@celery_app.task(bind=True, name="ingest_batch_task", priority=get_settings().ingest_bulk_priority)
+def ingest_batch_task(
+    self,
+    files: List[dict],
+    user_id: str,
+    lane: str = "bulk",
+    enqueued_at: float | None = None,
+) -> dict:
+    admit_or_defer(self, user_id, lane, enqueued_at)
+    try:
+        documents = run_async(create_document_records(user_id, files))
+    except Exception as e:
+        logger.exception("Ingestion failed for %d file(s) (user: %s)", len(files), user_id)
+        fail_dispatch(self, user_id, e)
+        raise
+
+    raise start_pipeline(self, build_ingestion_job(self.request.id, user_id, documents, lane))
+
+
+@celery_app.task(bind=True, name="reindex_documents_task", priority=get_settings().ingest_bulk_priority)
+def reindex_documents_task(
+    self,
+    document_ids: List[str],
+    user_id: str,
+    lane: str = "bulk",
+    enqueued_at: float | None = None,
+) -> dict:
+    admit_or_defer(self, user_id, lane, enqueued_at)
+    try:
+        documents = run_async(get_user_documents(user_id, [uuid.UUID(document_id) for document_id in document_ids]))
+        if not documents:
+            raise ValueError("No documents to re-index")
+        run_async(update_documents_status([document.id for document in documents], "processing"))
+    except Exception as e:
+        logger.exception("Re-index failed for documents: %s", document_ids)
+        fail_dispatch(self, user_id, e)
+        raise
+
+    logger.info("Re-indexing %d document(s) (user: %s)", len(documents), user_id)
+    raise start_pipeline(self, build_ingestion_job(self.request.id, user_id, documents, lane, reindex=True))
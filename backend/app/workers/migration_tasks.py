@@ -0,0 +1,97 @@
+import logging
+from typing import Dict, List
+
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+
+from app.config import Settings, get_settings
+from app.services.vector_store import TenantRoute, TenantRouter, ensure_qdrant_collection, upsert_points
+from app.workers.celery_app import celery_app
+from app.workers.ingestion_tasks import build_qdrant_client
+
+
+logger = logging.getLogger("enterprise_rag.migration")
+
+MIGRATION_BATCH_SIZE = 256
+
+
+def move_tenant_points(
+    client: QdrantClient,
+    router: TenantRouter,
+    settings: Settings,
+    source_collection: str,
+    records: List[qmodels.Record],
+    ensured_routes: set[TenantRoute],
+) -> int:
+    grouped: Dict[TenantRoute, List[qmodels.PointStruct]] = {}
+    for record in records:
+        user_id = (record.payload or {}).get("user_id")
+        if user_id is None or record.vector is None:
+            logger.warning("Skipping point %s without user_id or vector", record.id)
+            continue
+        route = router.route(user_id)
+        if route.collection_name == source_collection:
+            continue
+        grouped.setdefault(route, []).append(
+            qmodels.PointStruct(id=record.id, vector=record.vector, payload=record.payload)
+        )
+
+    moved_ids = []
+    for route, points in grouped.items():
+        if route not in ensured_routes:
+            ensure_qdrant_collection(client, len(points[0].vector), settings, route)
+            ensured_routes.add(route)
+        upsert_points(client, route, points)
+        moved_ids.extend(point.id for point in points)
+
+    if moved_ids:
+        client.delete(
+            collection_name=source_collection,
+            points_selector=qmodels.PointIdsList(points=moved_ids),
+            wait=True,
+        )
+    return len(moved_ids)
+
+
+@celery_app.task(bind=True, name="migrate_tenant_vectors_task")
+def migrate_tenant_vectors_task(self, user_ids: List[str] | None = None) -> dict:
+    settings = get_settings()
+    router = TenantRouter(settings)
+    source_collection = settings.qdrant_collection_name
+    try:
+        client = build_qdrant_client()
+        if router.strategy == "payload" or not client.collection_exists(collection_name=source_collection):
+            return {"status": "completed", "step": "completed", "progress": 100, "moved": 0}
+
+        source_filter = None
+        if user_ids:
+            source_filter = qmodels.Filter(
+                must=[qmodels.FieldCondition(key="user_id", match=qmodels.MatchAny(any=user_ids))]
+            )
+        total = client.count(collection_name=source_collection, count_filter=source_filter, exact=True).count
+        logger.info("Migrating %d point(s) from %s using %s routing", total, source_collection, router.strategy)
+
+        ensured_routes: set[TenantRoute] = set()
+        moved = 0
+        offset = None
+        while True:
+            records, offset = client.scroll(
+                collection_name=source_collection,
+                scroll_filter=source_filter,
+                limit=MIGRATION_BATCH_SIZE,
+                offset=offset,
+                with_payload=True,
+                with_vectors=True,
+            )
+            moved += move_tenant_points(client, router, settings, source_collection, records, ensured_routes)
+            progress = min(99, int(100 * moved / total)) if total else 99
+            self.update_state(state="PROCESSING", meta={"step": "moving_points", "progress": progress})
+            if offset is None:
+                break
+
+        logger.info("Migrated %d point(s) out of %s", moved, source_collection)
+        return {"status": "completed", "step": "completed", "progress": 100, "moved": moved}
+    except Exception as e:
+        logger.exception("Tenant vector migration failed")
+        self.update_state(state="FAILURE", meta={"step": "error", "progress": 0, "error": str(e)})
+        raise
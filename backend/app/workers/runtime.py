@@ -0,0 +1,70 @@
+import asyncio
+import logging
+import threading
+from typing import Awaitable, TypeVar
+
+from celery.signals import worker_process_init, worker_process_shutdown
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from app.config import get_settings
+from app.db.session import build_engine, build_session_factory
+
+
+logger = logging.getLogger("enterprise_rag.worker_runtime")
+
+T = TypeVar("T")
+
+
+class WorkerRuntime:
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        settings = get_settings()
+        self.engine: AsyncEngine = build_engine(settings, pool_size=settings.db_worker_pool_size)
+        self.session_factory: async_sessionmaker[AsyncSession] = build_session_factory(self.engine)
+
+    def run(self, awaitable: Awaitable[T]) -> T:
+        return self.loop.run_until_complete(awaitable)
+
+    def close(self) -> None:
+        try:
+            self.run(self.engine.dispose())
+        finally:
+            self.loop.close()
+
+
+_local = threading.local()
+
+
+def get_runtime() -> WorkerRuntime:
+    runtime = getattr(_local, "runtime", None)
+    if runtime is None:
+        runtime = WorkerRuntime()
+        _local.runtime = runtime
+    return runtime
+
+
+def run_async(awaitable: Awaitable[T]) -> T:
+    return get_runtime().run(awaitable)
+
+
+def worker_session() -> AsyncSession:
+    return get_runtime().session_factory()
+
+
+def close_runtime() -> None:
+    runtime = getattr(_local, "runtime", None)
+    if runtime is None:
+        return
+    _local.runtime = None
+    runtime.close()
+
+
+@worker_process_init.connect
+def init_worker_runtime(**kwargs) -> None:
+    get_runtime()
+    logger.info("Worker async runtime initialized")
+
+
+@worker_process_shutdown.connect
+def shutdown_worker_runtime(**kwargs) -> None:
+    close_runtime()
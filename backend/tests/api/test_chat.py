@@ -1,30 +1,155 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock
 
 import pytest
 
+from app.dependencies import get_admission_controller
+from app.services.admission import AdmissionController
+
+
+async def frames(*chunks):
+    for chunk in chunks:
+        yield chunk
+
 
 @pytest.mark.unit
 class TestChatRouter:
-    def test_chat_stream_requires_x_user_id_header(self, client):
+    def test_chat_stream_requires_x_user_id_header(self, client, mock_orchestrator):
         response = client.post(
             "/api/v1/chat/stream",
             json={"message": "hello", "history": [], "config": {}},
         )
         assert response.status_code == 422
 
-    def test_chat_stream_returns_streaming_response_with_user_id(self, client):
-        with patch("app.api.v1.routers.chat.ChatOrchestrator") as mock_orchestrator:
-            mock_instance = MagicMock()
-            mock_instance.stream_chat.return_value = (chunk for chunk in [b"data: ok\n\n"])
-            mock_orchestrator.return_value = mock_instance
+    def test_chat_stream_returns_streaming_response_with_user_id(self, client, mock_orchestrator):
+        mock_orchestrator.stream_chat.return_value = frames(b"data: ok\n\n")
+        response = client.post(
+            "/api/v1/chat/stream",
+            headers={"X-User-ID": "test-user"},
+            json={
+                "message": "hello",
+                "history": [],
+                "config": {"persona": "technical", "temperature": 0.7, "use_hybrid_search": True},
+            },
+        )
+        assert response.status_code == 200
+        assert response.headers.get("content-type", "").startswith("text/event-stream")
+        assert "x-conversation-id" not in response.headers
+        assert mock_orchestrator.stream_chat.call_args.args[0].conversation_id is None
+        mock_orchestrator.compact_conversation.assert_not_called()
+
+    def test_chat_stream_starts_a_conversation_on_request(self, client, mock_orchestrator):
+        mock_orchestrator.stream_chat.return_value = frames(b"data: ok\n\n")
+        response = client.post(
+            "/api/v1/chat/stream",
+            headers={"X-User-ID": "test-user"},
+            json={"message": "hello", "start_conversation": True},
+        )
+        conversation_id = response.headers["x-conversation-id"]
+        assert mock_orchestrator.stream_chat.call_args.args[0].conversation_id == conversation_id
+
+    def test_chat_stream_continues_a_given_conversation(self, client, mock_orchestrator):
+        mock_orchestrator.stream_chat.return_value = frames(b"data: ok\n\n")
+        response = client.post(
+            "/api/v1/chat/stream",
+            headers={"X-User-ID": "test-user"},
+            json={"message": "follow-up", "conversation_id": "conv-42"},
+        )
+        assert response.status_code == 200
+        assert response.headers["x-conversation-id"] == "conv-42"
+        request, user_id = mock_orchestrator.stream_chat.call_args.args
+        assert (request.conversation_id, request.history, user_id) == ("conv-42", [], "test-user")
+        mock_orchestrator.compact_conversation.assert_called_once_with("test-user", "conv-42")
+
+    def test_chat_stream_rejects_malformed_conversation_ids(self, client, mock_orchestrator):
+        response = client.post(
+            "/api/v1/chat/stream",
+            headers={"X-User-ID": "test-user"},
+            json={"message": "hi", "conversation_id": "a:b*"},
+        )
+        assert response.status_code == 422
+
+    def test_retrieve_batch_returns_contexts_per_query(self, client, mock_orchestrator):
+        mock_orchestrator.retrieve_context_list_batch.return_value = [["File: a.txt"], []]
+        response = client.post(
+            "/api/v1/chat/retrieve",
+            headers={"X-User-ID": "test-user"},
+            json={"queries": ["first", "second"], "config": {"top_k": 3}},
+        )
+        assert response.status_code == 200
+        assert response.json() == {"contexts": [["File: a.txt"], []]}
+        user_id, queries, config = mock_orchestrator.retrieve_context_list_batch.call_args.args
+        assert (user_id, queries, config.top_k) == ("test-user", ["first", "second"], 3)
+
+    def test_retrieve_batch_rejects_empty_query_list(self, client, mock_orchestrator):
+        response = client.post(
+            "/api/v1/chat/retrieve",
+            headers={"X-User-ID": "test-user"},
+            json={"queries": []},
+        )
+        assert response.status_code == 422
+
+    def test_prompt_cache_metrics_report_hit_ratio(self, client, mock_redis):
+        mock_redis.hgetall = AsyncMock(
+            return_value={b"requests": b"3", b"prompt_tokens": b"6000", b"cached_tokens": b"4500", b"completion_tokens": b"300"}
+        )
+        response = client.get("/api/v1/chat/metrics/prompt-cache")
+        assert response.status_code == 200
+        assert response.json() == {
+            "requests": 3,
+            "prompt_tokens": 6000,
+            "cached_tokens": 4500,
+            "completion_tokens": 300,
+            "cache_hit_ratio": 0.75,
+        }
+
+    def test_chat_stream_sheds_load_with_retry_after(self, app, client, mock_orchestrator):
+        admission = AdmissionController(
+            max_concurrent=1, max_per_user=1, max_queue=0, max_wait_seconds=0.1, retry_after_seconds=3
+        )
+        admission.active, admission.by_user["test-user"] = 1, 1
+        app.dependency_overrides[get_admission_controller] = lambda: admission
+        try:
             response = client.post(
                 "/api/v1/chat/stream",
                 headers={"X-User-ID": "test-user"},
-                json={
-                    "message": "hello",
-                    "history": [],
-                    "config": {"persona": "technical", "temperature": 0.7, "use_hybrid_search": True},
-                },
+                json={"message": "hello"},
             )
-            assert response.status_code == 200
-            assert response.headers.get("content-type", "").startswith("text/event-stream")
+            assert response.status_code == 429
+            assert response.headers["retry-after"] == "3"
+            mock_orchestrator.stream_chat.assert_not_called()
+
+            metrics = client.get("/api/v1/chat/metrics/admission").json()
+            assert (metrics["active"], metrics["queued"], metrics["rejected_total"]) == (1, 0, {"user_limit": 1})
+        finally:
+            app.dependency_overrides.pop(get_admission_controller, None)
+
+    def test_chat_stream_releases_its_slot_after_streaming(self, app, client, mock_orchestrator):
+        admission = AdmissionController(
+            max_concurrent=1, max_per_user=1, max_queue=0, max_wait_seconds=0.1, retry_after_seconds=1
+        )
+        app.dependency_overrides[get_admission_controller] = lambda: admission
+        try:
+            for _ in range(2):
+                mock_orchestrator.stream_chat.return_value = frames(b"data: ok\n\n")
+                response = client.post(
+                    "/api/v1/chat/stream",
+                    headers={"X-User-ID": "test-user"},
+                    json={"message": "hello"},
+                )
+                assert response.status_code == 200
+            assert (admission.active, admission.admitted_total) == (0, 2)
+        finally:
+            app.dependency_overrides.pop(get_admission_controller, None)
+
+    def test_chat_stream_releases_its_slot_when_setup_fails(self, app, client, mock_orchestrator):
+        admission = AdmissionController(
+            max_concurrent=1, max_per_user=1, max_queue=0, max_wait_seconds=0.1, retry_after_seconds=1
+        )
+        app.dependency_overrides[get_admission_controller] = lambda: admission
+        mock_orchestrator.stream_chat.side_effect = RuntimeError("boom")
+        try:
+            with pytest.raises(RuntimeError):
+                client.post("/api/v1/chat/stream", headers={"X-User-ID": "test-user"}, json={"message": "hello"})
+            assert (admission.active, admission.admitted_total) == (0, 1)
+        finally:
+            app.dependency_overrides.pop(get_admission_controller, None)
@@ -1,11 +1,135 @@
+import uuid
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, MagicMock, patch
+
 import pytest
 
+from app.db.models import Document
+from app.db.session import get_read_db_session
+
+
+@pytest.fixture
+def mock_read_session(app):
+    session = MagicMock()
+    session.execute = AsyncMock(return_value=MagicMock())
+    session.execute.return_value.scalars.return_value = []
+    app.dependency_overrides[get_read_db_session] = lambda: session
+    yield session
+    app.dependency_overrides.pop(get_read_db_session, None)
+
 
 @pytest.mark.unit
 class TestDocumentsRouter:
-    def test_list_documents_returns_200_and_empty_list(self, client):
-        response = client.get("/api/v1/documents")
+    def test_list_documents_returns_200_and_empty_list(self, client, mock_read_session):
+        response = client.get("/api/v1/documents", headers={"X-User-ID": "user-1"})
         assert response.status_code == 200
         data = response.json()
         assert "documents" in data
         assert data["documents"] == []
+
+    def test_list_documents_reads_the_users_documents(self, client, mock_read_session):
+        now = datetime(2026, 1, 1, tzinfo=timezone.utc)
+        document = Document(
+            id=uuid.uuid4(),
+            user_id="user-1",
+            filename="a.pdf",
+            mime_type="application/pdf",
+            storage_path="/tmp/a.pdf",
+            status="completed",
+            created_at=now,
+            updated_at=now,
+        )
+        mock_read_session.execute.return_value.scalars.return_value = [document]
+        response = client.get("/api/v1/documents?limit=10", headers={"X-User-ID": "user-1"})
+        assert response.status_code == 200
+        assert [(d["id"], d["status"]) for d in response.json()["documents"]] == [(str(document.id), "completed")]
+        query = str(mock_read_session.execute.await_args.args[0])
+        assert "documents.user_id = :user_id_1" in query
+        assert "LIMIT :param_1" in query
+
+    def test_list_documents_requires_x_user_id_header(self, client, mock_read_session):
+        response = client.get("/api/v1/documents")
+        assert response.status_code == 422
+
+    def test_db_pool_metrics_report_each_engine(self, client):
+        pools = {"primary": {"size": 10, "checked_in": 2, "checked_out": 1, "overflow": 0}}
+        with patch("app.api.v1.routers.documents.get_pool_metrics", return_value=pools):
+            response = client.get("/api/v1/documents/metrics/db-pool")
+        assert response.status_code == 200
+        assert response.json() == {"pools": pools}
+
+
+@pytest.mark.unit
+class TestDocumentDeletion:
+    def test_delete_single_document_enqueues_task(self, client, mock_delete_task):
+        document_id = "7b0c2d0e-6a4f-4b43-9b53-1d2f8f0c3a11"
+        response = client.delete(
+            f"/api/v1/documents/{document_id}",
+            headers={"X-User-ID": "user-1"},
+        )
+        assert response.status_code == 202
+        data = response.json()
+        assert data["task_id"] == "delete-task-id-123"
+        assert data["document_ids"] == [document_id]
+        mock_delete_task.delay.assert_called_once_with([document_id], "user-1")
+
+    def test_bulk_delete_deduplicates_ids(self, client, mock_delete_task):
+        first = "7b0c2d0e-6a4f-4b43-9b53-1d2f8f0c3a11"
+        second = "0f5d9a61-2a4c-4d0e-8e0f-3c9a1b2d4e55"
+        response = client.post(
+            "/api/v1/documents/delete",
+            headers={"X-User-ID": "user-1"},
+            json={"document_ids": [first, second, first]},
+        )
+        assert response.status_code == 202
+        assert response.json()["document_ids"] == [first, second]
+        mock_delete_task.delay.assert_called_once_with([first, second], "user-1")
+
+    def test_bulk_delete_rejects_empty_list(self, client, mock_delete_task):
+        response = client.post(
+            "/api/v1/documents/delete",
+            headers={"X-User-ID": "user-1"},
+            json={"document_ids": []},
+        )
+        assert response.status_code == 422
+        mock_delete_task.delay.assert_not_called()
+
+    def test_delete_status_reports_progress(self, client):
+        with patch("app.api.v1.routers.documents.AsyncResult") as mock_async_result:
+            mock_result = MagicMock()
+            mock_result.state = "PROCESSING"
+            mock_result.info = {"step": "deleting", "progress": 50}
+            mock_async_result.return_value = mock_result
+            response = client.get("/api/v1/documents/delete/status/delete-task-id-123")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "processing"
+        assert data["step"] == "deleting"
+        assert data["progress"] == 50
+
+
+@pytest.mark.unit
+class TestDocumentReindex:
+    def test_reindex_enqueues_one_task_for_unique_ids(self, client):
+        first = "7b0c2d0e-6a4f-4b43-9b53-1d2f8f0c3a11"
+        second = "0f5d9a61-2a4c-4d0e-8e0f-3c9a1b2d4e55"
+        with patch("app.api.v1.routers.documents.reindex_documents_task") as mock_task:
+            mock_task.delay.return_value = MagicMock(id="reindex-task-id")
+            response = client.post(
+                "/api/v1/documents/reindex",
+                headers={"X-User-ID": "user-1"},
+                json={"document_ids": [first, second, first]},
+            )
+        assert response.status_code == 202
+        assert response.json()["task_id"] == "reindex-task-id"
+        assert mock_task.delay.call_args.args == ([first, second], "user-1")
+
+    def test_reindex_rejects_empty_list(self, client):
+        with patch("app.api.v1.routers.documents.reindex_documents_task") as mock_task:
+            response = client.post(
+                "/api/v1/documents/reindex",
+                headers={"X-User-ID": "user-1"},
+                json={"document_ids": []},
+            )
+        assert response.status_code == 422
+        mock_task.delay.assert_not_called()
@@ -1,8 +1,14 @@
+import asyncio
+import json
+import zipfile
 from io import BytesIO
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
+from app.config import Settings
+from app.services.bulk_ingest import BulkIngestService, BulkUploadTooLarge
+
 
 @pytest.mark.unit
 class TestIngestUpload:
@@ -91,3 +97,193 @@ class TestIngestStatus:
         data = response.json()
         assert data["status"] == "failed"
         assert data["error"] == "Parse error"
+
+
+@pytest.mark.unit
+class TestIngestStatusBatch:
+    def test_resolves_many_task_ids_in_one_pipeline(self, client, mock_redis):
+        pipeline = mock_redis.pipeline.return_value
+        pipeline.execute.return_value = [
+            json.dumps({"status": "PROCESSING", "result": {"step": "chunking", "progress": 30}}).encode(),
+            json.dumps({"status": "SUCCESS", "result": {"status": "completed"}}).encode(),
+            None,
+        ]
+        response = client.post(
+            "/api/v1/ingest/status/batch",
+            json={"task_ids": ["task-a", "task-b", "task-c", "task-a"]},
+        )
+        assert response.status_code == 200
+        statuses = response.json()["statuses"]
+        assert statuses["task-a"]["status"] == "processing"
+        assert statuses["task-a"]["progress"] == 30
+        assert statuses["task-b"]["status"] == "completed"
+        assert statuses["task-c"]["status"] == "pending"
+        assert pipeline.get.call_count == 3
+        pipeline.execute.assert_awaited_once()
+
+    def test_rejects_empty_task_id_list(self, client, mock_redis):
+        response = client.post("/api/v1/ingest/status/batch", json={"task_ids": []})
+        assert response.status_code == 422
+
+
+@pytest.mark.unit
+class TestIngestProgressStream:
+    def test_streams_published_events_until_completion(self, client, mock_redis, mock_celery_async_result):
+        mock_result = MagicMock()
+        mock_result.state = "PROCESSING"
+        mock_result.info = {"step": "extracting_text", "progress": 10}
+        mock_celery_async_result.return_value = mock_result
+        mock_redis.pubsub.return_value.get_message.side_effect = [
+            None,
+            {"data": b'{"status": "processing", "step": "storing_vectors", "progress": 85, "error": null}'},
+            {"data": b'{"status": "completed", "step": "completed", "progress": 100, "error": null}'},
+        ]
+        response = client.get("/api/v1/ingest/progress/task-123")
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        frames = [frame for frame in response.text.split("\n\n") if frame]
+        assert json.loads(frames[0].removeprefix("data: "))["step"] == "extracting_text"
+        assert frames[1] == ": keep-alive"
+        assert json.loads(frames[-1].removeprefix("data: "))["status"] == "completed"
+        mock_redis.pubsub.return_value.subscribe.assert_awaited_once_with("ingest:progress:task-123")
+
+    def test_terminal_task_sends_single_event(self, client, mock_redis, mock_celery_async_result):
+        mock_result = MagicMock()
+        mock_result.state = "SUCCESS"
+        mock_celery_async_result.return_value = mock_result
+        response = client.get("/api/v1/ingest/progress/task-done")
+        frames = [frame for frame in response.text.split("\n\n") if frame]
+        assert len(frames) == 1
+        assert json.loads(frames[0].removeprefix("data: "))["status"] == "completed"
+        mock_redis.pubsub.return_value.get_message.assert_not_awaited()
+
+    def test_status_lookup_runs_off_the_event_loop(self, client, mock_redis, mock_celery_async_result):
+        on_event_loop = []
+
+        def lookup(*args, **kwargs):
+            try:
+                asyncio.get_running_loop()
+                on_event_loop.append(True)
+            except RuntimeError:
+                on_event_loop.append(False)
+            return MagicMock(state="SUCCESS")
+
+        mock_celery_async_result.side_effect = lookup
+        response = client.get("/api/v1/ingest/progress/task-done")
+        assert response.status_code == 200
+        assert on_event_loop == [False]
+
+
+@pytest.mark.unit
+class TestIngestBulk:
+    def test_bulk_upload_stages_archive_members_and_dispatches(self, client, mock_redis, tmp_path):
+        archive = BytesIO()
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("a.txt", "first document")
+            zf.writestr("b.txt", "second document")
+            zf.writestr("c.exe", "MZ binary")
+        archive.seek(0)
+        with (
+            patch("app.services.bulk_ingest.get_settings") as mock_get_settings,
+            patch.object(BulkIngestService, "dispatch", return_value={"task-1": 2}) as mock_dispatch,
+        ):
+            mock_get_settings.return_value = Settings(
+                database_url="postgresql+asyncpg://localhost/db",
+                qdrant_url="http://localhost:6333",
+                redis_url="redis://localhost:6379",
+                storage_path=str(tmp_path),
+            )
+            response = client.post(
+                "/api/v1/ingest/bulk",
+                headers={"X-User-ID": "user-1"},
+                files=[
+                    ("files", ("docs.zip", archive, "application/zip")),
+                    ("files", ("notes.txt", BytesIO(b"loose file"), "text/plain")),
+                ],
+            )
+        assert response.status_code == 202
+        data = response.json()
+        assert data["accepted"] == 3
+        assert data["task_ids"] == ["task-1"]
+        assert [r["filename"] for r in data["rejected"]] == ["c.exe"]
+        staged = mock_dispatch.call_args.args[0]
+        assert sorted(f["filename"] for f in staged) == ["a.txt", "b.txt", "notes.txt"]
+        assert all(f["mime_type"] == "text/plain" for f in staged)
+        mock_redis.pipeline.return_value.hset.assert_called_once()
+
+    def test_bulk_dispatch_runs_off_the_event_loop(self, client, mock_redis):
+        on_event_loop = []
+
+        def dispatch(*args):
+            try:
+                asyncio.get_running_loop()
+                on_event_loop.append(True)
+            except RuntimeError:
+                on_event_loop.append(False)
+            return {"task-1": 1}
+
+        staged = [{"file_path": "/tmp/a.txt", "filename": "a.txt", "mime_type": "text/plain"}]
+        with (
+            patch.object(BulkIngestService, "stage_uploads", return_value=(staged, [])),
+            patch.object(BulkIngestService, "dispatch", side_effect=dispatch),
+        ):
+            response = client.post(
+                "/api/v1/ingest/bulk",
+                headers={"X-User-ID": "user-1"},
+                files=[("files", ("a.txt", BytesIO(b"first document"), "text/plain"))],
+            )
+        assert response.status_code == 202
+        assert on_event_loop == [False]
+
+    def test_bulk_upload_over_the_limits_returns_413(self, client, mock_redis):
+        too_large = BulkUploadTooLarge("Bulk upload exceeds 10 bytes")
+        with patch.object(BulkIngestService, "stage_uploads", side_effect=too_large):
+            response = client.post(
+                "/api/v1/ingest/bulk",
+                headers={"X-User-ID": "user-1"},
+                files=[("files", ("a.txt", BytesIO(b"too many bytes"), "text/plain"))],
+            )
+        assert response.status_code == 413
+        assert response.json()["detail"] == "Bulk upload exceeds 10 bytes"
+
+    def test_bulk_upload_rejects_when_nothing_supported(self, client, mock_redis):
+        response = client.post(
+            "/api/v1/ingest/bulk",
+            headers={"X-User-ID": "user-1"},
+            files=[("files", ("bad.exe", BytesIO(b"MZ"), "application/octet-stream"))],
+        )
+        assert response.status_code == 400
+
+    def test_batch_progress_aggregates_task_statuses(self, client, mock_redis):
+        mock_redis.hgetall = AsyncMock(return_value={b"task-1": b"3", b"task-2": b"1"})
+        mock_redis.pipeline.return_value.execute.return_value = [
+            json.dumps({"status": "SUCCESS", "result": {}}).encode(),
+            json.dumps({"status": "PROCESSING", "result": {"step": "chunking", "progress": 40}}).encode(),
+        ]
+        response = client.get("/api/v1/ingest/batch/batch-1")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "processing"
+        assert data["total_files"] == 4
+        assert data["completed_files"] == 3
+        assert data["progress"] == 85
+
+    def test_batch_progress_returns_404_for_unknown_batch(self, client, mock_redis):
+        mock_redis.hgetall = AsyncMock(return_value={})
+        response = client.get("/api/v1/ingest/batch/missing")
+        assert response.status_code == 404
+
+
+@pytest.mark.unit
+class TestIngestQueueWaitMetrics:
+    def test_reports_queue_wait_per_tenant_and_lane(self, client, mock_redis):
+        mock_redis.smembers = AsyncMock(return_value={b"bulk:user-1", b"interactive:user-1"})
+        mock_redis.pipeline.return_value.execute.return_value = [
+            {b"count": b"4", b"sum": b"20.0", b"max": b"9.5"},
+            {b"count": b"2", b"sum": b"1.0", b"max": b"0.75"},
+        ]
+        response = client.get("/api/v1/ingest/metrics/queue-wait")
+        assert response.status_code == 200
+        tenant = response.json()["tenants"]["user-1"]
+        assert tenant["bulk"] == {"count": 4, "avg_seconds": 5.0, "max_seconds": 9.5}
+        assert tenant["interactive"]["avg_seconds"] == 0.5
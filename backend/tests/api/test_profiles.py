@@ -0,0 +1,126 @@
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+
+from app.config import get_settings
+from app.dependencies import get_admission_controller
+from app.services.admission import AdmissionController
+from app.services.profiling import ProfileStore, new_profile_id
+
+TOKEN = "profiling-secret"
+
+
+async def frames(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.fixture
+def profile_settings(tmp_path, monkeypatch):
+    settings = get_settings()
+    monkeypatch.setattr(settings, "profiling_token", TOKEN)
+    monkeypatch.setattr(settings, "profile_dir", str(tmp_path))
+    return settings
+
+
+@pytest.mark.unit
+class TestProfilingRequests:
+    def test_chat_stream_rejects_an_invalid_token(self, client, mock_orchestrator, profile_settings):
+        response = client.post(
+            "/api/v1/chat/stream",
+            headers={"X-User-ID": "test-user", "X-Profile-Token": "wrong"},
+            json={"message": "hello"},
+        )
+        assert response.status_code == 403
+        mock_orchestrator.stream_chat.assert_not_called()
+
+    def test_chat_stream_returns_a_profile_id(self, client, mock_orchestrator, profile_settings, tmp_path):
+        mock_orchestrator.stream_chat.return_value = frames(b"data: ok\n\n")
+        response = client.post(
+            "/api/v1/chat/stream",
+            headers={"X-User-ID": "test-user", "X-Profile-Token": TOKEN},
+            json={"message": "hello"},
+        )
+        assert response.status_code == 200
+        profile_id = response.headers["x-profile-id"]
+        assert mock_orchestrator.stream_chat.call_args.kwargs["profile_id"] == profile_id
+        assert (tmp_path / profile_id / "meta.json").exists()
+
+    def test_unwritable_profile_dir_does_not_hold_an_admission_slot(
+        self, app, client, mock_orchestrator, profile_settings
+    ):
+        admission = AdmissionController(
+            max_concurrent=1, max_per_user=1, max_queue=0, max_wait_seconds=0.1, retry_after_seconds=1
+        )
+        app.dependency_overrides[get_admission_controller] = lambda: admission
+        try:
+            with patch.object(ProfileStore, "write_meta", side_effect=OSError("read-only file system")):
+                with pytest.raises(OSError):
+                    client.post(
+                        "/api/v1/chat/stream",
+                        headers={"X-User-ID": "test-user", "X-Profile-Token": TOKEN},
+                        json={"message": "hello"},
+                    )
+            assert admission.active == 0
+        finally:
+            app.dependency_overrides.pop(get_admission_controller, None)
+
+    def test_chat_stream_is_not_profiled_without_a_token(self, client, mock_orchestrator, profile_settings):
+        mock_orchestrator.stream_chat.return_value = frames(b"data: ok\n\n")
+        response = client.post("/api/v1/chat/stream", headers={"X-User-ID": "test-user"}, json={"message": "hello"})
+        assert "x-profile-id" not in response.headers
+        assert mock_orchestrator.stream_chat.call_args.kwargs["profile_id"] is None
+
+    def test_upload_passes_the_profile_id_to_the_task(
+        self, client, mock_storage_service, mock_ingest_task, profile_settings
+    ):
+        with patch("app.api.v1.routers.ingest.validate_mime_type", return_value="application/pdf"):
+            response = client.post(
+                "/api/v1/ingest/upload",
+                headers={"X-User-ID": "user-1", "X-Profile-Token": TOKEN},
+                files={"file": ("doc.pdf", BytesIO(b"%PDF-1.4 content"), "application/pdf")},
+            )
+        assert response.status_code == 202
+        profile_id = response.json()["profile_id"]
+        assert mock_ingest_task.delay.call_args.kwargs["profile_id"] == profile_id
+
+    def test_upload_without_a_token_keeps_the_task_signature(self, client, mock_storage_service, mock_ingest_task):
+        with patch("app.api.v1.routers.ingest.validate_mime_type", return_value="application/pdf"):
+            response = client.post(
+                "/api/v1/ingest/upload",
+                headers={"X-User-ID": "user-1"},
+                files={"file": ("doc.pdf", BytesIO(b"%PDF-1.4 content"), "application/pdf")},
+            )
+        assert response.json()["profile_id"] is None
+        assert "profile_id" not in mock_ingest_task.delay.call_args.kwargs
+
+
+@pytest.mark.unit
+class TestProfilesRouter:
+    def test_endpoints_require_the_token(self, client, profile_settings):
+        assert client.get("/api/v1/profiles").status_code == 403
+        assert client.get("/api/v1/profiles", headers={"X-Profile-Token": "wrong"}).status_code == 403
+
+    def test_endpoints_are_disabled_without_a_configured_token(self, client):
+        assert client.get("/api/v1/profiles", headers={"X-Profile-Token": TOKEN}).status_code == 403
+
+    def test_lists_and_downloads_artifacts(self, client, profile_settings, tmp_path):
+        profile_id = new_profile_id()
+        ProfileStore(tmp_path).write_meta(profile_id, "ingest", user_id="user-1", task_id="task-1")
+        (tmp_path / profile_id / "extract.txt").write_text("stats")
+        headers = {"X-Profile-Token": TOKEN}
+
+        listing = client.get("/api/v1/profiles", headers=headers)
+        assert listing.status_code == 200
+        [profile] = listing.json()["profiles"]
+        assert (profile["profile_id"], profile["kind"], profile["task_id"]) == (profile_id, "ingest", "task-1")
+        assert profile["artifacts"] == ["extract.txt"]
+
+        download = client.get(f"/api/v1/profiles/{profile_id}/extract.txt", headers=headers)
+        assert download.status_code == 200
+        assert download.content == b"stats"
+
+    def test_unknown_artifacts_return_404(self, client, profile_settings):
+        response = client.get(f"/api/v1/profiles/{new_profile_id()}/chat.prof", headers={"X-Profile-Token": TOKEN})
+        assert response.status_code == 404
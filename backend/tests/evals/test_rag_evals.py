@@ -51,24 +51,32 @@ def test_rag_answer_relevance_and_faithfulness_above_threshold():
     eval_user_id = os.getenv("RAG_EVAL_USER_ID", "eval-test-user")
 
     use_mock_context = os.getenv("RAG_EVAL_USE_MOCK_CONTEXT", "").lower() in ("1", "true", "yes")
-    eval_samples = []
+    questions = [item["question"] for item in samples]
+    contexts_overrides = []
     for item in samples:
-        question = item["question"]
-        ground_truth = item["ground_truth"]
         contexts_override = item.get("reference_contexts") if use_mock_context else None
         if contexts_override is not None and isinstance(contexts_override, str):
             contexts_override = [contexts_override]
-        answer, contexts = orchestrator.get_answer_for_eval(
-            eval_user_id, question, config, contexts_override=contexts_override
-        )
+        contexts_overrides.append(contexts_override)
+
+    results = orchestrator.get_answers_for_eval(
+        eval_user_id,
+        questions,
+        config,
+        contexts_overrides=contexts_overrides,
+        max_concurrency=int(os.getenv("RAG_EVAL_CONCURRENCY", "8")),
+    )
+
+    eval_samples = []
+    for item, (answer, contexts) in zip(samples, results):
         if not contexts:
             contexts = [""]
         eval_samples.append(
             SingleTurnSample(
-                user_input=question,
+                user_input=item["question"],
                 retrieved_contexts=contexts,
                 response=answer,
-                reference=ground_truth,
+                reference=item["ground_truth"],
             )
         )
 
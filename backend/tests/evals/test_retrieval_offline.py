@@ -0,0 +1,41 @@
+import pytest
+
+from app.tools.retrieval_eval import (
+    EVAL_CONFIGS,
+    FIXTURES_PATH,
+    build_eval_index,
+    build_orchestrator,
+    evaluate_retrieval,
+    load_json,
+)
+
+
+REPLAY_DIR = FIXTURES_PATH / "replay"
+MIN_RECALL_AT_K = 0.8
+MIN_MRR = 0.8
+MIN_NDCG_AT_K = 0.8
+
+
+def run_retrieval_eval(mode: str, config_name: str) -> dict:
+    orchestrator = build_orchestrator(mode, REPLAY_DIR)
+    build_eval_index(orchestrator, load_json(FIXTURES_PATH / "retrieval_corpus.json"))
+    samples = [sample for sample in load_json(FIXTURES_PATH / "ground_truth_rag.json") if sample.get("relevant_sources")]
+    return evaluate_retrieval(orchestrator, samples, EVAL_CONFIGS[config_name].model_copy(update={"top_k": 5}), k=5)
+
+
+@pytest.mark.evals
+@pytest.mark.parametrize("config_name", sorted(EVAL_CONFIGS))
+def test_retrieval_metrics_with_hashed_embeddings(config_name):
+    metrics = run_retrieval_eval("hashed", config_name)
+
+    assert metrics["recall_at_k"] >= MIN_RECALL_AT_K, f"recall@5 {metrics['recall_at_k']:.3f} < {MIN_RECALL_AT_K}"
+    assert metrics["mrr"] >= MIN_MRR, f"MRR {metrics['mrr']:.3f} < {MIN_MRR}"
+    assert metrics["ndcg_at_k"] >= MIN_NDCG_AT_K, f"nDCG@5 {metrics['ndcg_at_k']:.3f} < {MIN_NDCG_AT_K}"
+
+
+@pytest.mark.evals
+@pytest.mark.skipif(not REPLAY_DIR.exists(), reason="No recorded responses; run app.tools.retrieval_eval --mode record")
+def test_offline_retrieval_metrics():
+    metrics = run_retrieval_eval("replay", "dedup")
+
+    assert metrics["recall_at_k"] >= MIN_RECALL_AT_K, f"recall@5 {metrics['recall_at_k']:.3f} < {MIN_RECALL_AT_K}"
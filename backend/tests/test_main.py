@@ -1,6 +1,29 @@
+import asyncio
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, patch
+
 import pytest
 
 from app.main import create_app
+from app.models.schemas import ReadinessResponse
+from app.services.readiness import check_readiness
+
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+IMPORT_TIME_BUDGET_SECONDS = float(os.environ.get("IMPORT_TIME_BUDGET_SECONDS", "3.0"))
+DEFERRED_MODULES = (
+    "fitz",
+    "docx",
+    "qdrant_client",
+    "openai",
+    "app.services.chat",
+    "app.workers.ingestion_tasks",
+    "app.workers.deletion_tasks",
+)
 
 
 @pytest.mark.unit
@@ -15,3 +38,63 @@ class TestCreateApp:
         data = response.json()
         assert data["status"] == "ok"
         assert "service" in data
+
+    def test_ready_reports_dependency_checks(self, client):
+        readiness = ReadinessResponse(ready=True, checks={"postgres": "ok", "redis": "ok", "qdrant": "ok"})
+        with patch("app.main.check_readiness", new_callable=AsyncMock, return_value=readiness):
+            response = client.get("/ready")
+        assert response.status_code == 200
+        assert response.json()["checks"]["qdrant"] == "ok"
+
+    def test_ready_returns_503_when_a_dependency_is_down(self, client):
+        readiness = ReadinessResponse(ready=False, checks={"postgres": "ok", "redis": "error: ConnectionError"})
+        with patch("app.main.check_readiness", new_callable=AsyncMock, return_value=readiness):
+            response = client.get("/ready")
+        assert response.status_code == 503
+        assert response.json()["ready"] is False
+
+
+@pytest.mark.unit
+class TestReadinessProbes:
+    def test_failed_and_slow_probes_are_reported(self):
+        async def healthy():
+            return None
+
+        async def failing():
+            raise ConnectionError("refused")
+
+        async def hanging():
+            await asyncio.sleep(10)
+
+        probes = {"postgres": healthy, "redis": failing, "qdrant": hanging}
+        with patch.dict("app.services.readiness.READINESS_PROBES", probes, clear=True):
+            readiness = asyncio.run(check_readiness(timeout=0.05))
+        assert readiness.ready is False
+        assert readiness.checks == {
+            "postgres": "ok",
+            "redis": "error: ConnectionError",
+            "qdrant": "error: TimeoutError",
+        }
+
+
+@pytest.mark.unit
+class TestImportTime:
+    def test_api_import_skips_worker_and_provider_modules(self):
+        script = (
+            "import json, sys, time\n"
+            "started = time.perf_counter()\n"
+            "import app.main\n"
+            "elapsed = time.perf_counter() - started\n"
+            f"print(json.dumps({{'seconds': elapsed, 'loaded': [m for m in {DEFERRED_MODULES!r} if m in sys.modules]}}))\n"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=BACKEND_DIR,
+            env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        report = json.loads(result.stdout.strip().splitlines()[-1])
+        assert report["loaded"] == []
+        assert report["seconds"] < IMPORT_TIME_BUDGET_SECONDS, f"app.main imported in {report['seconds']:.2f}s"
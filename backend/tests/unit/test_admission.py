@@ -0,0 +1,152 @@
+import asyncio
+import threading
+
+import pytest
+from starlette.background import BackgroundTask
+from starlette.responses import StreamingResponse
+
+from app.services.admission import AdmissionController, AdmissionRejected
+
+
+def make_controller(max_concurrent=2, max_per_user=2, max_queue=2, max_wait_seconds=0.5):
+    return AdmissionController(
+        max_concurrent=max_concurrent,
+        max_per_user=max_per_user,
+        max_queue=max_queue,
+        max_wait_seconds=max_wait_seconds,
+        retry_after_seconds=1.5,
+    )
+
+
+async def drain(stream):
+    return [chunk async for chunk in stream]
+
+
+async def cancel(task):
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+
+async def frames(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+@pytest.mark.unit
+class TestAdmissionController:
+    async def test_admits_up_to_the_global_limit_without_waiting(self):
+        controller = make_controller()
+        await controller.acquire("a")
+        await controller.acquire("b")
+        metrics = controller.metrics()
+        assert (metrics["active"], metrics["queued"], metrics["admitted_total"]) == (2, 0, 2)
+
+    async def test_rejects_users_over_their_own_limit(self):
+        controller = make_controller(max_concurrent=10, max_per_user=1)
+        await controller.acquire("a")
+        with pytest.raises(AdmissionRejected) as e:
+            await controller.acquire("a")
+        assert e.value.reason == "user_limit"
+        assert e.value.retry_after_header == "2"
+        await controller.acquire("b")
+
+    async def test_queued_stream_gets_the_next_released_slot(self):
+        controller = make_controller(max_concurrent=1)
+        ticket = await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        assert controller.metrics()["queued"] == 1
+
+        ticket.release()
+        ticket.release()
+        second = await waiting
+        assert second.user_id == "b"
+        assert (controller.active, dict(controller.by_user)) == (1, {"b": 1})
+
+    async def test_queued_streams_count_against_the_user_limit(self):
+        controller = make_controller(max_concurrent=1, max_per_user=1)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected, match="user_limit"):
+            await controller.acquire("b")
+        await cancel(waiting)
+
+    async def test_rejects_when_the_queue_is_full(self):
+        controller = make_controller(max_concurrent=1, max_queue=1)
+        await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        with pytest.raises(AdmissionRejected, match="queue_full"):
+            await controller.acquire("c")
+        await cancel(waiting)
+        assert controller.metrics()["rejected_total"] == {"queue_full": 1}
+
+    async def test_gives_up_after_the_max_wait(self):
+        controller = make_controller(max_concurrent=1, max_wait_seconds=0.01)
+        await controller.acquire("a")
+        with pytest.raises(AdmissionRejected, match="queue_timeout"):
+            await controller.acquire("b")
+        assert (controller.active, controller.metrics()["queued"], dict(controller.by_user)) == (1, 0, {"a": 1})
+
+    async def test_cancelled_waiter_leaves_the_queue(self):
+        controller = make_controller(max_concurrent=1)
+        ticket = await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        await asyncio.sleep(0)
+        await cancel(waiting)
+        ticket.release()
+        assert (controller.active, controller.metrics()["queued"], dict(controller.by_user)) == (0, 0, {})
+
+    async def test_hold_releases_the_slot_when_the_stream_ends(self):
+        controller = make_controller(max_concurrent=1)
+        ticket = await controller.acquire("a")
+        assert await drain(ticket.hold(frames(b"one", b"two"))) == [b"one", b"two"]
+        assert controller.active == 0
+        ticket.release()
+        assert controller.active == 0
+
+    async def test_hold_releases_the_slot_when_the_stream_fails(self):
+        async def failing():
+            yield b"one"
+            raise RuntimeError("boom")
+
+        controller = make_controller(max_concurrent=1)
+        ticket = await controller.acquire("a")
+        with pytest.raises(RuntimeError):
+            await drain(ticket.hold(failing()))
+        assert controller.active == 0
+
+    async def test_client_disconnect_hands_the_slot_to_a_waiter_on_the_loop(self):
+        async def endless():
+            while True:
+                yield b"data: ok\n\n"
+                await asyncio.sleep(0.01)
+
+        async def receive():
+            await asyncio.sleep(0.05)
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                await asyncio.sleep(10)
+
+        controller = make_controller(max_concurrent=1, max_wait_seconds=2)
+        ticket = await controller.acquire("a")
+        waiting = asyncio.create_task(controller.acquire("b"))
+        release, release_threads = controller.release, []
+
+        def record_release(user_id):
+            release_threads.append(threading.get_ident())
+            release(user_id)
+
+        controller.release = record_release
+        response = StreamingResponse(ticket.hold(endless()), background=BackgroundTask(ticket.aclose))
+        await response({"type": "http"}, receive, send)
+
+        second = await asyncio.wait_for(waiting, 1)
+        assert release_threads == [threading.get_ident()]
+        assert (controller.active, dict(controller.by_user)) == (1, {"b": 1})
+        second.release()
+        assert controller.active == 0
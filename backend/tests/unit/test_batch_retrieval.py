@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+
+from app.models.schemas import ChatConfig
+from app.services.chat import ChatOrchestrator
+from app.services.vector_store import TenantRoute, ensure_qdrant_collection
+from tests.conftest import make_settings
+
+
+QUERY_VECTORS = {"north": [0.0, 1.0], "east": [1.0, 0.0]}
+
+
+@pytest.fixture
+def orchestrator():
+    settings = make_settings(use_local_embeddings=True)
+    client = QdrantClient(":memory:")
+    ensure_qdrant_collection(client, 2, settings, TenantRoute(collection_name="documents"))
+    client.upsert(
+        "documents",
+        points=[
+            qmodels.PointStruct(
+                id=index,
+                vector=vector,
+                payload={"user_id": user_id, "filename": f"{name}.txt", "page_number": 1, "chunk_index": 0},
+            )
+            for index, (user_id, name, vector) in enumerate(
+                [("user-1", "north", [0.1, 1.0]), ("user-1", "east", [1.0, 0.1]), ("user-2", "north", [0.0, 1.0])]
+            )
+        ],
+    )
+    chat = ChatOrchestrator(settings=settings, qdrant_client=client)
+    chat.embedding_service = MagicMock()
+    chat.embedding_service.embed_chunks.side_effect = lambda queries: np.array(
+        [QUERY_VECTORS[q] for q in queries], dtype=np.float32
+    )
+    return chat
+
+
+@pytest.mark.unit
+class TestBatchRetrieval:
+    def test_embeds_all_queries_once_and_searches_in_one_batch(self, orchestrator):
+        orchestrator.qdrant_client.search_batch = MagicMock(wraps=orchestrator.qdrant_client.search_batch)
+
+        contexts = orchestrator.retrieve_context_list_batch("user-1", ["north", "east"], ChatConfig(top_k=1))
+
+        assert contexts == [["File: north.txt, page: 1, chunk: 0"], ["File: east.txt, page: 1, chunk: 0"]]
+        orchestrator.embedding_service.embed_chunks.assert_called_once_with(["north", "east"])
+        orchestrator.qdrant_client.search_batch.assert_called_once()
+
+    def test_batch_results_stay_scoped_to_the_user(self, orchestrator):
+        contexts = orchestrator.retrieve_context_list_batch("user-2", ["east"], ChatConfig(top_k=5))
+        assert contexts == [["File: north.txt, page: 1, chunk: 0"]]
+
+    def test_eval_batch_retrieves_missing_contexts_and_answers_concurrently(self, orchestrator):
+        orchestrator.llm.remote.client = MagicMock()
+        orchestrator.llm.remote.client.chat.completions.create.side_effect = lambda **kwargs: SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=f" {kwargs['messages'][-1]['content']} "))]
+        )
+
+        results = orchestrator.get_answers_for_eval(
+            "user-1",
+            ["north", "east"],
+            ChatConfig(top_k=1, temperature=0.0),
+            contexts_overrides=[None, ["given context"]],
+            max_concurrency=2,
+        )
+
+        assert results == [("north", ["File: north.txt, page: 1, chunk: 0"]), ("east", ["given context"])]
+        orchestrator.embedding_service.embed_chunks.assert_called_once_with(["north"])
+        assert orchestrator.llm.remote.client.chat.completions.create.call_count == 2
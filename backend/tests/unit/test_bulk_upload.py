@@ -0,0 +1,100 @@
+import io
+import tarfile
+import zipfile
+from unittest.mock import MagicMock
+
+import pytest
+
+from app.services.bulk_ingest import BulkIngestService, BulkUploadTooLarge
+from app.services.storage import StorageService
+from app.utils.bulk_upload import group_small_files, is_archive, iter_archive_members
+
+
+def make_zip(members: dict) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, content in members.items():
+            archive.writestr(name, content)
+    buffer.seek(0)
+    return buffer
+
+
+def make_service(tmp_path, max_total_bytes=1000, max_files=10) -> BulkIngestService:
+    settings = MagicMock(storage_path=str(tmp_path), bulk_max_total_bytes=max_total_bytes, bulk_max_files=max_files)
+    return BulkIngestService(settings, StorageService(settings))
+
+
+def make_tar(members: dict) -> io.BytesIO:
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+        for name, content in members.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            archive.addfile(info, io.BytesIO(content))
+    buffer.seek(0)
+    return buffer
+
+
+@pytest.mark.unit
+class TestArchiveMembers:
+    def test_detects_archive_suffixes(self):
+        assert is_archive("docs.zip")
+        assert is_archive("docs.TAR.GZ")
+        assert not is_archive("doc.pdf")
+
+    def test_iterates_zip_members_and_skips_metadata(self):
+        archive = make_zip({"a/one.txt": b"one", "__MACOSX/a/._one.txt": b"x", ".hidden": b"h", "two.txt": b"two"})
+        members = [(m.filename, m.stream.read()) for m in iter_archive_members(archive, "docs.zip")]
+        assert members == [("one.txt", b"one"), ("two.txt", b"two")]
+
+    def test_streams_tar_members(self):
+        archive = make_tar({"dir/one.txt": b"one", "two.txt": b"two"})
+        members = [(m.filename, m.stream.read()) for m in iter_archive_members(archive, "docs.tgz")]
+        assert members == [("one.txt", b"one"), ("two.txt", b"two")]
+
+    def test_members_report_their_declared_size(self):
+        assert [m.size for m in iter_archive_members(make_zip({"one.txt": b"one"}), "docs.zip")] == [3]
+        assert [m.size for m in iter_archive_members(make_tar({"two.txt": b"four"}), "docs.tar.gz")] == [4]
+
+
+@pytest.mark.unit
+class TestStageUploads:
+    def test_stages_files_within_the_budget(self, tmp_path):
+        accepted, rejected = make_service(tmp_path).stage_uploads(
+            [("docs.zip", make_zip({"a.txt": b"alpha", "b.txt": b"beta"}))], "user-1"
+        )
+        assert [(f["filename"], f["size"]) for f in accepted] == [("a.txt", 5), ("b.txt", 4)]
+        assert rejected == []
+
+    def test_rejects_oversized_archive_members_before_writing_them(self, tmp_path):
+        service = make_service(tmp_path, max_total_bytes=100)
+        service.storage_service.save_stream = MagicMock(wraps=service.storage_service.save_stream)
+        with pytest.raises(BulkUploadTooLarge):
+            service.stage_uploads([("docs.tgz", make_tar({"a.txt": b"a" * 60, "b.txt": b"b" * 60}))], "user-1")
+        assert service.storage_service.save_stream.call_count == 1
+        assert list((tmp_path / "user-1").iterdir()) == []
+
+    def test_aborts_an_oversized_stream_mid_copy(self, tmp_path):
+        service = make_service(tmp_path, max_total_bytes=100)
+        with pytest.raises(BulkUploadTooLarge):
+            service.stage_uploads([("a.txt", io.BytesIO(b"a" * 50)), ("b.txt", io.BytesIO(b"b" * 60))], "user-1")
+        assert list((tmp_path / "user-1").iterdir()) == []
+
+    def test_rejects_uploads_over_the_file_limit(self, tmp_path):
+        with pytest.raises(BulkUploadTooLarge, match="2 files"):
+            make_service(tmp_path, max_files=2).stage_uploads(
+                [("docs.zip", make_zip({"a.txt": b"alpha", "b.txt": b"beta", "c.txt": b"gamma"}))], "user-1"
+            )
+
+
+@pytest.mark.unit
+class TestGroupSmallFiles:
+    def test_large_files_get_their_own_group(self):
+        files = [{"size": 10}, {"size": 1000}, {"size": 10}]
+        groups = group_small_files(files, small_file_bytes=100, max_files=10, max_bytes=1000)
+        assert groups == [[{"size": 1000}], [{"size": 10}, {"size": 10}]]
+
+    def test_groups_are_capped_by_count_and_bytes(self):
+        files = [{"size": 40} for _ in range(5)]
+        assert [len(g) for g in group_small_files(files, 100, max_files=2, max_bytes=1000)] == [2, 2, 1]
+        assert [len(g) for g in group_small_files(files, 100, max_files=10, max_bytes=100)] == [2, 2, 1]
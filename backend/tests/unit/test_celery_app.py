@@ -0,0 +1,42 @@
+from types import SimpleNamespace
+
+import click
+import pytest
+from click.core import ParameterSource
+
+from app.workers.celery_app import STAGE_QUEUES, configure_stage_worker
+
+
+def make_worker(*queues):
+    app = SimpleNamespace(amqp=SimpleNamespace(queues=SimpleNamespace(consume_from={q: None for q in queues})))
+    return SimpleNamespace(app=app, concurrency=2, prefetch_multiplier=1)
+
+
+def worker_command(**sources):
+    context = click.Context(click.Command("worker"))
+    for option, source in sources.items():
+        context.set_parameter_source(option, source)
+    return context
+
+
+@pytest.mark.unit
+class TestStageWorkerDefaults:
+    def test_single_stage_worker_gets_the_stage_defaults(self):
+        worker = make_worker("embed")
+        with worker_command(concurrency=ParameterSource.DEFAULT, prefetch_multiplier=ParameterSource.DEFAULT):
+            configure_stage_worker(sender=worker)
+        assert (worker.concurrency, worker.prefetch_multiplier) == (
+            STAGE_QUEUES["embed"]["concurrency"],
+            STAGE_QUEUES["embed"]["prefetch_multiplier"],
+        )
+
+    def test_command_line_values_win_over_stage_defaults(self):
+        worker = make_worker("embed")
+        with worker_command(concurrency=ParameterSource.COMMANDLINE, prefetch_multiplier=ParameterSource.COMMANDLINE):
+            configure_stage_worker(sender=worker)
+        assert (worker.concurrency, worker.prefetch_multiplier) == (2, 1)
+
+    def test_workers_on_several_queues_keep_their_settings(self):
+        worker = make_worker("celery", "cpu_extract", "embed", "index")
+        configure_stage_worker(sender=worker)
+        assert (worker.concurrency, worker.prefetch_multiplier) == (2, 1)
@@ -0,0 +1,186 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from app.models.schemas import ChatMessage, ChatRequest
+from app.services.chat import ChatOrchestrator
+from app.services.conversation_store import (
+    Conversation,
+    ConversationStore,
+    LocalConversationBackend,
+    conversation_key,
+)
+from app.services.prompt_layout import SUMMARY_PREAMBLE
+from tests.conftest import make_settings
+
+
+def make_hit(point_id, user_id="user-1"):
+    return SimpleNamespace(id=point_id, payload={"user_id": user_id, "filename": f"{point_id}.txt", "page_number": 1})
+
+
+def stream_of(*deltas):
+    return iter([SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=d))]) for d in deltas])
+
+
+@pytest.mark.unit
+class TestConversationStore:
+    def test_round_trips_conversations(self):
+        store = ConversationStore(make_settings(), client=LocalConversationBackend())
+        conversation = store.load("user-1", "conv-1")
+        store.append_turn("user-1", conversation, "hi", "hello", ["p1"])
+
+        loaded = store.load("user-1", "conv-1")
+        assert loaded.messages == [ChatMessage(role="user", content="hi"), ChatMessage(role="assistant", content="hello")]
+        assert loaded.last_chunk_ids == ["p1"]
+        assert store.load("user-2", "conv-1").messages == []
+
+    def test_local_backend_expires_entries(self):
+        backend = LocalConversationBackend()
+        backend.set("key", "value", ex=0)
+        assert backend.get("key") is None
+
+    def test_compaction_folds_old_messages_into_summary(self):
+        store = ConversationStore(make_settings(conversation_max_messages=4), client=LocalConversationBackend())
+        conversation = Conversation(conversation_id="conv-1", summary="earlier")
+        for turn in range(3):
+            store.append_turn("user-1", conversation, f"q{turn}", f"a{turn}", [])
+        summarize = MagicMock(return_value="merged summary")
+
+        store.compact("user-1", "conv-1", summarize)
+
+        stored = store.load("user-1", "conv-1")
+        assert [message.content for message in stored.messages] == ["q2", "a2"]
+        summarize.assert_called_once()
+        assert summarize.call_args.args[0] == "earlier"
+        assert [message.content for message in summarize.call_args.args[1]] == ["q0", "a0", "q1", "a1"]
+        assert stored.summary == "merged summary"
+
+    def test_compaction_keeps_a_turn_stored_while_summarizing(self):
+        store = ConversationStore(make_settings(conversation_max_messages=4), client=LocalConversationBackend())
+        conversation = Conversation(conversation_id="conv-1")
+        for turn in range(3):
+            store.append_turn("user-1", conversation, f"q{turn}", f"a{turn}", [])
+
+        def summarize(summary, messages):
+            store.append_turn("user-1", store.load("user-1", "conv-1"), "q3", "a3", [])
+            return "merged summary"
+
+        store.compact("user-1", "conv-1", summarize)
+
+        stored = store.load("user-1", "conv-1")
+        assert [message.content for message in stored.messages] == ["q2", "a2", "q3", "a3"]
+        assert stored.summary == "merged summary"
+
+    def test_compaction_is_a_no_op_under_the_limit(self):
+        store = ConversationStore(make_settings(conversation_max_messages=4), client=LocalConversationBackend())
+        store.append_turn("user-1", Conversation(conversation_id="conv-1"), "q0", "a0", [])
+        summarize = MagicMock()
+        store.compact("user-1", "conv-1", summarize)
+        summarize.assert_not_called()
+
+    def test_redis_errors_fail_open(self):
+        client = MagicMock()
+        client.get.side_effect = redis.ConnectionError("down")
+        client.set.side_effect = redis.ConnectionError("down")
+        store = ConversationStore(make_settings(conversation_store_backend="redis"), client=client)
+        conversation = store.load("user-1", "conv-1")
+        assert conversation.messages == []
+        store.save("user-1", conversation)
+
+    def test_redis_entries_expire_with_ttl(self):
+        client = MagicMock()
+        store = ConversationStore(make_settings(conversation_ttl_seconds=60), client=client)
+        store.save("user-1", Conversation(conversation_id="conv-1"))
+        assert client.set.call_args.args[0] == conversation_key("user-1", "conv-1")
+        assert client.set.call_args.kwargs["ex"] == 60
+
+
+@pytest.mark.unit
+class TestConversationTurns:
+    def make_orchestrator(self):
+        orchestrator = ChatOrchestrator(settings=make_settings(conversation_store_backend="memory"), qdrant_client=MagicMock())
+        orchestrator.conversations = ConversationStore(orchestrator.settings, client=LocalConversationBackend())
+        orchestrator.llm.remote.client = MagicMock()
+        return orchestrator
+
+    def test_follow_up_turn_uses_stored_history_and_previous_chunks(self):
+        orchestrator = self.make_orchestrator()
+        orchestrator.llm.remote.client.chat.completions.create.side_effect = [stream_of("A", "1"), stream_of("A2")]
+        orchestrator.qdrant_client.retrieve.return_value = [make_hit("p1"), make_hit("leak", user_id="user-2")]
+
+        with patch.object(orchestrator, "retrieve_hits_batch", side_effect=[[[make_hit("p1")]], [[make_hit("p2")]]]):
+            list(orchestrator.stream_deltas(ChatRequest(message="q1", conversation_id="conv-1"), "user-1"))
+            list(orchestrator.stream_deltas(ChatRequest(message="q2", conversation_id="conv-1"), "user-1"))
+
+        messages = orchestrator.llm.remote.client.chat.completions.create.call_args.kwargs["messages"]
+        assert messages[1:3] == [{"role": "user", "content": "q1"}, {"role": "assistant", "content": "A1"}]
+        assert "p2.txt" in messages[3]["content"] and "p1.txt" in messages[3]["content"]
+        assert "leak.txt" not in messages[3]["content"]
+        assert orchestrator.qdrant_client.retrieve.call_args.kwargs["ids"] == ["p1"]
+        stored = orchestrator.conversations.load("user-1", "conv-1")
+        assert len(stored.messages) == 4
+        assert stored.last_chunk_ids == ["p2"]
+
+    def test_carried_chunks_do_not_accumulate_across_turns(self):
+        orchestrator = self.make_orchestrator()
+        orchestrator.llm.remote.client.chat.completions.create.side_effect = lambda **_: stream_of("ok")
+        orchestrator.qdrant_client.retrieve.side_effect = lambda **kwargs: [make_hit(i) for i in kwargs["ids"]]
+        turns = [[[make_hit(f"t{turn}-{i}") for i in range(3)]] for turn in range(5)]
+
+        with patch.object(orchestrator, "retrieve_hits_batch", side_effect=turns):
+            for turn in range(5):
+                request = ChatRequest(message=f"q{turn}", conversation_id="conv-4")
+                list(orchestrator.stream_deltas(request, "user-1"))
+                stored = orchestrator.conversations.load("user-1", "conv-4")
+                assert stored.last_chunk_ids == [f"t{turn}-{i}" for i in range(3)]
+
+        assert orchestrator.qdrant_client.retrieve.call_args.kwargs["ids"] == ["t3-0", "t3-1", "t3-2"]
+
+    def test_turn_does_not_summarize_on_the_response_path(self):
+        orchestrator = self.make_orchestrator()
+        orchestrator.settings.conversation_max_messages = 4
+        orchestrator.llm.remote.client.chat.completions.create.return_value = stream_of("ok")
+        history = [ChatMessage(role="user", content=f"m{i}") for i in range(6)]
+        request = ChatRequest(message="q", conversation_id="conv-5", history=history)
+
+        with (
+            patch.object(orchestrator, "retrieve_hits_batch", return_value=[[]]),
+            patch.object(orchestrator, "summarize_conversation", return_value="summary") as summarize,
+        ):
+            list(orchestrator.stream_deltas(request, "user-1"))
+            summarize.assert_not_called()
+            orchestrator.compact_conversation("user-1", "conv-5")
+
+        summarize.assert_called_once()
+        stored = orchestrator.conversations.load("user-1", "conv-5")
+        assert (stored.summary, len(stored.messages)) == ("summary", 2)
+
+    def test_client_history_seeds_a_new_conversation(self):
+        orchestrator = self.make_orchestrator()
+        orchestrator.llm.remote.client.chat.completions.create.return_value = stream_of("ok")
+        request = ChatRequest(
+            message="q2",
+            conversation_id="conv-2",
+            history=[ChatMessage(role="user", content="q1"), ChatMessage(role="assistant", content="a1")],
+        )
+        with patch.object(orchestrator, "retrieve_hits_batch", return_value=[[]]):
+            list(orchestrator.stream_deltas(request, "user-1"))
+        assert [m.content for m in orchestrator.conversations.load("user-1", "conv-2").messages] == [
+            "q1",
+            "a1",
+            "q2",
+            "ok",
+        ]
+
+    def test_summary_is_placed_after_the_persona_prompt(self):
+        orchestrator = self.make_orchestrator()
+        orchestrator.conversations.save(
+            "user-1", Conversation(conversation_id="conv-3", summary="User asked about HNSW.")
+        )
+        orchestrator.llm.remote.client.chat.completions.create.return_value = stream_of("ok")
+        with patch.object(orchestrator, "retrieve_hits_batch", return_value=[[]]):
+            list(orchestrator.stream_deltas(ChatRequest(message="and m?", conversation_id="conv-3"), "user-1"))
+        messages = orchestrator.llm.remote.client.chat.completions.create.call_args.kwargs["messages"]
+        assert messages[1] == {"role": "system", "content": f"{SUMMARY_PREAMBLE}User asked about HNSW."}
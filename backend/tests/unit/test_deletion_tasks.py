@@ -0,0 +1,57 @@
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.vector_store import TenantRoute, delete_document_vectors
+from app.workers.deletion_tasks import delete_documents_task, iter_batches
+
+
+@pytest.mark.unit
+class TestIterBatches:
+    def test_splits_items_into_fixed_size_batches(self):
+        assert list(iter_batches([1, 2, 3, 4, 5], 2)) == [[1, 2], [3, 4], [5]]
+
+    def test_returns_nothing_for_empty_list(self):
+        assert list(iter_batches([], 10)) == []
+
+
+@pytest.mark.unit
+class TestDeleteDocumentVectors:
+    def test_deletes_points_filtered_by_user_and_doc_ids(self):
+        client = MagicMock()
+        client.collection_exists.return_value = True
+        delete_document_vectors(client, TenantRoute("documents"), "user-1", ["doc-a", "doc-b"])
+        client.delete.assert_called_once()
+        selector = client.delete.call_args.kwargs["points_selector"]
+        conditions = {c.key: c.match for c in selector.filter.must}
+        assert conditions["user_id"].value == "user-1"
+        assert conditions["doc_id"].any == ["doc-a", "doc-b"]
+
+    def test_skips_when_collection_missing(self):
+        client = MagicMock()
+        client.collection_exists.return_value = False
+        delete_document_vectors(client, TenantRoute("documents"), "user-1", ["doc-a"])
+        client.delete.assert_not_called()
+
+
+@pytest.mark.unit
+class TestDeleteDocumentsTask:
+    def test_marks_documents_deleted_before_removing_vectors(self):
+        document = SimpleNamespace(id=uuid.uuid4(), storage_path="/tmp/doc.txt")
+        calls = MagicMock()
+        with (
+            patch("app.workers.deletion_tasks.get_user_documents", new_callable=AsyncMock, return_value=[document]),
+            patch("app.workers.deletion_tasks.mark_documents_deleted", new_callable=AsyncMock) as mock_mark,
+            patch("app.workers.deletion_tasks.delete_document_vectors") as mock_delete,
+            patch("app.workers.deletion_tasks.build_qdrant_client"),
+            patch("app.workers.deletion_tasks.TenantRouter"),
+            patch("app.workers.deletion_tasks.StorageService"),
+            patch.object(delete_documents_task, "update_state"),
+        ):
+            calls.attach_mock(mock_mark, "mark")
+            calls.attach_mock(mock_delete, "delete_vectors")
+            result = delete_documents_task.run([str(document.id)], "user-1")
+        assert [name for name, _, _ in calls.mock_calls] == ["mark", "delete_vectors"]
+        assert result["document_ids"] == [str(document.id)]
@@ -0,0 +1,95 @@
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+from qdrant_client.http import models as qmodels
+
+from app.models.schemas import ChatConfig
+from app.services.chat import ChatOrchestrator
+from app.utils.diversity import filter_near_duplicates, jaccard, mmr_select, shingle_hashes
+from tests.conftest import make_settings
+
+
+def make_hit(index: int, text: str, vector=None, score: float = 1.0) -> qmodels.ScoredPoint:
+    return qmodels.ScoredPoint(
+        id=index,
+        version=0,
+        score=score,
+        payload={"filename": "doc.txt", "page_number": 1, "chunk_index": index, "text": text},
+        vector=vector,
+    )
+
+
+LONG_TEXT = "the quick brown fox jumps over the lazy dog near the quiet river bank today"
+
+
+@pytest.mark.unit
+class TestNearDuplicateFilter:
+    def test_identical_text_has_full_overlap(self):
+        assert jaccard(shingle_hashes(LONG_TEXT), shingle_hashes(LONG_TEXT.upper())) == 1.0
+
+    def test_drops_near_duplicates_and_keeps_distinct_chunks(self):
+        texts = [LONG_TEXT, LONG_TEXT + " again", "completely different content about vector databases and search"]
+        assert filter_near_duplicates(texts, threshold=0.8) == [0, 2]
+
+    def test_empty_texts_are_never_treated_as_duplicates(self):
+        assert filter_near_duplicates(["", ""], threshold=0.5) == [0, 1]
+
+
+@pytest.mark.unit
+class TestMmrSelect:
+    def test_prefers_diverse_candidates_over_redundant_ones(self):
+        query = np.array([1.0, 0.0], dtype=np.float32)
+        candidates = np.array([[1.0, 0.0], [0.99, 0.141], [0.6, 0.8]], dtype=np.float32)
+        assert mmr_select(query, candidates, k=2, lambda_mult=0.3) == [0, 2]
+
+    def test_pure_relevance_keeps_similarity_order(self):
+        query = np.array([1.0, 0.0], dtype=np.float32)
+        candidates = np.array([[1.0, 0.0], [0.99, 0.141], [0.6, 0.8]], dtype=np.float32)
+        assert mmr_select(query, candidates, k=3, lambda_mult=1.0) == [0, 1, 2]
+
+
+@pytest.mark.unit
+class TestRetrieveContextDiversity:
+    def make_orchestrator(self, hits):
+        qdrant = MagicMock()
+        qdrant.search_batch.return_value = [hits]
+        orchestrator = ChatOrchestrator(settings=make_settings(use_local_embeddings=True), qdrant_client=qdrant)
+        orchestrator.embedding_service = MagicMock()
+        orchestrator.embedding_service.embed_chunks.return_value = np.array([[1.0, 0.0]], dtype=np.float32)
+        return orchestrator, qdrant
+
+    def test_over_fetches_with_vectors_and_applies_mmr(self):
+        hits = [
+            make_hit(0, LONG_TEXT, [1.0, 0.0]),
+            make_hit(1, "another chunk about something else entirely here", [0.99, 0.141]),
+            make_hit(2, "a third chunk covering a different topic in depth", [0.6, 0.8]),
+        ]
+        orchestrator, qdrant = self.make_orchestrator(hits)
+        config = ChatConfig(use_mmr=True, mmr_lambda=0.3, top_k=2, fetch_k=10)
+
+        context = orchestrator.retrieve_context("user-1", "query", config)
+
+        request = qdrant.search_batch.call_args.kwargs["requests"][0]
+        assert request.limit == 10
+        assert request.with_vector is True
+        assert context.splitlines() == ["File: doc.txt, page: 1, chunk: 0", "File: doc.txt, page: 1, chunk: 2"]
+
+    def test_drops_near_duplicate_hits_without_vectors(self):
+        hits = [make_hit(0, LONG_TEXT), make_hit(1, LONG_TEXT), make_hit(2, "unrelated text about qdrant payload indexes")]
+        orchestrator, qdrant = self.make_orchestrator(hits)
+
+        context = orchestrator.retrieve_context("user-1", "query", ChatConfig(dedup_threshold=0.9))
+
+        assert qdrant.search_batch.call_args.kwargs["requests"][0].with_vector is False
+        assert [line.split("chunk: ")[1] for line in context.splitlines()] == ["0", "2"]
+
+    def test_default_config_keeps_plain_top_k_search(self):
+        orchestrator, qdrant = self.make_orchestrator([make_hit(0, LONG_TEXT), make_hit(1, LONG_TEXT)])
+
+        context = orchestrator.retrieve_context("user-1", "query", ChatConfig(top_k=5))
+
+        request = qdrant.search_batch.call_args.kwargs["requests"][0]
+        assert request.limit == 5
+        assert request.with_vector is False
+        assert len(context.splitlines()) == 2
@@ -0,0 +1,140 @@
+import base64
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import httpx
+import numpy as np
+import openai
+import pytest
+import redis
+
+from app.services.embeddings import EmbeddingService
+from app.services.rate_limiter import AdaptiveConcurrencyLimiter, RedisTokenBucket, estimate_tokens
+from tests.conftest import make_settings
+
+
+def make_rate_limit_error(retry_after: str | None = None) -> openai.RateLimitError:
+    request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+    headers = {"retry-after": retry_after} if retry_after else {}
+    response = httpx.Response(429, request=request, headers=headers)
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+def embedding_response(inputs):
+    return SimpleNamespace(data=[SimpleNamespace(embedding=[float(len(text))]) for text in inputs])
+
+
+@pytest.fixture
+def service():
+    embedding_service = EmbeddingService(make_settings(embedding_batch_size=2, embedding_retry_base_seconds=0.0))
+    embedding_service.rate_limiter = MagicMock()
+    embedding_service.concurrency = AdaptiveConcurrencyLimiter(initial=4, maximum=8)
+    embedding_service.client = MagicMock()
+    return embedding_service
+
+
+@pytest.mark.unit
+class TestEmbeddingService:
+    def test_splits_inputs_into_batches_and_keeps_order(self, service):
+        service.client.embeddings.create.side_effect = lambda model, input, **kwargs: embedding_response(input)
+        vectors = service.embed_chunks(["a", "bb", "ccc", "dddd", "eeeee"])
+        assert vectors.dtype == np.float32
+        assert vectors.tolist() == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert service.client.embeddings.create.call_count == 3
+        assert service.rate_limiter.acquire.call_count == 3
+
+    def test_retries_only_the_throttled_batch(self, service):
+        calls = []
+
+        def create(model, input, **kwargs):
+            calls.append(list(input))
+            if input == ["ccc"] and calls.count(["ccc"]) == 1:
+                raise make_rate_limit_error(retry_after="0")
+            return embedding_response(input)
+
+        service.client.embeddings.create.side_effect = create
+        with patch("app.services.embeddings.time.sleep") as mock_sleep:
+            vectors = service.embed_chunks(["a", "bb", "ccc"])
+        assert vectors.tolist() == [[1.0], [2.0], [3.0]]
+        assert calls.count(["a", "bb"]) == 1
+        assert calls.count(["ccc"]) == 2
+        mock_sleep.assert_called_once()
+
+    def test_gives_up_after_max_retries(self, service):
+        service.settings.embedding_max_retries = 2
+        service.client.embeddings.create.side_effect = make_rate_limit_error()
+        with patch("app.services.embeddings.time.sleep"), pytest.raises(openai.RateLimitError):
+            service.embed_chunks(["a"])
+        assert service.client.embeddings.create.call_count == 3
+        assert service.concurrency.in_flight == 0
+
+    def test_requests_reduced_dimensions_and_truncates_longer_vectors(self, service):
+        service.dimensions = 2
+        service.client.embeddings.create.return_value = SimpleNamespace(
+            data=[SimpleNamespace(embedding=[3.0, 4.0, 12.0])]
+        )
+        vectors = service.embed_chunks(["a"])
+        assert service.client.embeddings.create.call_args.kwargs["dimensions"] == 2
+        np.testing.assert_allclose(vectors, [[0.6, 0.8]], rtol=1e-6)
+
+    def test_decodes_base64_embeddings_into_one_matrix(self, service):
+        encoded = [base64.b64encode(np.array(row, dtype="<f4").tobytes()).decode() for row in ([1, 2], [3, 4])]
+        service.client.embeddings.create.return_value = SimpleNamespace(
+            data=[SimpleNamespace(embedding=data) for data in encoded]
+        )
+        vectors = service.embed_chunks(["a", "b"])
+        assert service.client.embeddings.create.call_args.kwargs["encoding_format"] == "base64"
+        assert vectors.flags["C_CONTIGUOUS"]
+        assert vectors.tolist() == [[1.0, 2.0], [3.0, 4.0]]
+
+    def test_empty_input_returns_empty_matrix(self, service):
+        assert service.embed_chunks([]).shape[0] == 0
+        service.client.embeddings.create.assert_not_called()
+
+
+@pytest.mark.unit
+class TestAdaptiveConcurrencyLimiter:
+    def test_halves_on_throttle_and_grows_additively(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=8, maximum=8)
+        limiter.acquire()
+        limiter.release(throttled=True)
+        assert limiter.limit == 4
+        for _ in range(5):
+            limiter.acquire()
+            limiter.release()
+        assert int(limiter.limit) == 5
+
+    def test_never_drops_below_one(self):
+        limiter = AdaptiveConcurrencyLimiter(initial=1, maximum=4)
+        limiter.acquire()
+        limiter.release(throttled=True)
+        assert limiter.limit == 1
+
+
+@pytest.mark.unit
+class TestRedisTokenBucket:
+    def test_reserve_converts_wait_to_seconds(self):
+        client = MagicMock()
+        client.eval.return_value = 1500
+        bucket = RedisTokenBucket("embeddings", 60, 1000, client=client)
+        assert bucket.reserve(10) == 1.5
+        args = client.eval.call_args.args
+        assert args[2:4] == ("ratelimit:embeddings:requests", "ratelimit:embeddings:tokens")
+        assert args[5:9] == (60, 1000, 1, 10)
+
+    def test_acquire_sleeps_until_granted(self):
+        client = MagicMock()
+        client.eval.side_effect = [200, 0]
+        bucket = RedisTokenBucket("embeddings", 60, 1000, client=client)
+        with patch("app.services.rate_limiter.time.sleep") as mock_sleep:
+            bucket.acquire(10)
+        mock_sleep.assert_called_once_with(0.2)
+
+    def test_fails_open_when_redis_is_unavailable(self):
+        client = MagicMock()
+        client.eval.side_effect = redis.ConnectionError("down")
+        assert RedisTokenBucket("embeddings", 60, 1000, client=client).reserve(10) == 0.0
+
+    def test_estimate_tokens_is_at_least_one(self):
+        assert estimate_tokens("") == 1
+        assert estimate_tokens("a" * 400) == 100
@@ -0,0 +1,76 @@
+import pytest
+
+from app.utils.extraction_artifacts import (
+    ExtractionArtifact,
+    artifact_path,
+    delete_extraction_artifacts,
+    write_artifact,
+)
+
+
+PAGES = [(1, "First page text. " * 50), (3, "Third page, ünïcode ✓"), (4, "")]
+
+
+@pytest.mark.unit
+class TestExtractionArtifacts:
+    def test_round_trips_pages_with_page_numbers(self, tmp_path):
+        path = artifact_path(tmp_path / "doc.pdf", 2)
+        write_artifact(path, PAGES, extractor_version=2)
+        with ExtractionArtifact(path) as artifact:
+            assert artifact.extractor_version == 2
+            assert len(artifact) == 3
+            assert list(artifact) == PAGES
+
+    def test_pages_are_readable_individually(self, tmp_path):
+        path = artifact_path(tmp_path / "doc.pdf", 1)
+        write_artifact(path, PAGES, extractor_version=1)
+        with ExtractionArtifact(path) as artifact:
+            assert artifact.page(1) == PAGES[1]
+
+    def test_artifact_is_compressed(self, tmp_path):
+        path = artifact_path(tmp_path / "doc.pdf", 1)
+        write_artifact(path, PAGES, extractor_version=1)
+        assert path.stat().st_size < len(PAGES[0][1]) / 4
+
+    @pytest.mark.parametrize("content", [b"RAGX", b"not an artifact at all"])
+    def test_rejects_truncated_or_foreign_files(self, tmp_path, content):
+        path = tmp_path / "doc.pdf.pages-v1.bin"
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            ExtractionArtifact(path)
+
+    def test_delete_removes_every_version_except_kept(self, tmp_path):
+        source = tmp_path / "doc.pdf"
+        old, current = artifact_path(source, 1), artifact_path(source, 2)
+        for path in (old, current):
+            write_artifact(path, PAGES, extractor_version=1)
+        (tmp_path / "other.pdf.pages-v1.bin").write_bytes(b"")
+
+        assert delete_extraction_artifacts(source, keep=current) == 1
+        assert not old.exists() and current.exists()
+        assert (tmp_path / "other.pdf.pages-v1.bin").exists()
+
+    def test_rejects_artifacts_truncated_inside_a_page_block(self, tmp_path):
+        path = artifact_path(tmp_path / "doc.pdf", 1)
+        write_artifact(path, PAGES, extractor_version=1)
+        path.write_bytes(path.read_bytes()[:-10])
+        with pytest.raises(ValueError):
+            ExtractionArtifact(path)
+
+    def test_corrupt_page_blocks_raise_value_error(self, tmp_path):
+        path = artifact_path(tmp_path / "doc.pdf", 1)
+        write_artifact(path, PAGES, extractor_version=1)
+        with ExtractionArtifact(path) as artifact:
+            _, offset, length = artifact.index[0]
+        data = bytearray(path.read_bytes())
+        data[offset : offset + length] = b"\xff" * length
+        path.write_bytes(bytes(data))
+        with ExtractionArtifact(path) as artifact, pytest.raises(ValueError):
+            artifact.page(0)
+
+    @pytest.mark.parametrize("name", ["report[1].pdf", "what?.pdf", "a*b.pdf"])
+    def test_delete_handles_glob_characters_in_filenames(self, tmp_path, name):
+        source = tmp_path / name
+        write_artifact(artifact_path(source, 1), PAGES, extractor_version=1)
+        assert delete_extraction_artifacts(source) == 1
+        assert list(tmp_path.iterdir()) == []
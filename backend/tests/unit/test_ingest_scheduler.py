@@ -0,0 +1,108 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+from celery.exceptions import Retry
+from pydantic import ValidationError
+
+from app.services.ingest_scheduler import IngestionScheduler, queue_wait_key, tenant_slots_key
+from app.workers.ingestion_tasks import admit_or_defer
+from tests.conftest import make_settings
+
+
+@pytest.mark.unit
+class TestIngestionScheduler:
+    def test_bulk_lane_has_lower_priority_than_interactive(self):
+        scheduler = IngestionScheduler(make_settings(), client=MagicMock())
+        assert scheduler.lane_priority("interactive") == 0
+        assert scheduler.lane_priority("bulk") == 6
+
+    def test_tenant_capacity_scales_with_weight(self):
+        settings = make_settings(ingest_tenant_max_concurrency=4, INGEST_TENANT_WEIGHTS="big=2.5,small=0.1")
+        scheduler = IngestionScheduler(settings, client=MagicMock())
+        assert scheduler.tenant_capacity("big") == 10
+        assert scheduler.tenant_capacity("small") == 1
+        assert scheduler.tenant_capacity("other") == 4
+
+    @pytest.mark.parametrize("raw", ["big", "big=fast", "big=0", "=2"])
+    def test_malformed_tenant_weights_fail_settings_validation(self, raw):
+        with pytest.raises(ValidationError, match="INGEST_TENANT_WEIGHTS"):
+            make_settings(INGEST_TENANT_WEIGHTS=raw)
+
+    def test_try_acquire_leases_a_slot_for_the_tracking_id(self):
+        client = MagicMock()
+        client.eval.return_value = 0
+        scheduler = IngestionScheduler(make_settings(), client=client)
+        assert scheduler.try_acquire("user-1", "task-1") is False
+        args = client.eval.call_args.args
+        assert args[1:3] == (1, tenant_slots_key("user-1"))
+        assert args[5:] == ("task-1", 4)
+
+    def test_try_acquire_admits_when_redis_is_unavailable(self):
+        client = MagicMock()
+        client.eval.side_effect = redis.ConnectionError("down")
+        scheduler = IngestionScheduler(make_settings(), client=client)
+        assert scheduler.try_acquire("user-1", "task-1") is True
+
+    def test_release_removes_the_lease(self):
+        client = MagicMock()
+        IngestionScheduler(make_settings(), client=client).release("user-1", "task-1")
+        client.zrem.assert_called_once_with(tenant_slots_key("user-1"), "task-1")
+
+    def test_record_queue_wait_updates_lane_stats(self):
+        client = MagicMock()
+        scheduler = IngestionScheduler(make_settings(), client=client)
+        scheduler.record_queue_wait("user-1", "bulk", None)
+        client.pipeline.assert_not_called()
+        with patch("app.services.ingest_scheduler.time.time", return_value=110.0):
+            scheduler.record_queue_wait("user-1", "bulk", 100.0)
+        pipeline = client.pipeline.return_value
+        eval_args = pipeline.eval.call_args.args
+        assert eval_args[2:] == (queue_wait_key("user-1", "bulk"), 10.0)
+        pipeline.sadd.assert_called_once()
+
+
+@pytest.mark.unit
+class TestAdmission:
+    def test_defers_task_when_tenant_is_at_capacity(self):
+        task = MagicMock()
+        task.request.id = "task-1"
+        task.request.retries = 3
+        task.retry.return_value = Retry()
+        with (
+            patch("app.workers.ingestion_tasks.IngestionScheduler") as mock_scheduler,
+            patch("app.workers.ingestion_tasks.publish_progress") as mock_publish,
+        ):
+            mock_scheduler.return_value.try_acquire.return_value = False
+            mock_scheduler.return_value.settings = make_settings()
+            mock_scheduler.return_value.defer_seconds.return_value = 7.0
+            with pytest.raises(Retry):
+                admit_or_defer(task, "user-1", "bulk", 100.0)
+        task.retry.assert_called_once_with(countdown=7.0, max_retries=None)
+        assert mock_publish.call_args.args[1].step == "waiting_for_capacity"
+        mock_scheduler.return_value.record_queue_wait.assert_not_called()
+
+    def test_fails_task_after_the_max_deferrals(self):
+        task = MagicMock()
+        task.request.id = "task-1"
+        task.request.retries = 2
+        with (
+            patch("app.workers.ingestion_tasks.IngestionScheduler") as mock_scheduler,
+            patch("app.workers.ingestion_tasks.publish_progress") as mock_publish,
+        ):
+            mock_scheduler.return_value.try_acquire.return_value = False
+            mock_scheduler.return_value.settings = make_settings(ingest_max_deferrals=2)
+            with pytest.raises(RuntimeError, match="after 2 deferrals"):
+                admit_or_defer(task, "user-1", "bulk", 100.0)
+        task.retry.assert_not_called()
+        assert task.update_state.call_args.kwargs["state"] == "FAILURE"
+        assert mock_publish.call_args.args[1].status == "failed"
+
+    def test_admitted_task_records_queue_wait(self):
+        task = MagicMock()
+        task.request.id = "task-1"
+        with patch("app.workers.ingestion_tasks.IngestionScheduler") as mock_scheduler:
+            mock_scheduler.return_value.try_acquire.return_value = True
+            admit_or_defer(task, "user-1", "interactive", 100.0)
+        mock_scheduler.return_value.record_queue_wait.assert_called_once_with("user-1", "interactive", 100.0)
+        task.retry.assert_not_called()
@@ -0,0 +1,298 @@
+import uuid
+from unittest.mock import AsyncMock, patch
+
+import numpy as np
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import Document
+from app.services.profiling import ProfileStore
+from app.utils.extraction_artifacts import ExtractionArtifact, artifact_path, write_artifact
+from app.utils.text_extraction import EXTRACTOR_VERSION
+from app.utils.vectors import decode_vectors, encode_vectors
+from app.workers.celery_app import celery_app
+from app.workers.ingestion_tasks import (
+    IngestionStageTask,
+    build_ingestion_pipeline,
+    document_status_update,
+    embed_document_task,
+    extract_document_task,
+    index_document_task,
+    reindex_documents_task,
+    update_documents_status,
+)
+
+
+def make_document(file_path="/tmp/doc.txt", **overrides):
+    document = {
+        "document_id": str(uuid.uuid4()),
+        "file_path": file_path,
+        "filename": "doc.txt",
+        "mime_type": "text/plain",
+    }
+    document.update(overrides)
+    return document
+
+
+def make_job(*documents):
+    return {
+        "tracking_id": "tracking-id",
+        "user_id": "user-1",
+        "documents": list(documents) or [make_document()],
+    }
+
+
+@pytest.fixture(autouse=True)
+def mock_publish_progress():
+    with patch("app.workers.ingestion_tasks.publish_progress") as mock:
+        yield mock
+
+
+@pytest.fixture(autouse=True)
+def mock_scheduler():
+    with patch("app.workers.ingestion_tasks.IngestionScheduler") as mock:
+        yield mock.return_value
+
+
+@pytest.fixture
+def mock_update_state():
+    with patch.object(IngestionStageTask, "update_state") as mock:
+        yield mock
+
+
+@pytest.mark.unit
+class TestIngestionPipeline:
+    def test_pipeline_chains_stages_in_order(self):
+        pipeline = build_ingestion_pipeline(make_job())
+        assert [task.task for task in pipeline.tasks] == [
+            "extract_document_task",
+            "embed_document_task",
+            "index_document_task",
+        ]
+
+    def test_pipeline_stages_carry_the_lane_priority(self):
+        job = make_job()
+        job["priority"] = 6
+        pipeline = build_ingestion_pipeline(job)
+        assert [task.options["priority"] for task in pipeline.tasks] == [6, 6, 6]
+
+    def test_stages_are_routed_to_dedicated_queues(self):
+        routes = celery_app.conf.task_routes
+        assert routes["extract_document_task"]["queue"] == "cpu_extract"
+        assert routes["embed_document_task"]["queue"] == "embed"
+        assert routes["index_document_task"]["queue"] == "index"
+
+    def test_extract_stage_chunks_pages_and_reports_on_tracking_id(self, tmp_path, mock_update_state):
+        path = tmp_path / "doc.txt"
+        path.write_text("hello world")
+        job = extract_document_task(make_job(make_document(str(path))))
+        assert job["documents"][0]["chunks"] == [(1, 0, "hello world")]
+        assert mock_update_state.call_args.kwargs["task_id"] == "tracking-id"
+
+    def test_extract_stage_drops_failed_documents_from_a_group(self, tmp_path, mock_update_state):
+        good = tmp_path / "good.txt"
+        good.write_text("hello world")
+        empty = tmp_path / "empty.txt"
+        empty.write_text("   ")
+        bad_document = make_document(str(empty))
+        with patch("app.workers.ingestion_tasks.update_document_status", new_callable=AsyncMock) as mock_status:
+            job = extract_document_task(make_job(make_document(str(good)), bad_document))
+        assert [d["file_path"] for d in job["documents"]] == [str(good)]
+        mock_status.assert_awaited_once()
+        assert mock_status.await_args.args[:2] == (uuid.UUID(bad_document["document_id"]), "failed")
+
+    def test_extract_stage_raises_for_single_empty_document(self, tmp_path, mock_update_state):
+        empty = tmp_path / "empty.txt"
+        empty.write_text("")
+        with pytest.raises(ValueError):
+            extract_document_task(make_job(make_document(str(empty))))
+
+    def test_extract_stage_persists_pages_and_reuses_them(self, tmp_path, mock_update_state):
+        path = tmp_path / "doc.txt"
+        path.write_text("hello world")
+        extract_document_task(make_job(make_document(str(path))))
+        assert artifact_path(path, EXTRACTOR_VERSION).exists()
+
+        with patch("app.workers.ingestion_tasks.extract_pages_by_mime") as mock_extract:
+            job = extract_document_task(make_job(make_document(str(path))))
+        mock_extract.assert_not_called()
+        assert job["documents"][0]["chunks"] == [(1, 0, "hello world")]
+
+    def test_extract_stage_replaces_unreadable_artifacts(self, tmp_path, mock_update_state):
+        path = tmp_path / "doc.txt"
+        path.write_text("hello world")
+        artifact_path(path, EXTRACTOR_VERSION).write_bytes(b"garbage")
+        job = extract_document_task(make_job(make_document(str(path))))
+        assert job["documents"][0]["chunks"] == [(1, 0, "hello world")]
+        with ExtractionArtifact(artifact_path(path, EXTRACTOR_VERSION)) as artifact:
+            assert list(artifact) == [(1, "hello world")]
+
+    def test_extract_stage_replaces_artifacts_with_corrupt_pages(self, tmp_path, mock_update_state):
+        path = tmp_path / "doc.txt"
+        path.write_text("hello world")
+        artifact = artifact_path(path, EXTRACTOR_VERSION)
+        write_artifact(artifact, [(1, "stale text")], EXTRACTOR_VERSION)
+        data = artifact.read_bytes()
+        artifact.write_bytes(data[:-4] + b"\x00" * 4)
+        job = extract_document_task(make_job(make_document(str(path))))
+        assert job["documents"][0]["chunks"] == [(1, 0, "hello world")]
+
+    def test_extract_stage_records_a_profile_when_requested(self, tmp_path, mock_update_state):
+        path = tmp_path / "doc.txt"
+        path.write_text("hello world")
+        job = make_job(make_document(str(path)))
+        job["profile_id"] = "a" * 32
+        with patch("app.workers.ingestion_tasks.ProfileStore", return_value=ProfileStore(tmp_path / "profiles")):
+            extract_document_task(job)
+        names = {p.name for p in (tmp_path / "profiles" / job["profile_id"]).iterdir()}
+        assert names == {"extract.prof", "extract.txt", "extract.tracemalloc", "extract-memory.txt"}
+
+    def test_embed_stage_uses_one_call_for_all_documents(self, mock_update_state):
+        first = make_document(chunks=[[1, 0, "hello"]])
+        second = make_document(chunks=[[1, 0, "big"], [1, 1, "world"]])
+        with patch("app.workers.ingestion_tasks.EmbeddingService") as mock_service:
+            mock_service.return_value.embed_chunks.return_value = np.array([[0.5], [0.25], [0.125]], dtype=np.float32)
+            job = embed_document_task(make_job(first, second))
+        mock_service.return_value.embed_chunks.assert_called_once_with(["hello", "big", "world"])
+        assert job["dimensions"] == 1
+        assert decode_vectors(job["vectors"], 1).tolist() == [[0.5], [0.25], [0.125]]
+
+    def test_embed_stage_leaves_retries_to_the_embedding_service(self):
+        assert not getattr(embed_document_task, "autoretry_for", ())
+        assert index_document_task.autoretry_for
+
+    def test_index_stage_upserts_points_and_completes_document(self, mock_update_state, mock_scheduler):
+        document = make_document(chunks=[[1, 0, "hello"], [1, 1, "world"]])
+        job = make_job(document)
+        job["dimensions"] = 2
+        job["vectors"] = encode_vectors(np.array([[0.5, 0.25], [0.75, 1.0]]))
+        with (
+            patch("app.workers.ingestion_tasks.build_qdrant_client") as mock_client,
+            patch("app.workers.ingestion_tasks.ensure_qdrant_collection"),
+            patch("app.workers.ingestion_tasks.update_documents_status", new_callable=AsyncMock) as mock_status,
+        ):
+            mock_status.return_value = [uuid.UUID(document["document_id"])]
+            result = index_document_task(job)
+        upload = mock_client.return_value.upload_collection.call_args.kwargs
+        assert upload["vectors"].dtype == np.float32
+        assert upload["vectors"].tolist() == [[0.5, 0.25], [0.75, 1.0]]
+        assert [p["chunk_index"] for p in upload["payload"]] == [0, 1]
+        assert all(p["doc_id"] == document["document_id"] for p in upload["payload"])
+        assert len(set(upload["ids"])) == 2
+        mock_status.assert_awaited_once_with([uuid.UUID(document["document_id"])], "completed")
+        assert result["status"] == "completed"
+        assert result["document_ids"] == [document["document_id"]]
+        mock_client.return_value.delete.assert_not_called()
+        mock_scheduler.release.assert_called_once_with("user-1", "tracking-id")
+
+    def test_index_stage_removes_vectors_of_documents_deleted_meanwhile(self, mock_update_state):
+        kept = make_document(chunks=[[1, 0, "hello"]])
+        deleted = make_document(chunks=[[1, 0, "world"]])
+        job = make_job(kept, deleted)
+        job["dimensions"] = 2
+        job["vectors"] = encode_vectors(np.array([[0.5, 0.25], [0.75, 1.0]]))
+        with (
+            patch("app.workers.ingestion_tasks.build_qdrant_client") as mock_client,
+            patch("app.workers.ingestion_tasks.ensure_qdrant_collection"),
+            patch("app.workers.ingestion_tasks.update_documents_status", new_callable=AsyncMock) as mock_status,
+        ):
+            mock_status.return_value = [uuid.UUID(kept["document_id"])]
+            result = index_document_task(job)
+        selector = mock_client.return_value.delete.call_args.kwargs["points_selector"]
+        assert {c.key: c.match for c in selector.filter.must}["doc_id"].any == [deleted["document_id"]]
+        assert result["document_ids"] == [kept["document_id"]]
+
+    def test_stage_failure_marks_document_and_tracking_id_failed(
+        self, mock_update_state, mock_publish_progress, mock_scheduler
+    ):
+        first, second = make_document(), make_document()
+        job = make_job(first, second)
+        with patch("app.workers.ingestion_tasks.update_documents_status", new_callable=AsyncMock) as mock_status:
+            extract_document_task.on_failure(ValueError("boom"), "stage-id", (job,), {}, None)
+        document_ids = [uuid.UUID(first["document_id"]), uuid.UUID(second["document_id"])]
+        mock_status.assert_awaited_once_with(document_ids, "failed", "boom")
+        kwargs = mock_update_state.call_args.kwargs
+        assert kwargs["task_id"] == "tracking-id"
+        assert kwargs["state"] == "FAILURE"
+        task_id, status = mock_publish_progress.call_args.args
+        assert task_id == "tracking-id"
+        assert status.status == "failed"
+        assert status.error == "boom"
+        mock_scheduler.release.assert_called_once_with("user-1", "tracking-id")
+
+
+@pytest.mark.unit
+class TestReindexDocuments:
+    def start_reindex(self, documents):
+        with (
+            patch("app.workers.ingestion_tasks.admit_or_defer"),
+            patch("app.workers.ingestion_tasks.get_user_documents", new_callable=AsyncMock, return_value=documents),
+            patch("app.workers.ingestion_tasks.update_documents_status", new_callable=AsyncMock) as mock_status,
+            patch("app.workers.ingestion_tasks.start_pipeline", return_value=Exception("replaced")) as mock_start,
+        ):
+            with pytest.raises(Exception, match="replaced"):
+                reindex_documents_task.run([str(document.id) for document in documents], "user-1")
+        return mock_start.call_args.args[1], mock_status
+
+    def test_reindex_reads_pages_from_the_artifact(self, tmp_path, mock_update_state):
+        path = tmp_path / "doc.txt"
+        path.write_text("hello world")
+        extract_document_task(make_job(make_document(str(path))))
+        document = Document(
+            id=uuid.uuid4(), user_id="user-1", filename="doc.txt", mime_type="text/plain", storage_path=str(path)
+        )
+
+        job, mock_status = self.start_reindex([document])
+        with patch("app.workers.ingestion_tasks.extract_pages_by_mime") as mock_extract:
+            job = extract_document_task(job)
+
+        mock_extract.assert_not_called()
+        assert job["reindex"] is True
+        assert job["documents"][0]["document_id"] == str(document.id)
+        assert job["documents"][0]["chunks"] == [(1, 0, "hello world")]
+        mock_status.assert_awaited_once_with([document.id], "processing")
+
+    def test_reindex_fails_when_no_documents_remain(self):
+        with (
+            patch("app.workers.ingestion_tasks.admit_or_defer"),
+            patch("app.workers.ingestion_tasks.get_user_documents", new_callable=AsyncMock, return_value=[]),
+            patch("app.workers.ingestion_tasks.fail_dispatch") as mock_fail,
+        ):
+            with pytest.raises(ValueError):
+                reindex_documents_task.run([str(uuid.uuid4())], "user-1")
+        mock_fail.assert_called_once()
+
+    def test_reindex_removes_points_for_chunks_that_no_longer_exist(self, mock_update_state):
+        document = make_document(chunks=[[1, 0, "hello"]])
+        job = make_job(document)
+        job["reindex"] = True
+        job["dimensions"] = 2
+        job["vectors"] = encode_vectors(np.array([[0.5, 0.25]]))
+        with (
+            patch("app.workers.ingestion_tasks.build_qdrant_client") as mock_client,
+            patch("app.workers.ingestion_tasks.ensure_qdrant_collection"),
+            patch("app.workers.ingestion_tasks.update_documents_status", new_callable=AsyncMock) as mock_status,
+        ):
+            mock_status.return_value = [uuid.UUID(document["document_id"])]
+            index_document_task(job)
+        upload = mock_client.return_value.upload_collection.call_args.kwargs
+        selector = mock_client.return_value.delete.call_args.kwargs["points_selector"]
+        assert selector.filter.must_not[0].has_id == upload["ids"]
+        assert {c.key: c.match for c in selector.filter.must}["doc_id"].any == [document["document_id"]]
+
+
+@pytest.mark.unit
+class TestDocumentStatusUpdate:
+    def test_updates_all_documents_with_one_array_parameter(self):
+        document_ids = [uuid.uuid4() for _ in range(3)]
+        compiled = document_status_update(document_ids, "failed", "boom").compile(dialect=postgresql.dialect())
+        assert "documents.id = ANY (%(document_ids)s::UUID[])" in str(compiled)
+        assert "documents.status != %(status_1)s" in str(compiled)
+        assert compiled.params["status_1"] == "deleted"
+        assert compiled.params["document_ids"] == document_ids
+        assert (compiled.params["status"], compiled.params["error_message"]) == ("failed", "boom")
+
+    async def test_skips_the_round_trip_for_no_documents(self):
+        with patch("app.workers.ingestion_tasks.worker_session") as mock_session:
+            await update_documents_status([], "completed")
+        mock_session.assert_not_called()
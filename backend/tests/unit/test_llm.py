@@ -0,0 +1,160 @@
+import json
+import threading
+from functools import partial
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock
+
+import openai
+import pytest
+
+from app.models.schemas import ChatRequest
+from app.services.chat import ChatOrchestrator
+from app.services.llm import ModelRouter, is_simple_query, openai_compatible_base_url
+from tests.conftest import make_settings
+
+make_local_settings = partial(make_settings, use_local_llm=True, ollama_base_url="http://localhost:11434")
+
+
+class StubCompletionsHandler(BaseHTTPRequestHandler):
+    requests: list = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.requests.append((self.path, body))
+        if not body.get("stream"):
+            return self.send_json(
+                {
+                    "id": "stub",
+                    "object": "chat.completion",
+                    "created": 0,
+                    "model": body["model"],
+                    "choices": [
+                        {
+                            "index": 0,
+                            "message": {"role": "assistant", "content": " local answer "},
+                            "finish_reason": "stop",
+                        }
+                    ],
+                }
+            )
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for content in ("Hel", "lo"):
+            chunk = {
+                "id": "stub",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": body["model"],
+                "choices": [{"index": 0, "delta": {"content": content}, "finish_reason": None}],
+            }
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode())
+        self.wfile.write(b"data: [DONE]\n\n")
+
+    def send_json(self, payload):
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_server():
+    StubCompletionsHandler.requests = []
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubCompletionsHandler)
+    thread = threading.Thread(target=server.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}", StubCompletionsHandler.requests
+    server.shutdown()
+    server.server_close()
+
+
+def make_orchestrator(**overrides) -> ChatOrchestrator:
+    orchestrator = ChatOrchestrator(settings=make_local_settings(**overrides), qdrant_client=MagicMock())
+    orchestrator.retrieve_hits_batch = MagicMock(return_value=[[]])
+    return orchestrator
+
+
+@pytest.mark.unit
+class TestQueryComplexity:
+    @pytest.mark.parametrize("question", ["What is HNSW?", "list the supported file types", "hi"])
+    def test_short_lookups_are_simple(self, question):
+        assert is_simple_query(question, max_words=24)
+
+    @pytest.mark.parametrize(
+        "question",
+        [
+            "Compare HNSW and IVF for our workload",
+            "Why does ingestion stall after the embed stage?",
+            "What is HNSW? And how is it tuned?",
+            "Explain this:\n```\nSELECT 1\n```",
+            " ".join(["word"] * 30),
+        ],
+    )
+    def test_analytical_long_or_multi_part_questions_are_complex(self, question):
+        assert not is_simple_query(question, max_words=24)
+
+    def test_base_url_gets_the_openai_compatible_prefix_once(self):
+        assert openai_compatible_base_url("http://localhost:11434/") == "http://localhost:11434/v1"
+        assert openai_compatible_base_url("http://vllm:8000/v1") == "http://vllm:8000/v1"
+
+
+@pytest.mark.unit
+class TestModelRouter:
+    def test_uses_only_the_remote_model_without_local_llm(self):
+        router = ModelRouter(make_settings())
+        assert router.local is None
+        assert router.route("What is HNSW?") is router.remote
+        assert router.remote.model == "gpt-4o-mini"
+
+    def test_routes_simple_queries_local_and_complex_ones_remote(self):
+        router = ModelRouter(make_local_settings(local_llm_model="qwen2.5:1.5b"))
+        assert router.route("What is HNSW?").model == "qwen2.5:1.5b"
+        assert router.route("Compare HNSW and IVF") is router.remote
+        assert router.fallback(router.local) is router.remote
+        assert router.fallback(router.remote) is None
+
+    def test_sends_everything_local_without_an_openai_key(self):
+        router = ModelRouter(make_local_settings(openai_api_key=None))
+        assert router.remote is None
+        assert router.route("Compare HNSW and IVF") is router.local
+        assert router.default is router.local
+
+
+@pytest.mark.unit
+class TestLocalBackend:
+    def test_simple_query_streams_from_the_local_server(self, stub_server):
+        url, requests = stub_server
+        orchestrator = make_orchestrator(ollama_base_url=url)
+        orchestrator.llm.remote.client = MagicMock()
+
+        deltas = list(orchestrator.stream_deltas(ChatRequest(message="What is HNSW?"), "user-1"))
+
+        assert deltas == ["Hel", "lo"]
+        path, body = requests[0]
+        assert path == "/v1/chat/completions"
+        assert body["model"] == "llama3.2:3b"
+        orchestrator.llm.remote.client.chat.completions.create.assert_not_called()
+
+    def test_completion_uses_the_local_server(self, stub_server):
+        url, requests = stub_server
+        orchestrator = make_orchestrator(ollama_base_url=url)
+        assert orchestrator.answer_with_contexts("What is HNSW?", [], ChatRequest(message="x").config) == "local answer"
+        assert requests[0][1]["stream"] is False
+
+    def test_falls_back_to_the_remote_model_when_the_local_server_is_down(self):
+        orchestrator = make_orchestrator(ollama_base_url="http://127.0.0.1:9")
+        orchestrator.llm.local.client = MagicMock()
+        orchestrator.llm.local.client.chat.completions.create.side_effect = openai.APIConnectionError(
+            request=MagicMock()
+        )
+        orchestrator.llm.remote.client = MagicMock()
+        orchestrator.llm.remote.client.chat.completions.create.return_value = iter([])
+
+        assert list(orchestrator.stream_deltas(ChatRequest(message="What is HNSW?"), "user-1")) == []
+        assert orchestrator.llm.remote.client.chat.completions.create.call_args.kwargs["model"] == "gpt-4o-mini"
@@ -0,0 +1,39 @@
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+
+from app.config import Settings
+from app.services.vector_store import TenantRouter
+from app.workers.migration_tasks import move_tenant_points
+
+
+@pytest.mark.unit
+class TestMoveTenantPoints:
+    def test_moves_points_to_routed_collections_and_removes_source(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_TENANT_ROUTES", "big=big")
+        settings = Settings(
+            database_url="postgresql+asyncpg://localhost/db",
+            qdrant_url="http://localhost:6333",
+            redis_url="redis://localhost:6379",
+            qdrant_multitenancy="collection",
+        )
+        client = QdrantClient(":memory:")
+        client.create_collection(
+            "documents",
+            vectors_config=qmodels.VectorParams(size=2, distance=qmodels.Distance.COSINE),
+        )
+        client.upsert(
+            "documents",
+            points=[
+                qmodels.PointStruct(id=1, vector=[1.0, 0.0], payload={"user_id": "big", "doc_id": "a"}),
+                qmodels.PointStruct(id=2, vector=[0.0, 1.0], payload={"user_id": "small", "doc_id": "b"}),
+            ],
+        )
+        records, _ = client.scroll("documents", with_payload=True, with_vectors=True)
+
+        moved = move_tenant_points(client, TenantRouter(settings), settings, "documents", records, set())
+
+        assert moved == 2
+        assert client.count("documents").count == 0
+        assert client.count("documents_big").count == 1
+        assert client.count("documents_g0").count == 1
@@ -0,0 +1,75 @@
+import pytest
+
+from app.services.profiling import ProfileStore, new_profile_id, profile_block, profile_iterator
+
+
+def build_payload(size: int) -> list:
+    return [str(i) * 10 for i in range(size)]
+
+
+@pytest.mark.unit
+class TestProfileStore:
+    def test_lists_profiles_newest_first_with_their_artifacts(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        first, second = new_profile_id(), new_profile_id()
+        store.write_meta(first, "chat", user_id="user-1", created_at=100.0)
+        store.write_meta(second, "ingest", user_id="user-1", task_id="task-1", created_at=200.0)
+        (tmp_path / second / "extract.txt").write_text("stats")
+
+        profiles = store.list_profiles()
+        assert [p["profile_id"] for p in profiles] == [second, first]
+        assert profiles[0]["task_id"] == "task-1"
+        assert profiles[0]["artifacts"] == ["extract.txt"]
+        assert profiles[1]["artifacts"] == []
+
+    def test_missing_directory_lists_nothing(self, tmp_path):
+        assert ProfileStore(tmp_path / "missing").list_profiles() == []
+
+    def test_artifact_path_rejects_traversal_and_unknown_files(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        profile_id = new_profile_id()
+        store.write_meta(profile_id, "chat")
+        assert store.artifact_path(profile_id, "meta.json") == tmp_path / profile_id / "meta.json"
+        assert store.artifact_path(profile_id, "missing.prof") is None
+        assert store.artifact_path(profile_id, "../meta.json") is None
+        assert store.artifact_path("../" + profile_id, "meta.json") is None
+
+    def test_rejects_malformed_profile_ids(self, tmp_path):
+        with pytest.raises(ValueError):
+            ProfileStore(tmp_path).write_meta("../escape", "chat")
+
+
+@pytest.mark.unit
+class TestProfileCapture:
+    def test_profile_iterator_passes_items_through_and_saves_stats(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        profile_id = new_profile_id()
+        items = list(profile_iterator(iter(build_payload(3)), store, profile_id, "chat"))
+        assert items == build_payload(3)
+        assert (tmp_path / profile_id / "chat.prof").stat().st_size > 0
+        assert "function calls" in (tmp_path / profile_id / "chat.txt").read_text()
+
+    def test_profile_iterator_saves_when_the_consumer_stops_early(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        profile_id = new_profile_id()
+        iterator = profile_iterator(iter(build_payload(3)), store, profile_id, "chat")
+        next(iterator)
+        iterator.close()
+        assert (tmp_path / profile_id / "chat.prof").exists()
+
+    def test_profile_block_records_cpu_and_memory(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        profile_id = new_profile_id()
+        with profile_block(store, profile_id, "embed", frames=5):
+            build_payload(1000)
+        names = {path.name for path in (tmp_path / profile_id).iterdir()}
+        assert names == {"embed.prof", "embed.txt", "embed.tracemalloc", "embed-memory.txt"}
+        assert (tmp_path / profile_id / "embed-memory.txt").read_text().startswith("Peak traced memory")
+
+    def test_profile_block_saves_even_when_the_block_fails(self, tmp_path):
+        store = ProfileStore(tmp_path)
+        profile_id = new_profile_id()
+        with pytest.raises(RuntimeError):
+            with profile_block(store, profile_id, "index", trace_memory=False):
+                raise RuntimeError("boom")
+        assert {path.name for path in (tmp_path / profile_id).iterdir()} == {"index.prof", "index.txt"}
@@ -0,0 +1,107 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+import redis
+
+from app.models.schemas import ChatConfig, ChatMessage, ChatRequest
+from app.services.chat import ChatOrchestrator
+from app.services.prompt_layout import (
+    CONTEXT_PREAMBLE,
+    PROMPT_CACHE_METRICS_KEY,
+    build_chat_messages,
+    record_prompt_usage,
+    usage_counts,
+)
+from tests.conftest import make_settings
+
+
+def make_usage(prompt_tokens, cached_tokens, completion_tokens=10):
+    return SimpleNamespace(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens),
+    )
+
+
+@pytest.mark.unit
+class TestPromptLayout:
+    def test_consecutive_turns_share_system_and_history_prefix(self):
+        history = [ChatMessage(role="user", content="q1"), ChatMessage(role="assistant", content="a1")]
+        second = build_chat_messages("system", history, "q2", context="ctx-2")
+        third = build_chat_messages("system", history + [ChatMessage(role="user", content="q2")], "q3", "ctx-3")
+
+        assert third[:3] == second[:3]
+        assert second[:3] == [
+            {"role": "system", "content": "system"},
+            {"role": "user", "content": "q1"},
+            {"role": "assistant", "content": "a1"},
+        ]
+        assert second[3:] == [
+            {"role": "system", "content": f"{CONTEXT_PREAMBLE}ctx-2"},
+            {"role": "user", "content": "q2"},
+        ]
+
+    def test_context_message_is_omitted_without_context(self):
+        assert build_chat_messages("system", [], "q", context="") == [
+            {"role": "system", "content": "system"},
+            {"role": "user", "content": "q"},
+        ]
+
+    def test_usage_counts_read_cached_tokens(self):
+        assert usage_counts(make_usage(2048, 1024)) == {
+            "prompt_tokens": 2048,
+            "cached_tokens": 1024,
+            "completion_tokens": 10,
+        }
+        assert usage_counts(SimpleNamespace(prompt_tokens=5, completion_tokens=1, prompt_tokens_details=None))[
+            "cached_tokens"
+        ] == 0
+        assert usage_counts(None) is None
+
+    def test_record_prompt_usage_increments_counters(self):
+        client = MagicMock()
+        record_prompt_usage("gpt-4o-mini", {"prompt_tokens": 100, "cached_tokens": 64, "completion_tokens": 5}, client)
+        pipeline = client.pipeline.return_value
+        pipeline.hincrby.assert_any_call(PROMPT_CACHE_METRICS_KEY, "requests", 1)
+        pipeline.hincrby.assert_any_call(PROMPT_CACHE_METRICS_KEY, "cached_tokens", 64)
+        pipeline.execute.assert_called_once()
+
+    def test_record_prompt_usage_fails_open(self):
+        client = MagicMock()
+        client.pipeline.return_value.execute.side_effect = redis.ConnectionError("down")
+        record_prompt_usage("gpt-4o-mini", {"prompt_tokens": 1, "cached_tokens": 0, "completion_tokens": 1}, client)
+
+
+@pytest.mark.unit
+class TestStreamUsage:
+    def test_stream_requests_usage_and_records_cached_tokens(self):
+        orchestrator = ChatOrchestrator(settings=make_settings(), qdrant_client=MagicMock())
+        orchestrator.llm.remote.client = MagicMock()
+        orchestrator.llm.remote.client.chat.completions.create.return_value = iter(
+            [
+                SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Hi"))], usage=None),
+                SimpleNamespace(choices=[], usage=make_usage(3000, 2048)),
+            ]
+        )
+        request = ChatRequest(
+            message="q2",
+            history=[ChatMessage(role="user", content="q1"), ChatMessage(role="assistant", content="a1")],
+            config=ChatConfig(),
+        )
+        with (
+            patch.object(
+                orchestrator,
+                "retrieve_hits_batch",
+                return_value=[[SimpleNamespace(id="p1", payload={"filename": "a.txt", "page_number": 1})]],
+            ),
+            patch("app.services.chat.record_prompt_usage") as mock_record,
+        ):
+            assert list(orchestrator.stream_deltas(request, "user-1")) == ["Hi"]
+
+        kwargs = orchestrator.llm.remote.client.chat.completions.create.call_args.kwargs
+        assert kwargs["stream_options"] == {"include_usage": True}
+        assert [message["role"] for message in kwargs["messages"]] == ["system", "user", "assistant", "system", "user"]
+        mock_record.assert_called_once_with(
+            "gpt-4o-mini", {"prompt_tokens": 3000, "cached_tokens": 2048, "completion_tokens": 10}
+        )
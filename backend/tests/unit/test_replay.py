@@ -0,0 +1,84 @@
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from app.models.schemas import ChatConfig, ChatRequest
+from app.services.chat import ChatOrchestrator
+from app.services.embeddings import EmbeddingService
+from app.services.replay import ReplayMissError, ReplayStore, request_key
+from tests.conftest import make_settings
+
+
+@pytest.mark.unit
+class TestReplayStore:
+    def test_request_key_ignores_dict_ordering(self):
+        assert request_key("chat", {"a": 1, "b": [1, 2]}) == request_key("chat", {"b": [1, 2], "a": 1})
+        assert request_key("chat", {"a": 1}) != request_key("embeddings", {"a": 1})
+
+    def test_records_once_then_replays_without_calling_the_provider(self, tmp_path):
+        produce = MagicMock(return_value={"answer": 42})
+        assert ReplayStore("record", tmp_path).fetch("chat", {"q": "x"}, produce) == {"answer": 42}
+        assert ReplayStore("replay", tmp_path).fetch("chat", {"q": "x"}, produce) == {"answer": 42}
+        produce.assert_called_once()
+
+    def test_replay_miss_raises(self, tmp_path):
+        with pytest.raises(ReplayMissError):
+            ReplayStore("replay", tmp_path).fetch("chat", {"q": "unknown"}, MagicMock())
+
+    def test_off_mode_always_calls_the_provider(self, tmp_path):
+        produce = MagicMock(return_value="live")
+        store = ReplayStore("off", tmp_path)
+        store.fetch("chat", {"q": "x"}, produce)
+        store.fetch("chat", {"q": "x"}, produce)
+        assert produce.call_count == 2
+        assert not any(tmp_path.iterdir())
+
+
+@pytest.mark.unit
+class TestReplayIntegration:
+    def test_embeddings_replay_offline(self, tmp_path):
+        recorder = EmbeddingService(make_settings(replay_mode="record", replay_dir=str(tmp_path)))
+        recorder.rate_limiter = MagicMock()
+        recorder.client = MagicMock()
+        recorder.client.embeddings.create.return_value = SimpleNamespace(
+            data=[SimpleNamespace(embedding=[0.5, 0.25]), SimpleNamespace(embedding=[1.0, 0.0])]
+        )
+        recorded = recorder.embed_chunks(["a", "b"])
+
+        replayer = EmbeddingService(make_settings(replay_mode="replay", replay_dir=str(tmp_path)))
+        replayer.rate_limiter = MagicMock()
+        replayer.client = MagicMock()
+        replayed = replayer.embed_chunks(["a", "b"])
+
+        np.testing.assert_array_equal(replayed, recorded)
+        replayer.client.embeddings.create.assert_not_called()
+        replayer.rate_limiter.acquire.assert_not_called()
+
+    def test_chat_completions_and_streams_replay_offline(self, tmp_path):
+        recorder = ChatOrchestrator(
+            settings=make_settings(replay_mode="record", replay_dir=str(tmp_path)), qdrant_client=MagicMock()
+        )
+        recorder.llm.remote.client = MagicMock()
+        recorder.llm.remote.client.chat.completions.create.side_effect = [
+            SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=" answer "))]),
+            iter(
+                [
+                    SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Hel"))]),
+                    SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="lo"))]),
+                ]
+            ),
+        ]
+        config = ChatConfig(temperature=0.0)
+        assert recorder.answer_with_contexts("question", ["ctx"], config) == "answer"
+        recorded_stream = list(recorder.stream_deltas(ChatRequest(message="hi", config=config), "user-1"))
+
+        replayer = ChatOrchestrator(
+            settings=make_settings(replay_mode="replay", replay_dir=str(tmp_path)), qdrant_client=MagicMock()
+        )
+        replayer.llm.remote.client = MagicMock()
+        assert replayer.answer_with_contexts("question", ["ctx"], config) == "answer"
+        assert list(replayer.stream_deltas(ChatRequest(message="hi", config=config), "user-1")) == recorded_stream
+        assert recorded_stream == ["Hel", "lo"]
+        replayer.llm.remote.client.chat.completions.create.assert_not_called()
@@ -0,0 +1,55 @@
+import json
+import zlib
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import numpy as np
+import pytest
+
+from app.models.schemas import ChatConfig
+from app.tools.retrieval_eval import build_eval_index, build_orchestrator, evaluate_retrieval
+from app.utils.retrieval_metrics import ndcg_at_k, recall_at_k, reciprocal_rank
+from app.utils.vectors import normalize_rows
+
+
+FIXTURES_PATH = Path(__file__).resolve().parents[1] / "evals" / "fixtures"
+
+
+def bag_of_words_embeddings(texts):
+    vectors = np.zeros((len(texts), 256), dtype=np.float32)
+    for row, text in enumerate(texts):
+        for word in text.lower().split():
+            vectors[row, zlib.crc32(word.strip("?.,:()'").encode()) % 256] += 1.0
+    return normalize_rows(vectors)
+
+
+@pytest.mark.unit
+class TestRetrievalMetrics:
+    def test_recall_counts_unique_relevant_sources_in_top_k(self):
+        assert recall_at_k(["a", "a", "b", "c"], {"b", "d"}, k=2) == 0.5
+        assert recall_at_k(["a"], set(), k=5) == 0.0
+
+    def test_reciprocal_rank_uses_first_relevant_hit(self):
+        assert reciprocal_rank(["x", "y", "z"], {"z"}) == pytest.approx(1 / 3)
+        assert reciprocal_rank(["x"], {"z"}) == 0.0
+
+    def test_ndcg_is_one_for_ideal_ranking(self):
+        assert ndcg_at_k(["a", "b", "x"], {"a", "b"}, k=3) == pytest.approx(1.0)
+        assert ndcg_at_k(["x", "a"], {"a"}, k=2) == pytest.approx(1 / np.log2(3))
+
+
+@pytest.mark.unit
+class TestOfflineRetrievalEval:
+    def test_scores_ground_truth_against_an_in_memory_index(self, tmp_path):
+        orchestrator = build_orchestrator("replay", tmp_path)
+        orchestrator.embedding_service = MagicMock()
+        orchestrator.embedding_service.embed_chunks.side_effect = bag_of_words_embeddings
+        corpus = json.loads((FIXTURES_PATH / "retrieval_corpus.json").read_text())
+        samples = json.loads((FIXTURES_PATH / "ground_truth_rag.json").read_text())
+
+        build_eval_index(orchestrator, corpus)
+        metrics = evaluate_retrieval(orchestrator, samples, ChatConfig(top_k=3), k=3)
+
+        assert set(metrics) == {"recall_at_k", "mrr", "ndcg_at_k", "latency_ms_per_query"}
+        assert metrics["recall_at_k"] >= 0.6
+        assert 0.0 < metrics["mrr"] <= 1.0
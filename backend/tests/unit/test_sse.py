@@ -0,0 +1,90 @@
+import asyncio
+from unittest.mock import MagicMock, patch
+
+import orjson
+import pytest
+
+from app.config import Settings
+from app.models.schemas import ChatRequest
+from app.services.chat import ChatOrchestrator
+from app.services.sse import SSE_END, SSE_KEEP_ALIVE, coalesce_sse, sse_frame
+
+
+async def timed_deltas(schedule):
+    for delay, delta in schedule:
+        await asyncio.sleep(delay)
+        yield delta
+
+
+async def collect(deltas, window_seconds=0.05, max_bytes=4096, heartbeat_seconds=5.0):
+    return [
+        frame
+        async for frame in coalesce_sse(
+            deltas,
+            window_seconds=window_seconds,
+            max_bytes=max_bytes,
+            heartbeat_seconds=heartbeat_seconds,
+            retry_ms=2500,
+        )
+    ]
+
+
+def contents(frames):
+    return [orjson.loads(frame[len(b"data: ") :])["content"] for frame in frames if frame.startswith(b"data: {\"")]
+
+
+@pytest.mark.unit
+class TestCoalesceSse:
+    async def test_first_delta_is_sent_immediately_and_the_rest_coalesced(self):
+        frames = await collect(timed_deltas([(0, "Hel")] + [(0, "lo")] * 5 + [(0, " world")]))
+        assert frames[0] == b"retry: 2500\n\n"
+        assert contents(frames) == ["Hel", "lololololo world"]
+        assert frames[-1] == SSE_END
+
+    async def test_window_expiry_flushes_buffered_deltas(self):
+        frames = await collect(timed_deltas([(0, "a"), (0, "b"), (0, "c"), (0.1, "d")]), window_seconds=0.02)
+        assert contents(frames) == ["a", "bc", "d"]
+
+    async def test_byte_limit_flushes_before_the_window(self):
+        frames = await collect(timed_deltas([(0, "x")] + [(0, "yy")] * 4), max_bytes=4)
+        assert contents(frames) == ["x", "yyyy", "yyyy"]
+
+    async def test_idle_streams_get_heartbeats(self):
+        frames = await collect(timed_deltas([(0.12, "late")]), heartbeat_seconds=0.05)
+        assert frames.count(SSE_KEEP_ALIVE) >= 1
+        assert contents(frames) == ["late"]
+
+    async def test_provider_errors_propagate_after_flushing(self):
+        async def failing():
+            yield "partial"
+            yield " answer"
+            raise RuntimeError("stream broke")
+
+        received = []
+        with pytest.raises(RuntimeError):
+            async for frame in coalesce_sse(
+                failing(), window_seconds=1.0, max_bytes=4096, heartbeat_seconds=5.0, retry_ms=1000
+            ):
+                received.append(frame)
+        assert "".join(contents(received)) == "partial answer"
+        assert SSE_END not in received
+
+    def test_frames_use_compact_json(self):
+        assert sse_frame({"content": "ünï \"q\""}) == 'data: {"content":"ünï \\"q\\""}\n\n'.encode("utf-8")
+
+
+@pytest.mark.unit
+class TestChatStream:
+    async def test_stream_chat_frames_orchestrator_deltas(self):
+        settings = Settings(
+            database_url="postgresql+asyncpg://localhost/db",
+            qdrant_url="http://localhost:6333",
+            redis_url="redis://localhost:6379",
+            openai_api_key="sk-test",
+        )
+        orchestrator = ChatOrchestrator(settings=settings, qdrant_client=MagicMock())
+        with patch.object(orchestrator, "stream_deltas", return_value=iter(["Hel", "lo"])):
+            frames = [frame async for frame in orchestrator.stream_chat(ChatRequest(message="hi"), "user-1")]
+        assert frames[0] == b"retry: 3000\n\n"
+        assert "".join(contents(frames)) == "Hello"
+        assert frames[-1] == SSE_END
@@ -1,10 +1,11 @@
+import io
 import uuid
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from app.services.storage import StorageService
+from app.services.storage import StorageLimitExceeded, StorageService
 
 
 @pytest.mark.unit
@@ -62,3 +63,40 @@ class TestStorageService:
             service = StorageService(settings=mock_settings)
             path = service.save_file(b"read me", "f.txt", "u")
             assert service.read_file(path) == b"read me"
+
+    def test_delete_file_removes_file_and_reports_missing(self, tmp_path):
+        mock_settings = MagicMock()
+        mock_settings.storage_path = str(tmp_path)
+        service = StorageService(settings=mock_settings)
+        path = service.save_file(b"bye", "f.txt", "u")
+        assert service.delete_file(path) is True
+        assert not Path(path).exists()
+        assert service.delete_file(path) is False
+
+    def test_delete_file_removes_extraction_artifacts(self, tmp_path):
+        mock_settings = MagicMock()
+        mock_settings.storage_path = str(tmp_path)
+        service = StorageService(settings=mock_settings)
+        path = service.save_file(b"bye", "f.txt", "u")
+        artifact = Path(f"{path}.pages-v1.bin")
+        artifact.write_bytes(b"artifact")
+        assert service.delete_file(path) is True
+        assert not artifact.exists()
+
+    def test_save_stream_writes_head_and_body(self, tmp_path):
+        mock_settings = MagicMock()
+        mock_settings.storage_path = str(tmp_path)
+        service = StorageService(settings=mock_settings)
+        path = service.save_stream(io.BytesIO(b" world"), "f.txt", "u", head=b"hello", max_bytes=11)
+        assert Path(path).read_bytes() == b"hello world"
+        assert Path(service.save_stream(io.BytesIO(b"body"), "g.txt", "u")).read_bytes() == b"body"
+
+    def test_save_stream_aborts_and_cleans_up_over_the_byte_limit(self, tmp_path):
+        mock_settings = MagicMock()
+        mock_settings.storage_path = str(tmp_path)
+        service = StorageService(settings=mock_settings)
+        stream = io.BytesIO(b"x" * (3 * 1024 * 1024))
+        with pytest.raises(StorageLimitExceeded):
+            service.save_stream(stream, "big.txt", "u", max_bytes=1024 * 1024 + 1)
+        assert stream.tell() == 2 * 1024 * 1024
+        assert list((tmp_path / "u").iterdir()) == []
@@ -0,0 +1,251 @@
+import os
+import threading
+import time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from app.config import Settings
+from app.core import tracing
+from app.core.tracing import (
+    TRACEPARENT_HEADER,
+    BatchSpanExporter,
+    LangfuseSpanSink,
+    SpanContext,
+    Tracer,
+    current_traceparent,
+    parse_traceparent,
+    use_context,
+)
+from app.models.schemas import ChatRequest
+from app.services.chat import ChatOrchestrator
+from app.workers.celery_app import end_task_span, inject_trace_context, start_task_span
+
+SPAN_OVERHEAD_BUDGET_US = float(os.environ.get("TRACING_SPAN_BUDGET_US", "50"))
+
+
+class CollectingSink:
+    def __init__(self):
+        self.batches = []
+        self.exported = threading.Event()
+
+    def __call__(self, spans):
+        self.batches.append(list(spans))
+        self.exported.set()
+
+    @property
+    def spans(self):
+        return [span for batch in self.batches for span in batch]
+
+
+def make_tracer(sample_rate=1.0, **options):
+    sink = CollectingSink()
+    return Tracer(sample_rate, BatchSpanExporter(sink, **options)), sink
+
+
+def per_span_microseconds(tracer, iterations=5000):
+    started = time.perf_counter()
+    for _ in range(iterations):
+        with tracer.span("chat"):
+            with tracer.span("search"):
+                pass
+    return (time.perf_counter() - started) / (2 * iterations) * 1e6
+
+
+@pytest.mark.unit
+class TestTraceContext:
+    def test_traceparent_round_trips(self):
+        context = SpanContext("a" * 32, "b" * 16, True)
+        assert context.traceparent == f"00-{'a' * 32}-{'b' * 16}-01"
+        assert parse_traceparent(context.traceparent) == context
+        assert parse_traceparent(f"00-{'a' * 32}-{'b' * 16}-00").sampled is False
+
+    @pytest.mark.parametrize("value", [None, "", "garbage", f"01-{'a' * 32}-{'b' * 16}-01"])
+    def test_invalid_traceparent_is_ignored(self, value):
+        assert parse_traceparent(value) is None
+
+
+@pytest.mark.unit
+class TestTracer:
+    def test_disabled_tracer_records_and_propagates_nothing(self):
+        tracer = Tracer(0.0, None)
+        with tracer.span("chat") as span:
+            span.set(ignored=True)
+            assert current_traceparent() is None
+
+    def test_nested_spans_share_the_trace_and_link_parents(self):
+        tracer, sink = make_tracer()
+        with tracer.span("chat", user_id="user-1") as root:
+            with tracer.span("search") as child:
+                assert current_traceparent() == child.context.traceparent
+        assert current_traceparent() is None
+        tracer.flush()
+
+        search, chat = sink.spans
+        assert (chat.name, chat.parent_id, chat.attributes) == ("chat", None, {"user_id": "user-1"})
+        assert search.parent_id == root.context.span_id
+        assert search.context.trace_id == root.context.trace_id
+        assert chat.duration >= search.duration > 0
+
+    def test_unsampled_traces_propagate_the_decision_but_export_nothing(self):
+        tracer, sink = make_tracer(sample_rate=0.5)
+        with patch("app.core.tracing.random.random", return_value=0.9):
+            with tracer.span("chat") as root:
+                with tracer.span("search"):
+                    assert current_traceparent().endswith("-00")
+        tracer.flush()
+        assert root.context.sampled is False
+        assert sink.spans == []
+
+    def test_remote_parent_decides_sampling(self):
+        tracer, sink = make_tracer(sample_rate=0.0001)
+        parent = SpanContext("c" * 32, "d" * 16, True)
+        with tracer.span("extract_document_task", parent=parent):
+            pass
+        tracer.flush()
+        assert [(s.context.trace_id, s.parent_id) for s in sink.spans] == [("c" * 32, "d" * 16)]
+
+    def test_errors_are_recorded_on_the_span(self):
+        tracer, sink = make_tracer()
+        with pytest.raises(ValueError):
+            with tracer.span("embed"):
+                raise ValueError("boom")
+        tracer.flush()
+        assert sink.spans[0].error == "ValueError: boom"
+
+    def test_inactive_span_does_not_change_the_current_context(self):
+        tracer, sink = make_tracer()
+        with tracer.span("chat", activate=False) as root:
+            assert current_traceparent() is None
+            with use_context(root.context):
+                with tracer.span("search"):
+                    pass
+        tracer.flush()
+        assert sink.spans[0].parent_id == root.context.span_id
+
+    def test_span_overhead_stays_within_budget(self):
+        unsampled, _ = make_tracer(sample_rate=1e-12, max_queue_size=10**9)
+        sampled, _ = make_tracer(sample_rate=1.0, max_queue_size=10**9, interval_seconds=60)
+        assert per_span_microseconds(unsampled) < SPAN_OVERHEAD_BUDGET_US
+        assert per_span_microseconds(sampled) < SPAN_OVERHEAD_BUDGET_US
+
+
+@pytest.mark.unit
+class TestBatchSpanExporter:
+    def test_exports_full_batches_from_the_background_thread(self):
+        tracer, sink = make_tracer(batch_size=2, interval_seconds=60)
+        for _ in range(2):
+            with tracer.span("search"):
+                pass
+        assert sink.exported.wait(2)
+        assert [len(batch) for batch in sink.batches] == [2]
+
+    def test_drops_spans_when_the_queue_is_full(self):
+        tracer, sink = make_tracer(max_queue_size=1, interval_seconds=60)
+        for _ in range(3):
+            with tracer.span("search"):
+                pass
+        assert tracer.exporter.dropped == 2
+        tracer.flush()
+        assert len(sink.spans) == 1
+
+    def test_sink_errors_are_logged_not_raised(self):
+        exporter = BatchSpanExporter(MagicMock(side_effect=RuntimeError("down")), interval_seconds=60)
+        tracer = Tracer(1.0, exporter)
+        with tracer.span("search"):
+            pass
+        tracer.flush()
+        assert not exporter.queue
+
+
+@pytest.mark.unit
+class TestLangfuseSpanSink:
+    def test_roots_open_a_trace_and_generations_carry_the_model(self):
+        tracer, sink = make_tracer()
+        with tracer.span("chat"):
+            with tracer.span("llm", kind="generation", model="gpt-4o-mini"):
+                pass
+        tracer.flush()
+        client = MagicMock()
+        LangfuseSpanSink(client)(sink.spans)
+
+        generation, chat = sink.spans
+        client.trace.assert_called_once()
+        assert client.trace.call_args.kwargs["id"] == chat.context.trace_id
+        assert client.generation.call_args.kwargs["model"] == "gpt-4o-mini"
+        assert client.generation.call_args.kwargs["parent_observation_id"] == chat.context.span_id
+        assert client.span.call_args.kwargs["id"] == chat.context.span_id
+
+
+@pytest.mark.unit
+class TestCeleryPropagation:
+    def test_publish_headers_carry_the_current_trace(self):
+        tracer, _ = make_tracer()
+        headers = {}
+        with tracer.span("ingest.upload") as span:
+            inject_trace_context(headers=headers)
+        assert headers == {TRACEPARENT_HEADER: span.context.traceparent}
+
+    def test_no_header_outside_a_trace(self):
+        headers = {}
+        inject_trace_context(headers=headers)
+        assert headers == {}
+
+    def test_task_span_continues_the_publisher_trace(self):
+        tracer, sink = make_tracer(sample_rate=0.0001)
+        parent = SpanContext("e" * 32, "f" * 16, True)
+        task = SimpleNamespace(name="ingest_document_task", request={TRACEPARENT_HEADER: parent.traceparent})
+        with patch("app.workers.celery_app.get_tracer", return_value=tracer):
+            start_task_span(task_id="task-1", task=task)
+            assert current_traceparent().startswith(f"00-{'e' * 32}-")
+            end_task_span(task_id="task-1", state="SUCCESS")
+        assert current_traceparent() is None
+        tracer.flush()
+        span = sink.spans[0]
+        assert (span.name, span.parent_id, span.attributes) == (
+            "ingest_document_task",
+            "f" * 16,
+            {"task_id": "task-1", "state": "SUCCESS"},
+        )
+
+
+@pytest.mark.unit
+class TestGetTracer:
+    def test_tracing_is_off_without_langfuse(self):
+        tracing.get_tracer.cache_clear()
+        try:
+            assert tracing.get_tracer().enabled is False
+        finally:
+            tracing.get_tracer.cache_clear()
+
+
+@pytest.mark.unit
+class TestChatSpans:
+    def test_chat_turn_records_embed_search_and_llm_spans(self):
+        settings = Settings(
+            database_url="postgresql+asyncpg://localhost/db",
+            qdrant_url="http://localhost:6333",
+            redis_url="redis://localhost:6379",
+            openai_api_key="sk-test",
+            use_local_embeddings=True,
+        )
+        orchestrator = ChatOrchestrator(settings=settings, qdrant_client=MagicMock())
+        orchestrator.tracer, sink = make_tracer()
+        orchestrator.embedding_service = MagicMock()
+        orchestrator.embedding_service.embed_chunks.return_value = np.ones((1, 2), dtype=np.float32)
+        orchestrator.qdrant_client.search_batch.return_value = [[]]
+        orchestrator.llm.remote.client = MagicMock()
+        orchestrator.llm.remote.client.chat.completions.create.return_value = iter(
+            [SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content="Hi"))])]
+        )
+
+        assert list(orchestrator.stream_deltas(ChatRequest(message="What is HNSW?"), "user-1")) == ["Hi"]
+        orchestrator.tracer.flush()
+
+        spans = {span.name: span for span in sink.spans}
+        assert sorted(spans) == ["chat", "embed", "llm", "search"]
+        root = spans["chat"].context.span_id
+        assert all(spans[name].parent_id == root for name in ("embed", "search", "llm"))
+        assert spans["llm"].kind == "generation"
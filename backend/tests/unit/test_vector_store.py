@@ -0,0 +1,192 @@
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+from qdrant_client import QdrantClient
+from qdrant_client.http import models as qmodels
+
+from app.services.vector_store import (
+    DEFAULT_SHARD_KEY,
+    PAYLOAD_INDEX_FIELDS,
+    TenantRoute,
+    TenantRouter,
+    create_qdrant_client,
+    ensure_qdrant_collection,
+    upload_vectors,
+)
+from tests.conftest import make_settings
+
+
+def make_collection_info(m=16, ef_construct=100, quantization=None, on_disk=None, payload_schema=None):
+    info = MagicMock()
+    info.config.hnsw_config = qmodels.HnswConfig(m=m, ef_construct=ef_construct, full_scan_threshold=10000)
+    info.config.quantization_config = quantization
+    info.config.params.vectors = qmodels.VectorParams(size=4, distance=qmodels.Distance.COSINE, on_disk=on_disk)
+    info.payload_schema = payload_schema or {}
+    return info
+
+
+@pytest.mark.unit
+class TestEnsureQdrantCollection:
+    def test_creates_tuned_collection_with_payload_indexes(self):
+        client = MagicMock()
+        client.get_collection.side_effect = Exception("not found")
+        settings = make_settings(qdrant_hnsw_m=32, qdrant_on_disk_vectors=True, qdrant_scalar_quantization=True)
+
+        ensure_qdrant_collection(client, 4, settings)
+
+        kwargs = client.create_collection.call_args.kwargs
+        assert kwargs["vectors_config"].on_disk is True
+        assert kwargs["hnsw_config"].m == 32
+        assert kwargs["quantization_config"].scalar.type == qmodels.ScalarType.INT8
+        indexed = [c.kwargs["field_name"] for c in client.create_payload_index.call_args_list]
+        assert indexed == list(PAYLOAD_INDEX_FIELDS)
+
+    def test_existing_collection_in_sync_is_left_untouched(self):
+        client = MagicMock()
+        client.get_collection.return_value = make_collection_info(
+            payload_schema={field: MagicMock() for field in PAYLOAD_INDEX_FIELDS}
+        )
+
+        ensure_qdrant_collection(client, 4, make_settings())
+
+        client.create_collection.assert_not_called()
+        client.update_collection.assert_not_called()
+        client.create_payload_index.assert_not_called()
+
+    def test_migrates_existing_collection_and_adds_missing_indexes(self):
+        client = MagicMock()
+        client.get_collection.return_value = make_collection_info(payload_schema={"user_id": MagicMock()})
+        settings = make_settings(qdrant_hnsw_ef_construct=200, qdrant_scalar_quantization=True)
+
+        ensure_qdrant_collection(client, 4, settings)
+
+        kwargs = client.update_collection.call_args.kwargs
+        assert kwargs["hnsw_config"].ef_construct == 200
+        assert isinstance(kwargs["quantization_config"], qmodels.ScalarQuantization)
+        assert "vectors_config" not in kwargs
+        indexed = [c.kwargs["field_name"] for c in client.create_payload_index.call_args_list]
+        assert indexed == ["doc_id", "access_level"]
+
+    def test_matching_quantization_with_server_defaults_is_left_untouched(self):
+        client = MagicMock()
+        client.get_collection.return_value = make_collection_info(
+            quantization=qmodels.ScalarQuantization(
+                scalar=qmodels.ScalarQuantizationConfig(type=qmodels.ScalarType.INT8, quantile=0.99, always_ram=True)
+            ),
+            payload_schema={field: MagicMock() for field in PAYLOAD_INDEX_FIELDS},
+        )
+
+        ensure_qdrant_collection(client, 4, make_settings(qdrant_scalar_quantization=True))
+
+        client.update_collection.assert_not_called()
+
+    def test_migrates_quantization_when_always_ram_changes(self):
+        client = MagicMock()
+        client.get_collection.return_value = make_collection_info(
+            quantization=qmodels.ScalarQuantization(
+                scalar=qmodels.ScalarQuantizationConfig(type=qmodels.ScalarType.INT8, always_ram=False)
+            ),
+            payload_schema={field: MagicMock() for field in PAYLOAD_INDEX_FIELDS},
+        )
+
+        ensure_qdrant_collection(client, 4, make_settings(qdrant_scalar_quantization=True))
+
+        assert client.update_collection.call_args.kwargs["quantization_config"].scalar.always_ram is True
+
+    def test_disables_quantization_when_turned_off(self):
+        client = MagicMock()
+        client.get_collection.return_value = make_collection_info(
+            quantization=qmodels.ScalarQuantization(scalar=qmodels.ScalarQuantizationConfig(type=qmodels.ScalarType.INT8)),
+            payload_schema={field: MagicMock() for field in PAYLOAD_INDEX_FIELDS},
+        )
+
+        ensure_qdrant_collection(client, 4, make_settings())
+
+        assert client.update_collection.call_args.kwargs["quantization_config"] == qmodels.Disabled.DISABLED
+
+    def test_creates_half_precision_collection(self):
+        client = MagicMock()
+        client.get_collection.side_effect = Exception("not found")
+
+        ensure_qdrant_collection(client, 256, make_settings(qdrant_vector_datatype="float16"))
+
+        vectors_config = client.create_collection.call_args.kwargs["vectors_config"]
+        assert vectors_config.size == 256
+        assert vectors_config.datatype == qmodels.Datatype.FLOAT16
+
+    def test_rejects_vectors_of_a_different_dimension(self):
+        client = MagicMock()
+        client.get_collection.return_value = make_collection_info()
+
+        with pytest.raises(ValueError, match="4-dim"):
+            ensure_qdrant_collection(client, 256, make_settings())
+
+        client.update_collection.assert_not_called()
+
+
+@pytest.mark.unit
+class TestTenantRouter:
+    def test_payload_strategy_uses_shared_collection(self):
+        router = TenantRouter(make_settings())
+        assert router.route("user-1") == TenantRoute("documents")
+
+    def test_shard_key_strategy_routes_listed_tenants_to_own_shard(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_TENANT_ROUTES", "big-tenant=big")
+        router = TenantRouter(make_settings(qdrant_multitenancy="shard_key"))
+        assert router.route("big-tenant") == TenantRoute("documents_sharded", "big")
+        assert router.route("small-tenant") == TenantRoute("documents_sharded", DEFAULT_SHARD_KEY)
+
+    def test_collection_strategy_hashes_tenants_into_stable_groups(self, monkeypatch):
+        monkeypatch.setenv("QDRANT_TENANT_ROUTES", "big-tenant=big")
+        router = TenantRouter(make_settings(qdrant_multitenancy="collection", qdrant_tenant_groups=4))
+        assert router.route("big-tenant") == TenantRoute("documents_big")
+        route = router.route("small-tenant")
+        assert route.collection_name in {f"documents_g{n}" for n in range(4)}
+        assert router.route("small-tenant") == route
+
+    def test_creates_custom_sharded_collection_and_shard_key(self):
+        client = MagicMock()
+        client.get_collection.side_effect = Exception("not found")
+
+        ensure_qdrant_collection(client, 4, make_settings(), TenantRoute("documents_sharded", "tenant-x"))
+
+        kwargs = client.create_collection.call_args.kwargs
+        assert kwargs["collection_name"] == "documents_sharded"
+        assert kwargs["sharding_method"] == qmodels.ShardingMethod.CUSTOM
+        client.create_shard_key.assert_called_once_with(collection_name="documents_sharded", shard_key="tenant-x")
+
+
+@pytest.mark.unit
+class TestUploadVectors:
+    def test_uploads_numpy_matrix_in_batches(self):
+        client = QdrantClient(":memory:")
+        route = TenantRoute(collection_name="documents")
+        ensure_qdrant_collection(client, 2, make_settings(), route)
+        ids = [f"00000000-0000-0000-0000-00000000000{i}" for i in range(5)]
+        vectors = np.arange(10, dtype=np.float32).reshape(5, 2) + 1
+
+        upload_vectors(client, route, ids, vectors, [{"user_id": "u", "n": i} for i in range(5)], batch_size=2)
+
+        records = client.retrieve("documents", ids=ids[:1], with_vectors=True)
+        assert client.count("documents").count == 5
+        assert records[0].payload == {"user_id": "u", "n": 0}
+        np.testing.assert_allclose(records[0].vector, vectors[0] / np.linalg.norm(vectors[0]), rtol=1e-6)
+
+
+@pytest.mark.unit
+class TestQdrantTransport:
+    def test_client_uses_configured_grpc_transport(self):
+        settings = make_settings(qdrant_prefer_grpc=True, qdrant_grpc_port=7334, qdrant_timeout=3)
+        with patch("app.services.vector_store.QdrantClient") as mock_client:
+            create_qdrant_client(settings)
+        kwargs = mock_client.call_args.kwargs
+        assert kwargs["prefer_grpc"] is True
+        assert kwargs["grpc_port"] == 7334
+        assert kwargs["timeout"] == 3
+
+    def test_grpc_encoding_is_smaller_than_rest(self):
+        from app.tools.qdrant_transport_benchmark import make_workload, measure_encoding
+
+        results = measure_encoding(*make_workload(points=20, dimensions=64))
+        assert results["grpc"]["bytes"] < results["rest"]["bytes"]
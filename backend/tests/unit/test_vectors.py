@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from app.utils.vectors import decode_embeddings, decode_vectors, encode_vectors, normalize_rows, recall_at_k, truncate_embeddings
+
+
+@pytest.mark.unit
+class TestVectors:
+    def test_encode_decode_round_trip_preserves_float32(self):
+        vectors = np.arange(12, dtype=np.float64).reshape(3, 4)
+        decoded = decode_vectors(encode_vectors(vectors), 4)
+        assert decoded.dtype == np.float32
+        np.testing.assert_array_equal(decoded, vectors)
+
+    def test_decode_embeddings_accepts_float_lists(self):
+        decoded = decode_embeddings([[1.0, 2.0], [3.0, 4.0]])
+        assert decoded.dtype == np.float32
+        assert decoded.shape == (2, 2)
+
+    def test_truncation_keeps_leading_dimensions_and_renormalizes(self):
+        vectors = np.array([[3.0, 4.0, 100.0], [0.0, 0.0, 1.0]], dtype=np.float32)
+        truncated = truncate_embeddings(vectors, 2)
+        np.testing.assert_allclose(truncated, [[0.6, 0.8], [0.0, 0.0]], rtol=1e-6)
+
+    def test_truncation_is_a_no_op_for_shorter_vectors(self):
+        vectors = np.ones((2, 2), dtype=np.float32)
+        assert truncate_embeddings(vectors, 8).shape == (2, 2)
+
+    def test_recall_is_perfect_for_identical_spaces_and_drops_for_noise(self):
+        rng = np.random.default_rng(0)
+        reference = normalize_rows(rng.normal(size=(200, 32)))
+        queries = np.arange(20)
+        assert recall_at_k(reference, reference, queries, k=10) == 1.0
+        noise = normalize_rows(rng.normal(size=(200, 32)))
+        assert recall_at_k(reference, noise, queries, k=10) < 0.5
+
+
+@pytest.mark.unit
+class TestEmbeddingRecallTool:
+    def test_reports_recall_and_size_per_dimension(self):
+        from app.tools.embedding_recall import evaluate_dimensions
+
+        rng = np.random.default_rng(1)
+        vectors = normalize_rows(rng.normal(size=(100, 64)))
+        rows = evaluate_dimensions(vectors, [64, 16, 16], k=5, queries=np.arange(10))
+        assert [row["dimensions"] for row in rows] == [16, 64]
+        assert rows[1]["recall"] == 1.0
+        assert rows[0]["recall"] < 1.0
+        assert rows[0]["float16_bytes"] == 32
@@ -0,0 +1,41 @@
+import asyncio
+
+import pytest
+
+from app.workers import runtime
+
+
+@pytest.fixture(autouse=True)
+def fresh_runtime():
+    runtime.close_runtime()
+    yield
+    runtime.close_runtime()
+
+
+async def current_loop():
+    return asyncio.get_running_loop()
+
+
+@pytest.mark.unit
+class TestWorkerRuntime:
+    def test_run_async_reuses_one_loop_per_process(self):
+        first = runtime.run_async(current_loop())
+        second = runtime.run_async(current_loop())
+        assert first is second
+        assert runtime.get_runtime().loop is first
+
+    def test_worker_sessions_share_one_engine(self):
+        first = runtime.worker_session()
+        second = runtime.worker_session()
+        assert first.bind is second.bind is runtime.get_runtime().engine
+
+    def test_close_runtime_closes_loop_and_next_call_starts_fresh(self):
+        old = runtime.get_runtime()
+        runtime.close_runtime()
+        assert old.loop.is_closed()
+        assert runtime.get_runtime() is not old
+
+    def test_worker_process_init_signal_prepares_runtime(self):
+        runtime.init_worker_runtime()
+        assert runtime.get_runtime().loop.is_running() is False
+        assert not runtime.get_runtime().loop.is_closed()